@@ -1,30 +1,158 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, Request, render_template, request, jsonify, redirect, url_for, flash, current_app
 from werkzeug.utils import secure_filename
 import os
 import json
+import shutil
+import tempfile
+import zipfile
 from datetime import datetime
 from models.health_analyzer import HealthAnalyzer
 from models.recommendation_engine import RecommendationEngine
+from models.meal_planner import MealPlanner
 from utils.report_parser import ReportParser
-from utils.database import init_db, User, HealthReport, db
+from utils.ocr_service import OCRService, OCRBusyError
+from utils.parse_cache import ParseCache
+from utils.job_queue import JobManager
+from utils.batch_processor import BatchProcessor
+from utils.analysis_cache import AnalysisCache
+from utils.population_stats import PopulationStats
+from utils.trends import TrendEngine
+from utils.pattern_registry import pattern_registry
+from utils.startup import preload, register_warmup
+from utils.streaming import Deferred, stream_page
+from utils.json_response import json_response
+from models.messages import MESSAGE_CATALOG
+from utils.database import init_db, on_report_saved, save_health_report, User, HealthReport, db
+
+
+class SpooledUploadRequest(Request):
+    """Request that keeps uploaded files in memory until they exceed UPLOAD_SPOOL_THRESHOLD"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Larger uploads roll over to an anonymous temporary file that is removed on close
+        return tempfile.SpooledTemporaryFile(max_size=current_app.config['UPLOAD_SPOOL_THRESHOLD'])
+
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['UPLOAD_SPOOL_THRESHOLD'] = 4 * 1024 * 1024  # Uploads above this spill to a temp file
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///bodytune.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['OCR_MAX_WORKERS'] = 2  # OCR worker processes
+app.config['OCR_MAX_QUEUE'] = 4  # Image uploads allowed to wait for a worker
+app.config['OCR_TIMEOUT'] = 30  # Seconds per OCR job
+app.config['PARSE_CACHE_PATH'] = os.path.join(app.instance_path, 'parse_cache.db')
+app.config['PARSE_CACHE_MAX_ENTRIES'] = 2000
+app.config['JOBS_DB_PATH'] = os.path.join(app.instance_path, 'jobs.db')
+app.config['JOB_MAX_WORKERS'] = 4  # Background threads for asynchronous uploads
+app.config['JOB_TTL'] = 3600  # Seconds a finished job stays available
+app.config['BATCH_MAX_WORKERS'] = None  # Batch parsing processes (defaults to the CPU count)
+app.config['BATCH_MAX_FILES'] = 200  # Reports per batch upload
+app.config['ANALYSIS_CACHE_MAX_ENTRIES'] = 1024
+app.config['ANALYSIS_CACHE_TTL'] = 600  # Seconds an analysis result is reused
+app.config['POPULATION_STATS_PATH'] = os.path.join(app.instance_path, 'population_stats.db')
+app.config['POPULATION_MIN_SAMPLES'] = 30  # Reports a cohort needs before percentiles are shown
+app.config['SAVE_REPORTS'] = False  # Store analyzed reports as HealthReport rows (otherwise only cohort counts are kept)
+app.config['TREND_CACHE_MAX_USERS'] = 512
+app.config['TREND_WINDOW'] = 5  # Reports per rolling mean/slope window
+app.config['MEAL_PLAN_CACHE_MAX_ENTRIES'] = 1024
+app.config['MEAL_PLAN_MACRO_BUCKET'] = 10  # Grams per protein/carb/fat bucket of the meal plan cache
+app.config['MEAL_PLAN_TOLERANCE'] = 0.1  # Allowed relative deviation of a plan's macro totals
+# Import PDF/OCR/numpy modules at startup, e.g. in a pre-fork master (gunicorn --preload)
+app.config['PRELOAD_HEAVY_MODULES'] = os.environ.get('BODYTUNE_PRELOAD', '').lower() in ('1', 'true', 'yes')
 
 # Initialize database
 from utils.database import db
 db.init_app(app)
 
-# Create upload directory if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# The SQLite stores below live next to the app database
+os.makedirs(app.instance_path, exist_ok=True)
+if app.config['SAVE_REPORTS']:
+    with app.app_context():
+        db.create_all()
+
+# Dedicated OCR worker pool for image uploads
+ocr_service = OCRService(
+    max_workers=app.config['OCR_MAX_WORKERS'],
+    max_queue=app.config['OCR_MAX_QUEUE'],
+    timeout=app.config['OCR_TIMEOUT']
+)
+
+# Extracted parameters of previously uploaded reports, keyed by file content
+parse_cache = ParseCache(
+    app.config['PARSE_CACHE_PATH'],
+    max_entries=app.config['PARSE_CACHE_MAX_ENTRIES']
+)
+
+# Background processing of asynchronous uploads
+job_manager = JobManager(
+    app.config['JOBS_DB_PATH'],
+    max_workers=app.config['JOB_MAX_WORKERS'],
+    ttl=app.config['JOB_TTL']
+)
+
+# Analysis and recommendations of recently submitted values, for resubmissions
+analysis_cache = AnalysisCache(
+    max_entries=app.config['ANALYSIS_CACHE_MAX_ENTRIES'],
+    ttl=app.config['ANALYSIS_CACHE_TTL']
+)
+
+# Percentile sketches per (parameter, gender, age band), fed by every saved report
+population_stats = PopulationStats(
+    app.config['POPULATION_STATS_PATH'],
+    min_samples=app.config['POPULATION_MIN_SAMPLES']
+)
+
+@on_report_saved
+def record_population_stats(health_report, health_data, user_info):
+    population_stats.record(health_data, user_info.get('gender'), user_info.get('age'))
+
+# Per-member trends over saved reports, recomputed after each new report.
+# No route serves them until members can log in: trends are medical history,
+# and reports are not linked to user accounts yet.
+trend_engine = TrendEngine(
+    db,
+    max_users=app.config['TREND_CACHE_MAX_USERS'],
+    default_window=app.config['TREND_WINDOW']
+)
+
+@on_report_saved
+def invalidate_trends(health_report, health_data, user_info):
+    if health_report.user_id is not None:
+        trend_engine.invalidate(health_report.user_id)
+
+# Macro-targeted meal plans, solved once per (strategy, macro bucket)
+meal_planner = MealPlanner(
+    max_entries=app.config['MEAL_PLAN_CACHE_MAX_ENTRIES'],
+    macro_bucket=app.config['MEAL_PLAN_MACRO_BUCKET'],
+    tolerance=app.config['MEAL_PLAN_TOLERANCE']
+)
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'gif'}
 
+# Parallel parsing of multi-file and zip uploads
+batch_processor = BatchProcessor(
+    max_workers=app.config['BATCH_MAX_WORKERS'],
+    cache_path=app.config['PARSE_CACHE_PATH'],
+    cache_max_entries=app.config['PARSE_CACHE_MAX_ENTRIES'],
+    allowed_extensions=tuple(sorted(ALLOWED_EXTENSIONS)),
+    max_files=app.config['BATCH_MAX_FILES']
+)
+
+@register_warmup
+def compile_pattern_packs():
+    """Build every report pattern pack and locale bundle ahead of the first upload"""
+    for name in pattern_registry.names():
+        pattern_registry.get(name)
+    for locale in MESSAGE_CATALOG.available_locales():
+        MESSAGE_CATALOG.bundle(locale)
+
+if app.config['PRELOAD_HEAVY_MODULES']:
+    preload()
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -47,6 +175,189 @@ def safe_int_conversion(value, default=0):
     except (ValueError, TypeError):
         return default
 
+@app.template_filter('ordinal')
+def ordinal(number):
+    """Number with its English ordinal suffix, e.g. 1st, 22nd, 13th"""
+    number = int(number)
+    if 10 <= number % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return f"{number}{suffix}"
+
+def generate_recommendations(analysis_results, user_info, cache_key):
+    """Generate recommendations and cache them together with their analysis"""
+    recommendation_engine = RecommendationEngine(meal_planner=meal_planner)
+    recommendations = recommendation_engine.generate_recommendations(
+        analysis_results, user_info
+    )
+    analysis_cache.set(cache_key, (analysis_results, recommendations))
+    return recommendations
+
+def general_recommendations(error):
+    """Recommendations for a streamed page whose personalized recommendations failed"""
+    app.logger.error('Generating recommendations failed; showing general recommendations', exc_info=error)
+    recommendations = RecommendationEngine(meal_planner=meal_planner).generate_recommendations({}, {})
+    recommendations['timeline'] = {'overall': 'Contact healthcare provider for personalized advice'}
+    return recommendations
+
+def record_report(health_data, analysis_results, user_info):
+    """Add a newly analyzed report to the population percentiles
+    
+    Only the cohort sketches are updated unless SAVE_REPORTS is set; then
+    the report is stored (without a user account) and the on_report_saved
+    listeners record it. A failure is logged and does not fail the request.
+    """
+    try:
+        if not app.config['SAVE_REPORTS']:
+            population_stats.record(health_data, user_info.get('gender'), user_info.get('age'))
+            return
+        # Background jobs run outside the request's app context
+        with app.app_context():
+            save_health_report(None, health_data, analysis_results, user_info)
+    except Exception:
+        app.logger.exception('Recording the analyzed report failed')
+
+def analyze_data(health_data, user_info, defer_recommendations=False, record=True):
+    """Analyze health data and generate recommendations, reusing a cached result
+    
+    With ``defer_recommendations`` the recommendations are a Deferred value,
+    generated when a streamed results page reaches them. Newly analyzed data
+    is added to the population percentiles unless ``record`` is false.
+    """
+    # Identical resubmissions reuse the previous analysis and recommendations
+    cache_key = AnalysisCache.make_key(health_data, user_info)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        analysis_results, recommendations = cached
+    else:
+        # Analyze health parameters
+        analyzer = HealthAnalyzer(population_stats=population_stats)
+        analysis_results = analyzer.analyze_parameters(health_data, user_info)
+        if record:
+            record_report(health_data, analysis_results, user_info)
+        
+        # Generate recommendations; a deferred failure falls back to general recommendations
+        if defer_recommendations:
+            recommendations = Deferred(
+                lambda: generate_recommendations(analysis_results, user_info, cache_key),
+                fallback=general_recommendations
+            )
+        else:
+            recommendations = generate_recommendations(analysis_results, user_info, cache_key)
+    
+    return {
+        'health_data': health_data,
+        'analysis': analysis_results,
+        'recommendations': recommendations,
+        'user_info': user_info
+    }
+
+def process_report(source, filename, user_info, defer_recommendations=False):
+    """Parse, analyze and generate recommendations for an uploaded report"""
+    # Parse the medical report straight from memory (or its spill file)
+    parser = ReportParser(ocr_service=ocr_service, cache=parse_cache)
+    health_data = parser.parse_report(source, filename=filename)
+    
+    # Demo sample data stands in for failed parses and must not skew the percentiles
+    return analyze_data(health_data, user_info, defer_recommendations,
+                        record=not parser.is_sample_data(health_data))
+
+def upload_user_info(form):
+    """Profile fields sent along with an uploaded report"""
+    return {
+        'name': form.get('name', ''),
+        'age': form.get('age', ''),
+        'gender': form.get('gender', ''),
+        'weight': form.get('weight', ''),
+        'height': form.get('height', '')
+    }
+
+def read_manual_entry(form):
+    """Health data and user info of the manual entry form"""
+    health_data = {
+        # Basic health parameters
+        'glucose': safe_float_conversion(form.get('glucose')),
+        'cholesterol_total': safe_float_conversion(form.get('cholesterol_total')),
+        'cholesterol_hdl': safe_float_conversion(form.get('cholesterol_hdl')),
+        'cholesterol_ldl': safe_float_conversion(form.get('cholesterol_ldl')),
+        'blood_pressure_systolic': safe_float_conversion(form.get('bp_systolic')),
+        'blood_pressure_diastolic': safe_float_conversion(form.get('bp_diastolic')),
+        'bmi': safe_float_conversion(form.get('bmi')),
+        'body_fat_percentage': safe_float_conversion(form.get('body_fat')),
+        # InBody specific parameters
+        'weight': safe_float_conversion(form.get('weight')),
+        'muscle_mass': safe_float_conversion(form.get('muscle_mass')),
+        'protein': safe_float_conversion(form.get('protein')),
+        'minerals': safe_float_conversion(form.get('minerals')),
+        'total_body_water': safe_float_conversion(form.get('total_body_water')),
+        'visceral_fat_level': safe_float_conversion(form.get('visceral_fat_level')),
+        'basal_metabolic_rate': safe_float_conversion(form.get('basal_metabolic_rate')),
+        'waist_hip_ratio': safe_float_conversion(form.get('waist_hip_ratio')),
+        'inbody_score': safe_float_conversion(form.get('inbody_score'))
+    }
+    
+    user_info = {
+        'name': form.get('name', ''),
+        'age': safe_int_conversion(form.get('age'), 25),
+        'gender': form.get('gender', ''),
+        'weight': safe_float_conversion(form.get('weight')),
+        'height': safe_float_conversion(form.get('height')),
+        'activity_level': form.get('activity_level', 'moderate')
+    }
+    return health_data, user_info
+
+def validate_manual_entry(health_data, user_info):
+    """Return the message for invalid manual entry data, or None when it can be analyzed"""
+    # Validate that we have basic required information
+    if not user_info['name']:
+        return 'Please enter your name.'
+    
+    if user_info['age'] < 10 or user_info['age'] > 120:
+        return 'Please enter a valid age between 10 and 120.'
+    
+    if not user_info['gender']:
+        return 'Please select your gender.'
+    
+    # Check if at least some health parameters are provided
+    non_zero_params = [v for v in health_data.values() if v > 0]
+    if len(non_zero_params) < 2:
+        return 'Please enter at least 2 health parameters for analysis.'
+    
+    return None
+
+def detach_upload(file):
+    """Copy an upload out of the request so a background job can still read it.
+    
+    Small files are kept as bytes; larger ones spill to a temporary file whose
+    path is returned instead.
+    """
+    stream = file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    
+    if size <= app.config['UPLOAD_SPOOL_THRESHOLD']:
+        return stream.read()
+    
+    suffix = os.path.splitext(secure_filename(file.filename))[1]
+    with tempfile.NamedTemporaryFile(prefix='bodytune-upload-', suffix=suffix, delete=False) as spill:
+        shutil.copyfileobj(stream, spill)
+    return spill.name
+
+def process_detached_report(source, filename, user_info):
+    """Background job: process a detached upload and remove its spill file"""
+    try:
+        return process_report(source, filename, user_info)
+    finally:
+        if isinstance(source, str):
+            os.remove(source)
+
+def wants_async_upload():
+    """Check whether the client asked for asynchronous upload processing"""
+    value = request.args.get('async', request.form.get('async', ''))
+    return value.lower() in ('1', 'true', 'yes')
+
 @app.route('/')
 def index():
     """Home page"""
@@ -65,13 +376,7 @@ def upload_file():
         return redirect(request.url)
     
     file = request.files['file']
-    user_info = {
-        'name': request.form.get('name', ''),
-        'age': request.form.get('age', ''),
-        'gender': request.form.get('gender', ''),
-        'weight': request.form.get('weight', ''),
-        'height': request.form.get('height', '')
-    }
+    user_info = upload_user_info(request.form)
     
     if file.filename == '':
         flash('No file selected')
@@ -79,34 +384,24 @@ def upload_file():
     
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        
+        if wants_async_upload():
+            # Process in the background; the client polls the job status
+            job_id = job_manager.submit(process_detached_report, detach_upload(file), filename, user_info)
+            return jsonify({
+                'job_id': job_id,
+                'status': JobManager.QUEUED,
+                'status_url': url_for('job_status', job_id=job_id)
+            }), 202
         
         try:
-            # Parse the medical report
-            parser = ReportParser()
-            health_data = parser.parse_report(file_path)
-            
-            # Analyze health parameters
-            analyzer = HealthAnalyzer()
-            analysis_results = analyzer.analyze_parameters(health_data, user_info)
-            
-            # Generate recommendations
-            recommendation_engine = RecommendationEngine()
-            recommendations = recommendation_engine.generate_recommendations(
-                analysis_results, user_info
-            )
-            
-            # Save to database
-            # (Implementation for database saving would go here)
-            
-            return render_template('results.html', 
-                                 health_data=health_data,
-                                 analysis=analysis_results,
-                                 recommendations=recommendations,
-                                 user_info=user_info)
+            # The page is streamed: header and score first, recommendations when ready
+            result = process_report(file.stream, filename, user_info, defer_recommendations=True)
+            return stream_page('results.html', **result)
+        
+        except OCRBusyError:
+            flash('Our report reader is busy right now. Please try again in a few seconds.')
+            return render_template('upload.html'), 503, {'Retry-After': '5'}
                                  
         except Exception as e:
             flash(f'Error processing file: {str(e)}')
@@ -116,92 +411,111 @@ def upload_file():
         flash('Invalid file type. Please upload PDF, PNG, JPG, JPEG, or GIF files.')
         return redirect(request.url)
 
+@app.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    """Handle a batch of reports (several files and/or zip archives) for a whole group"""
+    files = [file for file in request.files.getlist('files') + request.files.getlist('file')
+             if file and file.filename]
+    if not files:
+        return jsonify({'error': 'No files selected'}), 400
+    
+    # Profile fields apply to every member of the batch
+    user_info = {
+        'age': request.form.get('age', ''),
+        'gender': request.form.get('gender', ''),
+        'weight': request.form.get('weight', ''),
+        'height': request.form.get('height', '')
+    }
+    
+    with tempfile.TemporaryDirectory(prefix='bodytune-batch-') as batch_dir:
+        reports = []
+        rejected = []
+        
+        try:
+            for index, file in enumerate(files):
+                filename = secure_filename(file.filename)
+                file_path = os.path.join(batch_dir, f"{index:04d}_{filename}")
+                
+                if filename.lower().endswith('.zip'):
+                    file.save(file_path)
+                    archive_dir = tempfile.mkdtemp(dir=batch_dir)
+                    reports.extend(batch_processor.extract_archive(file_path, archive_dir))
+                elif allowed_file(filename):
+                    file.save(file_path)
+                    reports.append((os.path.splitext(filename)[0], file_path))
+                else:
+                    rejected.append(file.filename)
+            
+            if not reports:
+                return jsonify({'error': 'No PDF or image reports found', 'rejected': rejected}), 400
+            
+            batch_results = batch_processor.process(reports, user_info)
+        
+        except (ValueError, zipfile.BadZipFile) as e:
+            return jsonify({'error': str(e)}), 400
+    
+    batch_results['rejected'] = rejected
+    return jsonify(batch_results)
+
 @app.route('/analyze', methods=['POST'])
 def analyze_manual():
     """Handle manual parameter entry and analysis"""
     try:
-        health_data = {
-            # Basic health parameters
-            'glucose': safe_float_conversion(request.form.get('glucose')),
-            'cholesterol_total': safe_float_conversion(request.form.get('cholesterol_total')),
-            'cholesterol_hdl': safe_float_conversion(request.form.get('cholesterol_hdl')),
-            'cholesterol_ldl': safe_float_conversion(request.form.get('cholesterol_ldl')),
-            'blood_pressure_systolic': safe_float_conversion(request.form.get('bp_systolic')),
-            'blood_pressure_diastolic': safe_float_conversion(request.form.get('bp_diastolic')),
-            'bmi': safe_float_conversion(request.form.get('bmi')),
-            'body_fat_percentage': safe_float_conversion(request.form.get('body_fat')),
-            # InBody specific parameters
-            'weight': safe_float_conversion(request.form.get('weight')),
-            'muscle_mass': safe_float_conversion(request.form.get('muscle_mass')),
-            'protein': safe_float_conversion(request.form.get('protein')),
-            'minerals': safe_float_conversion(request.form.get('minerals')),
-            'total_body_water': safe_float_conversion(request.form.get('total_body_water')),
-            'visceral_fat_level': safe_float_conversion(request.form.get('visceral_fat_level')),
-            'basal_metabolic_rate': safe_float_conversion(request.form.get('basal_metabolic_rate')),
-            'waist_hip_ratio': safe_float_conversion(request.form.get('waist_hip_ratio')),
-            'inbody_score': safe_float_conversion(request.form.get('inbody_score'))
-        }
-        
-        user_info = {
-            'name': request.form.get('name', ''),
-            'age': safe_int_conversion(request.form.get('age'), 25),
-            'gender': request.form.get('gender', ''),
-            'weight': safe_float_conversion(request.form.get('weight')),
-            'height': safe_float_conversion(request.form.get('height')),
-            'activity_level': request.form.get('activity_level', 'moderate')
-        }
-        
-        # Validate that we have basic required information
-        if not user_info['name']:
-            flash('Please enter your name.')
-            return redirect(url_for('manual_entry'))
+        health_data, user_info = read_manual_entry(request.form)
         
-        if user_info['age'] < 10 or user_info['age'] > 120:
-            flash('Please enter a valid age between 10 and 120.')
+        error = validate_manual_entry(health_data, user_info)
+        if error:
+            flash(error)
             return redirect(url_for('manual_entry'))
         
-        if not user_info['gender']:
-            flash('Please select your gender.')
-            return redirect(url_for('manual_entry'))
-        
-        # Check if at least some health parameters are provided
-        non_zero_params = [v for v in health_data.values() if v > 0]
-        if len(non_zero_params) < 2:
-            flash('Please enter at least 2 health parameters for analysis.')
-            return redirect(url_for('manual_entry'))
-        
-        # Analyze health parameters
-        analyzer = HealthAnalyzer()
-        analysis_results = analyzer.analyze_parameters(health_data, user_info)
-        
-        # Generate recommendations with error handling
-        try:
-            recommendation_engine = RecommendationEngine()
-            recommendations = recommendation_engine.generate_recommendations(
-                analysis_results, user_info
-            )
-        except KeyError as e:
-            flash(f'Error generating recommendations: Missing strategy {str(e)}. Using default recommendations.')
-            # Provide minimal recommendations as fallback
-            recommendations = {
-                'diet_plan': {'strategy': 'optimal', 'daily_calories': 2000},
-                'workout_plan': {'strategy': 'optimal'},
-                'timeline': {'overall': 'Contact healthcare provider for personalized advice'}
-            }
-        except Exception as e:
-            flash(f'Error generating recommendations: {str(e)}. Please try again.')
-            return redirect(url_for('manual_entry'))
-        
-        return render_template('results.html', 
-                             health_data=health_data,
-                             analysis=analysis_results,
-                             recommendations=recommendations,
-                             user_info=user_info)
+        # Stream the page: header and score go out now, recommendations follow
+        # when generated (or at once when the analysis was cached)
+        result = analyze_data(health_data, user_info, defer_recommendations=True)
+        return stream_page('results.html', **result)
                              
     except Exception as e:
         flash(f'Error analyzing data: {str(e)}. Please check your input values.')
         return redirect(url_for('manual_entry'))
 
+@app.route('/api/analyze', methods=['POST'])
+def api_analyze():
+    """API endpoint for manual entry analysis; the page renders the JSON itself"""
+    health_data, user_info = read_manual_entry(request.form)
+    
+    error = validate_manual_entry(health_data, user_info)
+    if error:
+        return json_response({'error': error}, 400)
+    
+    try:
+        return json_response(analyze_data(health_data, user_info))
+    except Exception as e:
+        app.logger.exception('Manual entry analysis failed')
+        return json_response({'error': f'Error analyzing data: {str(e)}. Please check your input values.'}, 500)
+
+@app.route('/api/upload', methods=['POST'])
+def api_upload():
+    """API endpoint for report upload and analysis; the page renders the JSON itself"""
+    file = request.files.get('file')
+    if file is None or file.filename == '':
+        return json_response({'error': 'No file selected'}, 400)
+    
+    if not allowed_file(file.filename):
+        return json_response({'error': 'Invalid file type. Please upload PDF, PNG, JPG, JPEG, or GIF files.'}, 400)
+    
+    try:
+        result = process_report(file.stream, secure_filename(file.filename), upload_user_info(request.form))
+        return json_response(result)
+    
+    except OCRBusyError:
+        response = json_response(
+            {'error': 'Our report reader is busy right now. Please try again in a few seconds.'}, 503
+        )
+        response.headers['Retry-After'] = '5'
+        return response
+    
+    except Exception as e:
+        return json_response({'error': f'Error processing file: {str(e)}'}, 500)
+
 @app.route('/manual-entry')
 def manual_entry():
     """Manual parameter entry page"""
@@ -212,6 +526,44 @@ def health_check():
     """API endpoint for health check"""
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """API endpoint for the status and result of an asynchronous upload"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found', 'job_id': job_id}), 404
+    
+    if job['status'] == JobManager.FINISHED:
+        job['results_url'] = url_for('job_results', job_id=job_id)
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>')
+def job_results(job_id):
+    """Results page of a finished asynchronous upload"""
+    job = job_manager.get(job_id)
+    if job is None:
+        flash('This analysis is no longer available. Please upload your report again.')
+        return redirect(url_for('upload_page'))
+    
+    if job['status'] == JobManager.FAILED:
+        flash(f"Error processing file: {job['error']}")
+        return redirect(url_for('upload_page'))
+    
+    if job['status'] != JobManager.FINISHED:
+        return jsonify(job), 202
+    
+    return render_template('results.html', **job['result'])
+
+@app.route('/api/cache-stats')
+def cache_stats():
+    """API endpoint for cache hit/miss statistics"""
+    return jsonify({
+        'parse_cache': parse_cache.stats(),
+        'analysis_cache': analysis_cache.stats(),
+        'trends': trend_engine.stats(),
+        'meal_plans': meal_planner.stats()
+    })
+
 @app.errorhandler(404)
 def not_found_error(error):
     return render_template('404.html'), 404
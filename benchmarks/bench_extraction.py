@@ -0,0 +1,82 @@
+"""Benchmark ReportParser parameter extraction against the per-pattern search loop
+
+Run from the project root:
+
+    python -m benchmarks.bench_extraction
+"""
+import re
+import time
+from typing import Dict
+
+from utils.report_parser import ReportParser
+
+
+PAGE_COUNTS = [1, 5, 10, 25, 50, 100, 200]
+REPEATS = 5
+
+FIRST_PAGE = """InBody Body Composition Analysis
+Weight: 46.0 kg   Skeletal Muscle Mass (SMM): 32.6 kg   Body Fat: 16.0%
+Total Body Water: 22.7 L   Protein: 5.9 kg   Minerals: 2.37 kg
+Visceral Fat Level: 7   Basal Metabolic Rate: 1040   WHR: 0.86   InBody Score: 68
+Fasting Glucose: 85 mg/dL   Total Cholesterol: 165 mg/dL   HDL: 55   LDL: 95
+Blood Pressure: 110/70 mmHg   BMI: 18.6
+"""
+
+FILLER_PAGE = (
+    "Clinical notes: patient reports regular sleep and moderate activity. Reference "
+    "intervals are shown next to each result; values flagged high or low are marked "
+    "with an asterisk. Total body composition and blood markers should be interpreted "
+    "by a qualified practitioner.\n"
+) * 20
+
+
+def legacy_extract(parameter_patterns: Dict[str, list], text: str) -> Dict[str, float]:
+    """The original extraction loop: one re.search over the whole text per pattern"""
+    extracted_data = {}
+    text_lower = text.lower()
+    for parameter, patterns in parameter_patterns.items():
+        for pattern in patterns:
+            match = re.search(pattern, text_lower, re.IGNORECASE)
+            if match:
+                try:
+                    extracted_data[parameter] = float(match.group(1))
+                    break
+                except (ValueError, IndexError):
+                    continue
+    return extracted_data
+
+
+def build_report(pages: int) -> str:
+    """Build a synthetic report with all values on the first page"""
+    return FIRST_PAGE + FILLER_PAGE * pages
+
+
+def time_call(func, *args) -> float:
+    """Return the best wall time of a call in milliseconds"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = ReportParser()
+
+    print(f"{'pages':>6} {'chars':>10} {'loop (ms)':>12} {'single pass (ms)':>18} {'speedup':>9}")
+    for pages in PAGE_COUNTS:
+        text = build_report(pages)
+
+        expected = legacy_extract(parser.parameter_patterns, text)
+        actual = parser.extractor.extract(text.lower())
+        if expected != actual:
+            raise SystemExit(f"Extraction mismatch at {pages} pages: {expected} != {actual}")
+
+        loop_ms = time_call(legacy_extract, parser.parameter_patterns, text)
+        single_ms = time_call(lambda t: parser.extractor.extract(t.lower()), text)
+        print(f"{pages:>6} {len(text):>10} {loop_ms:>12.2f} {single_ms:>18.2f} {loop_ms / single_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
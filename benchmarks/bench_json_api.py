@@ -0,0 +1,60 @@
+"""Compare the server-rendered results page with the JSON analysis API
+
+Run from the project root:
+
+    python -m benchmarks.bench_json_api
+
+Posts the same manual entry to /analyze (streamed results.html) and to
+/api/analyze (JSON the page renders itself) and reports the response size
+and time per request; both reuse the cached analysis after the first post.
+Also times encoding the result payload with orjson (when installed) and the
+stdlib json fallback, and checks that a matching If-None-Match gets a 304.
+"""
+import time
+
+import app
+from utils import json_response
+
+
+REQUESTS = 300
+
+FORM = {'name': 'Bench', 'age': '42', 'gender': 'female', 'weight': '78', 'height': '165',
+        'activity_level': 'light', 'glucose': '130', 'cholesterol_total': '230', 'bmi': '29',
+        'body_fat': '28', 'bp_systolic': '135', 'bp_diastolic': '88', 'muscle_mass': '24'}
+
+
+def timed(func, repeat: int = REQUESTS) -> float:
+    """Return us per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    client = app.app.test_client()
+
+    print(f"{'':<16} {'bytes':>8} {'request us':>11}")
+    for url in ('/analyze', '/api/analyze'):
+        size = len(client.post(url, data=FORM).data)
+        per_request = timed(lambda: client.post(url, data=FORM).data)
+        print(f"{url:<16} {size:>8} {per_request:>11.1f}")
+
+    response = client.post('/api/analyze', data=FORM)
+    revalidated = client.post('/api/analyze', data=FORM, headers={'If-None-Match': response.headers['ETag']})
+    print(f"\nIf-None-Match: {revalidated.status_code}, {len(revalidated.data)} bytes")
+
+    payload = app.analyze_data(*app.read_manual_entry(FORM))
+    encoders = [('stdlib json', False)]
+    if json_response.ORJSON_AVAILABLE:
+        encoders.insert(0, ('orjson', True))
+    try:
+        for name, use_orjson in encoders:
+            json_response.ORJSON_AVAILABLE = use_orjson
+            print(f"encode {name:<12} {timed(lambda: json_response.dumps(payload)):>8.1f} us")
+    finally:
+        json_response.ORJSON_AVAILABLE = encoders[0][1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Measure per-request allocation and time of HealthAnalyzer message lookup
+
+Run from the project root:
+
+    python -m benchmarks.bench_messages
+
+Compares the shared message catalog with the previous behaviour of building
+the nested message dictionary for every analyzed parameter.
+"""
+import time
+import tracemalloc
+
+from models.health_analyzer import HealthAnalyzer, IDEAL_RANGES
+from models.messages import PARAMETER_MESSAGES
+
+
+REQUESTS = 2000
+
+HEALTH_DATA = {parameter: 50.0 for parameter in IDEAL_RANGES}
+USER_INFO = {'gender': 'female', 'age': 30, 'weight': 60.0, 'height': 165.0}
+
+
+class PerCallMessageAnalyzer(HealthAnalyzer):
+    """The previous behaviour: a fresh nested message dict on every call"""
+
+    def _analyze_with_range(self, parameter, value, user_info, entry):
+        # Results used to be plain dicts with the message filled in eagerly
+        result = super()._analyze_with_range(parameter, value, user_info, entry).to_dict()
+        if 'deviation' in result:
+            messages = {name: dict(statuses) for name, statuses in PARAMETER_MESSAGES.items()}
+            result['message'] = messages.get(parameter, {}).get(result['status'], 'Status determined.')
+        return result
+
+
+def measure(analyzer: HealthAnalyzer):
+    """Return (peak KiB allocated while handling one request, us per request)"""
+    analyzer.analyze_parameters(HEALTH_DATA, USER_INFO)
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(20):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = analyzer.analyze_parameters(HEALTH_DATA, USER_INFO)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+        del result
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        analyzer.analyze_parameters(HEALTH_DATA, USER_INFO)
+    elapsed = time.perf_counter() - start
+
+    return min(peaks) / 1024, elapsed / REQUESTS * 1e6
+
+
+def main():
+    print(f"{len(HEALTH_DATA)} parameters per request\n")
+    print(f"{'':<22} {'peak KiB/request':>17} {'us/request':>11}")
+    for name, analyzer in (('per-call dict', PerCallMessageAnalyzer()),
+                           ('shared catalog', HealthAnalyzer())):
+        peak, micros = measure(analyzer)
+        print(f"{name:<22} {peak:>17.1f} {micros:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Measure extraction accuracy and speed on a synthetic report corpus
+
+Run from the project root:
+
+    python -m benchmarks.bench_parser_accuracy [--reports 600] [--seed 0] [--min-accuracy 0.9]
+
+Every report of ``benchmarks.report_corpus`` is extracted by ``ReportParser``
+(with vendor pack detection) and, for InBody sheets, by the
+``InBodyReportParser`` pattern pack. Each parameter of the ground truth counts
+as correct, wrong (a different value was extracted) or missed; values found
+for parameters that are not in the report count as spurious. With
+``--min-accuracy`` the run exits non-zero when the ``ReportParser`` accuracy on
+clean reports falls below the threshold.
+"""
+import argparse
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from benchmarks.report_corpus import VALUE_RANGES, SyntheticReport, build_corpus
+from utils.pattern_registry import pattern_registry
+from utils.report_parser import ReportParser
+
+
+class Score:
+    """Correct/wrong/missed/spurious counters and extraction time"""
+
+    def __init__(self):
+        self.correct = 0
+        self.wrong = 0
+        self.missed = 0
+        self.spurious = 0
+        self.seconds = 0.0
+        self.reports = 0
+        self.chars = 0
+
+    @property
+    def accuracy(self) -> float:
+        total = self.correct + self.wrong + self.missed
+        return self.correct / total if total else 0.0
+
+    def add(self, other: 'Score') -> None:
+        for name in ('correct', 'wrong', 'missed', 'spurious', 'seconds', 'reports', 'chars'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+def score_report(extract: Callable[[str], Dict[str, float]], report: SyntheticReport,
+                 per_parameter: Dict[str, Score]) -> Score:
+    """Extract one report and compare the values with its ground truth"""
+    text = report.text.lower()
+    start = time.perf_counter()
+    extracted = extract(text)
+    elapsed = time.perf_counter() - start
+
+    score = Score()
+    score.seconds = elapsed
+    score.reports = 1
+    score.chars = len(report.text)
+    for parameter in VALUE_RANGES:
+        parameter_score = per_parameter[parameter]
+        expected = report.truth.get(parameter)
+        actual = extracted.get(parameter)
+        if expected is None:
+            if actual is not None:
+                score.spurious += 1
+                parameter_score.spurious += 1
+        elif actual is None:
+            score.missed += 1
+            parameter_score.missed += 1
+        elif abs(actual - expected) < 1e-9:
+            score.correct += 1
+            parameter_score.correct += 1
+        else:
+            score.wrong += 1
+            parameter_score.wrong += 1
+    return score
+
+
+def print_table(title: str, rows: Dict[str, Score], timing: bool = False) -> None:
+    """Print accuracy (and optionally speed) per row"""
+    print(f"\n{title}")
+    header = f"{'':<26} {'accuracy':>9} {'correct':>8} {'wrong':>6} {'missed':>7} {'spurious':>9}"
+    if timing:
+        header += f" {'ms/report':>10} {'MB/s':>7}"
+    print(header)
+    for name, score in rows.items():
+        line = (f"{name:<26} {score.accuracy:>8.1%} {score.correct:>8} {score.wrong:>6} "
+                f"{score.missed:>7} {score.spurious:>9}")
+        if timing and score.reports:
+            line += (f" {score.seconds * 1000 / score.reports:>10.3f}"
+                     f" {score.chars / score.seconds / 1e6 if score.seconds else 0:>7.1f}")
+        print(line)
+
+
+def evaluate(name: str, extract: Callable[[str], Dict[str, float]],
+             corpus: List[SyntheticReport]) -> Dict[str, Score]:
+    """Score an extractor on a corpus and print its tables; returns scores by noise level"""
+    per_parameter: Dict[str, Score] = defaultdict(Score)
+    by_group: Dict[str, Score] = defaultdict(Score)
+    by_noise: Dict[str, Score] = defaultdict(Score)
+    total = Score()
+
+    for report in corpus:
+        score = score_report(extract, report, per_parameter)
+        by_group[f"{report.vendor or report.format} ({report.pages}p)"].add(score)
+        by_noise[report.noise].add(score)
+        total.add(score)
+
+    print(f"\n=== {name}: {total.reports} reports, {total.chars / 1e6:.1f} MB ===")
+    print_table('By noise level', dict(by_noise), timing=True)
+    print_table('By format and size', dict(sorted(by_group.items())), timing=True)
+    print_table('By parameter', {p: per_parameter[p] for p in VALUE_RANGES if p in per_parameter})
+    print_table('Total', {'all': total}, timing=True)
+    return by_noise
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument('--reports', type=int, default=600)
+    argument_parser.add_argument('--seed', type=int, default=0)
+    argument_parser.add_argument('--min-accuracy', type=float, default=None,
+                                 help='fail if ReportParser accuracy on clean reports is lower')
+    args = argument_parser.parse_args()
+
+    corpus = build_corpus(args.reports, seed=args.seed)
+    parser = ReportParser()
+
+    def extract_report(text: str) -> Dict[str, float]:
+        # Same pack selection as ReportParser, without the sample-data fallback
+        return parser._select_pattern_set(text).extractor.extract(text)
+
+    by_noise = evaluate('ReportParser', extract_report, corpus)
+
+    inbody_extractor = pattern_registry.get('inbody').extractor
+    evaluate('InBodyReportParser patterns', inbody_extractor.extract,
+             [report for report in corpus if report.format == 'inbody'])
+
+    if args.min_accuracy is not None:
+        accuracy = by_noise['clean'].accuracy
+        if accuracy < args.min_accuracy:
+            raise SystemExit(f"Accuracy on clean reports {accuracy:.1%} is below {args.min_accuracy:.1%}")
+
+
+if __name__ == '__main__':
+    main()
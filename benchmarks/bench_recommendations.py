@@ -0,0 +1,135 @@
+"""Measure RecommendationEngine construction and generate_recommendations latency
+
+Run from the project root:
+
+    python -m benchmarks.bench_recommendations
+
+Compares the shared plan fragments (frozen knowledge base compiled into the
+plan table) with the previous behaviour of building the diet and workout
+tables in every engine and the schedule, cardio and strength plan tables on
+every call. The baseline evaluates the tables as compiled dict/list
+literals, which is what the inline tables did. Meal plans come from the
+shared MealPlanner cache in both; solve_ms times uncached solves.
+"""
+import time
+import tracemalloc
+
+from models.health_analyzer import HealthAnalyzer
+from models.knowledge_base import KNOWLEDGE_BASE
+from models.meal_planner import MealPlanner
+from models.plan_table import PlanFragment
+from models.recommendation_engine import RecommendationEngine
+
+
+REQUESTS = 2000
+
+HEALTH_DATA = {'glucose': 130.0, 'cholesterol_total': 230.0, 'bmi': 29.0, 'body_fat_percentage': 28.0,
+               'blood_pressure_systolic': 135.0, 'blood_pressure_diastolic': 88.0}
+USER_INFO = {'gender': 'female', 'age': 42, 'weight': 78.0, 'height': 165.0, 'activity_level': 'light'}
+
+
+def thaw(value):
+    """Deep copy into plain dicts and lists"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+# Each section as a compiled literal expression, re-evaluated on every use
+SECTION_LITERALS = {section: compile(repr(thaw(tables)), f'<{section}>', 'eval')
+                    for section, tables in KNOWLEDGE_BASE.items()}
+
+
+class PerCallKnowledgeBaseEngine(RecommendationEngine):
+    """The previous behaviour: fresh recommendation tables per engine and per call"""
+
+    def __init__(self):
+        super().__init__()
+        self.diet_recommendations = eval(SECTION_LITERALS['diet'])
+        self.workout_recommendations = eval(SECTION_LITERALS['workout'])
+
+    def _plan(self, section, strategy):
+        plans = eval(SECTION_LITERALS[section])
+        return plans.get(strategy, plans['optimal'])
+
+    def _plan_fragment(self, priority_params, user_info, daily_calories):
+        diet_strategy = self._diet_strategy(priority_params)
+        workout_strategy = self._workout_strategy(priority_params)
+        diet = self.diet_recommendations[diet_strategy].copy()
+        workout_plan = {
+            'strategy': workout_strategy,
+            'cardio_plan': self._plan('cardio_plans', workout_strategy),
+            'strength_plan': self._plan('strength_plans', workout_strategy),
+            'special_notes': self.workout_recommendations[workout_strategy]['special_notes'],
+            'weekly_schedule': self._plan('weekly_schedules', workout_strategy)
+        }
+        return PlanFragment(diet_strategy, workout_strategy, diet, workout_plan)
+
+
+def timed(func, repeat: int = REQUESTS) -> float:
+    """Return us per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def peak_kib(func) -> float:
+    """Return the smallest peak KiB allocated by one call"""
+    peaks = []
+    tracemalloc.start()
+    for _ in range(20):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+        del result
+    tracemalloc.stop()
+    return min(peaks) / 1024
+
+
+def solve_times(count: int = 200):
+    """Milliseconds per uncached meal plan solve over a spread of macro targets"""
+    planner = MealPlanner()
+    engine = RecommendationEngine(meal_planner=planner)
+    strategies = sorted(engine.diet_recommendations)
+    timings = []
+    for index in range(count):
+        strategy = strategies[index % len(strategies)]
+        user_info = dict(USER_INFO, weight=45.0 + index % 90, age=18 + index % 60)
+        daily_calories = engine._calculate_daily_calories(user_info)
+        macronutrients = engine._calculate_macronutrients(daily_calories, strategy, user_info)
+        start = time.perf_counter()
+        planner.solve(strategy, (macronutrients['protein_grams'], macronutrients['carb_grams'],
+                                 macronutrients['fat_grams']))
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main():
+    analysis = HealthAnalyzer().analyze_parameters(HEALTH_DATA, USER_INFO)
+
+    print(f"{'':<22} {'construct us':>13} {'generate us':>12} {'request us':>11} {'peak KiB':>9}")
+    for name, engine_class in (('per-call tables', PerCallKnowledgeBaseEngine),
+                               ('shared plan table', RecommendationEngine)):
+        engine = engine_class()
+
+        def request():
+            # The routes build an engine per request
+            return engine_class().generate_recommendations(analysis, USER_INFO)
+
+        construct = timed(engine_class)
+        generate = timed(lambda: engine.generate_recommendations(analysis, USER_INFO))
+        per_request = timed(request)
+        print(f"{name:<22} {construct:>13.2f} {generate:>12.2f} {per_request:>11.2f} {peak_kib(request):>9.1f}")
+
+    timings = solve_times()
+    print(f"\nsolve_ms (uncached meal plan): median {timings[len(timings) // 2]:.2f}, "
+          f"p99 {timings[int(len(timings) * 0.99)]:.2f}, max {timings[-1]:.2f}")
+
+
+if __name__ == '__main__':
+    main()
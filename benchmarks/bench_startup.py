@@ -0,0 +1,93 @@
+"""Measure the cold import time of app.py
+
+Run from the project root:
+
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 800]
+
+Every run imports ``app`` in a fresh interpreter. The median wall time is
+printed next to ``--budget-ms``, together with any heavy optional module
+(numpy, PyPDF2, PIL, pytesseract, pandas) that ``import app`` loaded, the
+slowest top-level imports of the last run and the cost of the opt-in
+preload (``BODYTUNE_PRELOAD=1``). tests/test_startup.py enforces the
+budget and the deferred imports.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from utils.startup import HEAVY_MODULES
+
+
+# Modules ``import app`` must leave to first use
+DEFERRED_MODULES = HEAVY_MODULES + ('pandas',)
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [name for name in %r if name in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+PRELOAD_SCRIPT = """
+import json
+import app
+from utils.startup import preload
+print(json.dumps(preload()))
+"""
+
+
+def run_python(script: str, *options: str, env=None) -> subprocess.CompletedProcess:
+    """Run a script in a fresh interpreter from the project root"""
+    return subprocess.run([sys.executable, *options, '-c', script], capture_output=True, text=True,
+                          cwd=os.getcwd(), env=env, check=True)
+
+
+def slowest_imports(stderr: str, count: int = 10):
+    """Modules imported directly by app with the largest cumulative time in -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Each nesting level adds two spaces; app itself is at the top level
+        if name.startswith('   ') and not name.startswith('    ') and cumulative.strip().isdigit():
+            modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument('--runs', type=int, default=5)
+    argument_parser.add_argument('--budget-ms', type=float, default=800.0)
+    args = argument_parser.parse_args()
+
+    env = {key: value for key, value in os.environ.items() if key != 'BODYTUNE_PRELOAD'}
+    timings = []
+    loaded = []
+    for _ in range(args.runs):
+        result = json.loads(run_python(IMPORT_SCRIPT, env=env).stdout.strip().splitlines()[-1])
+        timings.append(result['seconds'] * 1000)
+        loaded = result['loaded']
+
+    median = statistics.median(timings)
+    print(f"import app: median {median:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"deferred modules loaded by import app: {', '.join(loaded) or 'none'}")
+
+    print("\nSlowest imports of app.py (cumulative ms):")
+    stderr = run_python('import app', '-X', 'importtime', env=env).stderr
+    for cumulative, name in slowest_imports(stderr):
+        print(f"  {cumulative / 1000:>8.1f}  {name}")
+
+    print("\nOpt-in preload (ms, '-' when not installed):")
+    preload_timings = json.loads(run_python(PRELOAD_SCRIPT, env=env).stdout.strip().splitlines()[-1])
+    for name, seconds in preload_timings.items():
+        print(f"  {name:<32} {'-' if seconds is None else f'{seconds * 1000:.1f}':>8}")
+
+
+if __name__ == '__main__':
+    main()
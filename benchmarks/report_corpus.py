@@ -0,0 +1,256 @@
+"""Synthetic report texts with known parameter values
+
+Each report is rendered in one of the layouts the parsers target (generic
+medical reports, InBody result sheets and laboratory panels) at a random size,
+with optional layout noise and OCR-style misspellings. The values used to
+render a report are kept as its ground truth.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+FORMATS = ('generic', 'inbody', 'lab_panel')
+NOISE_LEVELS = ('clean', 'noisy', 'ocr')
+PAGE_COUNTS = (1, 2, 5, 20)
+
+# Value range and decimals of every parameter
+VALUE_RANGES: Dict[str, Tuple[float, float, int]] = {
+    'glucose': (70, 180, 0),
+    'cholesterol_total': (120, 280, 0),
+    'cholesterol_hdl': (30, 90, 0),
+    'cholesterol_ldl': (50, 190, 0),
+    'blood_pressure_systolic': (95, 160, 0),
+    'blood_pressure_diastolic': (55, 100, 0),
+    'bmi': (16, 38, 1),
+    'weight': (40, 120, 1),
+    'body_fat_percentage': (8, 40, 1),
+    'muscle_mass': (18, 45, 1),
+    'protein': (5, 14, 1),
+    'minerals': (1.8, 4.5, 2),
+    'total_body_water': (18, 50, 1),
+    'visceral_fat_level': (1, 20, 0),
+    'basal_metabolic_rate': (1000, 2200, 0),
+    'waist_hip_ratio': (0.7, 1.05, 2),
+    'inbody_score': (50, 100, 0)
+}
+
+# Labels printed by generic reports, with the unit written after the value
+GENERIC_LABELS: Dict[str, Tuple[List[str], str]] = {
+    'glucose': (['Glucose', 'Fasting Glucose', 'Blood Sugar'], 'mg/dL'),
+    'cholesterol_total': (['Total Cholesterol', 'Cholesterol Total', 'Cholesterol'], 'mg/dL'),
+    'cholesterol_hdl': (['HDL', 'HDL-C'], 'mg/dL'),
+    'cholesterol_ldl': (['LDL', 'LDL-C'], 'mg/dL'),
+    'bmi': (['BMI', 'Body Mass Index'], 'kg/m2'),
+    'weight': (['Weight', 'Body Weight'], 'kg'),
+    'body_fat_percentage': (['Body Fat', 'Fat Percentage', 'Body Fat %'], '%'),
+    'muscle_mass': (['Muscle Mass', 'Skeletal Muscle', 'SMM'], 'kg'),
+    'protein': (['Protein'], 'kg'),
+    'minerals': (['Minerals', 'Bone Mineral'], 'kg'),
+    'total_body_water': (['Total Body Water', 'TBW', 'Body Water'], 'L'),
+    'visceral_fat_level': (['Visceral Fat', 'Visceral Fat Level', 'VFL'], ''),
+    'basal_metabolic_rate': (['Basal Metabolic Rate', 'BMR'], 'kcal'),
+    'waist_hip_ratio': (['Waist-Hip Ratio', 'WHR'], ''),
+    'inbody_score': (['InBody Score'], 'points')
+}
+
+# InBody result sheet rows by model; each model prints the rows of the smaller ones
+INBODY_ROWS: Dict[int, Dict[str, str]] = {
+    270: {
+        'weight': 'Weight (kg)',
+        'muscle_mass': 'Skeletal Muscle Mass',
+        'body_fat_percentage': 'Percent Body Fat',
+        'bmi': 'Body Mass Index (kg/m2)',
+        'basal_metabolic_rate': 'Basal Metabolic Rate (kcal)',
+        'visceral_fat_level': 'Visceral Fat Level',
+        'inbody_score': 'InBody Score'
+    },
+    570: {
+        'total_body_water': 'Total Body Water (L)',
+        'protein': 'Protein (kg)',
+        'minerals': 'Minerals (kg)'
+    },
+    770: {
+        'waist_hip_ratio': 'Waist-Hip Ratio'
+    }
+}
+
+# Laboratory panel rows: label, unit and reference interval
+LAB_PANEL_ROWS: Dict[str, Tuple[str, str, str]] = {
+    'glucose': ('Glucose, Fasting', 'mg/dL', '65-99'),
+    'cholesterol_total': ('Cholesterol, Total', 'mg/dL', '100-199'),
+    'cholesterol_hdl': ('HDL Cholesterol', 'mg/dL', '>39'),
+    'cholesterol_ldl': ('LDL Cholesterol Calc', 'mg/dL', '0-99')
+}
+
+FILLER_SENTENCES = [
+    "Patient reports regular sleep and moderate activity.",
+    "Results flagged with an asterisk are outside the reference interval.",
+    "Please interpret these results together with the clinical history.",
+    "Sample collected in the morning after an overnight fast.",
+    "This report was generated electronically and is valid without signature.",
+    "Follow-up testing is recommended within twelve months."
+]
+
+# Character confusions typical of OCR output
+OCR_CONFUSIONS = {'l': '1', 'o': '0', 'i': 'l', 's': '5', 'e': 'c', 'b': 'h', 'a': 'o'}
+
+
+@dataclass
+class SyntheticReport:
+    """A rendered report and the values it was rendered from"""
+    text: str
+    truth: Dict[str, float]
+    format: str
+    noise: str
+    pages: int
+    vendor: Optional[str] = None
+    corrupted: List[str] = field(default_factory=list)
+
+
+def _draw_value(rng: random.Random, parameter: str) -> float:
+    """Draw a value for a parameter, rounded the way reports print it"""
+    low, high, decimals = VALUE_RANGES[parameter]
+    value = round(rng.uniform(low, high), decimals)
+    return float(int(value)) if decimals == 0 else value
+
+
+def _format_value(parameter: str, value: float) -> str:
+    """Print a value with the decimals of its parameter"""
+    return f"{value:.{VALUE_RANGES[parameter][2]}f}"
+
+
+def _misspell(rng: random.Random, label: str, rate: float) -> str:
+    """Apply OCR-style character confusions to a label"""
+    chars = []
+    for char in label:
+        lower = char.lower()
+        if lower in OCR_CONFUSIONS and rng.random() < rate:
+            chars.append(OCR_CONFUSIONS[lower])
+        elif char == ' ' and rng.random() < rate:
+            continue
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+class ReportCorpus:
+    """Generates reproducible synthetic reports from a seed"""
+
+    def __init__(self, seed: int = 0, formats: Tuple[str, ...] = FORMATS,
+                 noise_levels: Tuple[str, ...] = NOISE_LEVELS,
+                 page_counts: Tuple[int, ...] = PAGE_COUNTS, ocr_error_rate: float = 0.04):
+        self.rng = random.Random(seed)
+        self.formats = formats
+        self.noise_levels = noise_levels
+        self.page_counts = page_counts
+        self.ocr_error_rate = ocr_error_rate
+
+    def generate(self, count: int) -> Iterator[SyntheticReport]:
+        """Yield ``count`` reports, cycling through the formats and noise levels"""
+        for index in range(count):
+            report_format = self.formats[index % len(self.formats)]
+            noise = self.noise_levels[(index // len(self.formats)) % len(self.noise_levels)]
+            yield self.build(report_format, noise, self.rng.choice(self.page_counts))
+
+    def build(self, report_format: str, noise: str, pages: int) -> SyntheticReport:
+        """Render one report"""
+        if report_format == 'generic':
+            header, rows, truth, vendor = self._generic_rows()
+        elif report_format == 'inbody':
+            header, rows, truth, vendor = self._inbody_rows()
+        elif report_format == 'lab_panel':
+            header, rows, truth, vendor = self._lab_panel_rows()
+        else:
+            raise ValueError(f"Unknown report format: {report_format}")
+
+        report = SyntheticReport('', truth, report_format, noise, pages, vendor)
+        rows = [self._add_noise(label, rest, noise, report) for label, rest in rows]
+
+        # Spread the rows over the pages; the header stays on the first page
+        page_rows: List[List[str]] = [[] for _ in range(pages)]
+        for row in rows:
+            page_rows[self.rng.randrange(pages)].append(row)
+
+        rendered = []
+        for page_index, lines in enumerate(page_rows):
+            page = [header] if page_index == 0 else [f"Page {page_index + 1} of {pages}"]
+            for line in lines:
+                page.append(line)
+                if noise != 'clean' and self.rng.random() < 0.3:
+                    page.append(self.rng.choice(FILLER_SENTENCES))
+            page.extend(self.rng.choice(FILLER_SENTENCES) for _ in range(self.rng.randint(5, 40)))
+            rendered.append('\n'.join(page))
+        report.text = '\n\f'.join(rendered)
+        return report
+
+    def _generic_rows(self):
+        """Rows of a generic medical report with a random subset of parameters"""
+        rng = self.rng
+        truth = {}
+        rows = []
+        for parameter, (labels, unit) in GENERIC_LABELS.items():
+            if rng.random() < 0.8:
+                value = _draw_value(rng, parameter)
+                truth[parameter] = value
+                rows.append((rng.choice(labels), f"{_format_value(parameter, value)} {unit}".rstrip()))
+
+        if rng.random() < 0.8:
+            systolic = _draw_value(rng, 'blood_pressure_systolic')
+            diastolic = _draw_value(rng, 'blood_pressure_diastolic')
+            truth['blood_pressure_systolic'] = systolic
+            truth['blood_pressure_diastolic'] = diastolic
+            rows.append((rng.choice(['Blood Pressure', 'BP']), f"{systolic:.0f}/{diastolic:.0f} mmHg"))
+
+        rng.shuffle(rows)
+        return 'Medical Test Report', rows, truth, None
+
+    def _inbody_rows(self):
+        """Rows of an InBody 270/570/770 result sheet"""
+        rng = self.rng
+        model = rng.choice(sorted(INBODY_ROWS))
+        truth = {}
+        rows = [('Height', f"{rng.uniform(150, 195):.1f} cm"), ('Age', str(rng.randint(18, 80)))]
+        for row_model, model_rows in INBODY_ROWS.items():
+            if row_model > model:
+                continue
+            for parameter, label in model_rows.items():
+                value = _draw_value(rng, parameter)
+                truth[parameter] = value
+                suffix = '/100' if parameter == 'inbody_score' else ''
+                rows.append((label, _format_value(parameter, value) + suffix))
+        return f"InBody{model} Body Composition Analysis", rows, truth, f"inbody_{model}"
+
+    def _lab_panel_rows(self):
+        """Rows of a lipid or metabolic panel"""
+        rng = self.rng
+        truth = {}
+        rows = []
+        for parameter, (label, unit, reference) in LAB_PANEL_ROWS.items():
+            value = _draw_value(rng, parameter)
+            truth[parameter] = value
+            rows.append((label, f"{_format_value(parameter, value)}  {unit}  {reference}"))
+        header = rng.choice(['Lipid Panel', 'Comprehensive Metabolic Panel'])
+        return header, rows, truth, 'lab_panel'
+
+    def _add_noise(self, label: str, rest: str, noise: str, report: SyntheticReport) -> str:
+        """Render a row with the layout (and OCR) noise of the given level"""
+        rng = self.rng
+        if noise == 'clean':
+            return f"{label}: {rest}"
+
+        separator = rng.choice([': ', ' ', ':  ', '\t', ' : '])
+        if rng.random() < 0.2:
+            label = label.upper()
+        line = f"{label}{separator}{rest}"
+        if noise == 'ocr':
+            garbled = _misspell(rng, label, self.ocr_error_rate)
+            if garbled != label:
+                report.corrupted.append(label)
+            line = f"{garbled}{separator}{rest}"
+        return line
+
+
+def build_corpus(count: int, seed: int = 0, **options) -> List[SyntheticReport]:
+    """Generate a list of reports"""
+    return list(ReportCorpus(seed, **options).generate(count))
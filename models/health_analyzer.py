@@ -1,77 +1,106 @@
-from typing import Dict, Any, List
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional
+from models.range_table import RangeEntry, RangeTable
+from models.messages import MESSAGE_CATALOG
+from models.parameter_result import ParameterResult
+from models.scoring import SCORE_TABLE
+from utils.startup import lazy_import, module_available
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+# numpy is only needed for batch analysis; it is imported on first use
+NUMPY_AVAILABLE = module_available('numpy')
+np = lazy_import('numpy')
 
-try:
-    import numpy as np
-except ImportError:
-    # Fallback for systems without numpy
-    class NumpyFallback:
-        def mean(self, values):
-            return sum(values) / len(values) if values else 0
-    np = NumpyFallback()
+
+# Ideal ranges for various health parameters
+IDEAL_RANGES = {
+    # Basic health parameters
+    'glucose': {'min': 70, 'max': 100, 'unit': 'mg/dL'},
+    'cholesterol_total': {'min': 0, 'max': 200, 'unit': 'mg/dL'},
+    'cholesterol_hdl': {'min': 40, 'max': 999, 'unit': 'mg/dL'},  # Higher is better
+    'cholesterol_ldl': {'min': 0, 'max': 100, 'unit': 'mg/dL'},
+    'blood_pressure_systolic': {'min': 90, 'max': 120, 'unit': 'mmHg'},
+    'blood_pressure_diastolic': {'min': 60, 'max': 80, 'unit': 'mmHg'},
+    'bmi': {'min': 18.5, 'max': 24.9, 'unit': 'kg/m²'},
+    'body_fat_percentage': {
+        'male': {'min': 10, 'max': 18, 'unit': '%'},
+        'female': {'min': 16, 'max': 24, 'unit': '%'}
+    },
+    # InBody specific parameters
+    'weight': {
+        'male': {'min': 50, 'max': 85, 'unit': 'kg'},
+        'female': {'min': 40, 'max': 70, 'unit': 'kg'}
+    },
+    'muscle_mass': {
+        'male': {'min': 30, 'max': 50, 'unit': 'kg'},
+        'female': {'min': 20, 'max': 35, 'unit': 'kg'}
+    },
+    'protein': {
+        'male': {'min': 8, 'max': 12, 'unit': 'kg'},
+        'female': {'min': 6, 'max': 9, 'unit': 'kg'}
+    },
+    'minerals': {'min': 2.0, 'max': 4.0, 'unit': 'kg'},
+    'total_body_water': {
+        'male': {'min': 25, 'max': 40, 'unit': 'L'},
+        'female': {'min': 20, 'max': 30, 'unit': 'L'}
+    },
+    'visceral_fat_level': {'min': 1, 'max': 9, 'unit': 'level'},
+    'basal_metabolic_rate': {
+        'male': {'min': 1400, 'max': 1800, 'unit': 'kcal'},
+        'female': {'min': 1000, 'max': 1400, 'unit': 'kcal'}
+    },
+    'waist_hip_ratio': {
+        'male': {'min': 0.85, 'max': 0.95, 'unit': 'ratio'},
+        'female': {'min': 0.75, 'max': 0.85, 'unit': 'ratio'}
+    },
+    'inbody_score': {'min': 80, 'max': 100, 'unit': 'points'}
+}
+
+# Exclusive upper age limits of the age bands ranges can be adjusted for (one band for now)
+AGE_BANDS = ()
+
+# Age-adjusted ranges by (parameter, gender, age band index); empty until bands are defined
+AGE_ADJUSTED_RANGES = {}
 
 
 class HealthAnalyzer:
     """Analyzes health parameters and compares them with ideal ranges"""
     
-    def __init__(self):
-        # Define ideal ranges for various health parameters
-        self.ideal_ranges = {
-            # Basic health parameters
-            'glucose': {'min': 70, 'max': 100, 'unit': 'mg/dL'},
-            'cholesterol_total': {'min': 0, 'max': 200, 'unit': 'mg/dL'},
-            'cholesterol_hdl': {'min': 40, 'max': 999, 'unit': 'mg/dL'},  # Higher is better
-            'cholesterol_ldl': {'min': 0, 'max': 100, 'unit': 'mg/dL'},
-            'blood_pressure_systolic': {'min': 90, 'max': 120, 'unit': 'mmHg'},
-            'blood_pressure_diastolic': {'min': 60, 'max': 80, 'unit': 'mmHg'},
-            'bmi': {'min': 18.5, 'max': 24.9, 'unit': 'kg/m²'},
-            'body_fat_percentage': {
-                'male': {'min': 10, 'max': 18, 'unit': '%'},
-                'female': {'min': 16, 'max': 24, 'unit': '%'}
-            },
-            # InBody specific parameters
-            'weight': {
-                'male': {'min': 50, 'max': 85, 'unit': 'kg'},
-                'female': {'min': 40, 'max': 70, 'unit': 'kg'}
-            },
-            'muscle_mass': {
-                'male': {'min': 30, 'max': 50, 'unit': 'kg'},
-                'female': {'min': 20, 'max': 35, 'unit': 'kg'}
-            },
-            'protein': {
-                'male': {'min': 8, 'max': 12, 'unit': 'kg'},
-                'female': {'min': 6, 'max': 9, 'unit': 'kg'}
-            },
-            'minerals': {'min': 2.0, 'max': 4.0, 'unit': 'kg'},
-            'total_body_water': {
-                'male': {'min': 25, 'max': 40, 'unit': 'L'},
-                'female': {'min': 20, 'max': 30, 'unit': 'L'}
-            },
-            'visceral_fat_level': {'min': 1, 'max': 9, 'unit': 'level'},
-            'basal_metabolic_rate': {
-                'male': {'min': 1400, 'max': 1800, 'unit': 'kcal'},
-                'female': {'min': 1000, 'max': 1400, 'unit': 'kcal'}
-            },
-            'waist_hip_ratio': {
-                'male': {'min': 0.85, 'max': 0.95, 'unit': 'ratio'},
-                'female': {'min': 0.75, 'max': 0.85, 'unit': 'ratio'}
-            },
-            'inbody_score': {'min': 80, 'max': 100, 'unit': 'points'}
-        }
+    # Parameters whose ideal range depends on gender
+    GENDER_SPECIFIC_PARAMETERS = ['body_fat_percentage', 'weight', 'muscle_mass', 'protein',
+                                  'total_body_water', 'basal_metabolic_rate', 'waist_hip_ratio']
+    
+    # Blood test parameters where a value of 0 means "not entered"
+    REQUIRED_LAB_PARAMETERS = ['glucose', 'cholesterol_total', 'cholesterol_hdl', 'cholesterol_ldl',
+                               'blood_pressure_systolic', 'blood_pressure_diastolic']
+    
+    # InBody Score component weights (scoring rules live in models.scoring)
+    SCORE_COMPONENTS = SCORE_TABLE.weights
+    
+    # Parameters read by _calculate_body_type_bonus
+    BODY_TYPE_PARAMETERS = ('weight', 'skeletal_muscle_mass', 'body_fat_mass')
+    
+    def __init__(self, locale: Optional[str] = None, population_stats=None):
+        # Nested range definitions and the lookup table compiled from them at import
+        self.ideal_ranges = IDEAL_RANGES
+        self.range_table = RANGE_TABLE
+        # Compiled component scoring rules
+        self.score_table = SCORE_TABLE
+        # Shared messages for the requested locale (English by default)
+        self.messages = MESSAGE_CATALOG.bundle(locale)
+        # Optional PopulationStats; adds a cohort percentile to analyzed parameters
+        self.population_stats = population_stats
     
     def analyze_parameters(self, health_data: Dict[str, float], user_info: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze health parameters and return detailed analysis"""
         parameter_analysis = {}
         
+        gender, age_band = self.range_table.resolve(user_info)
+        range_table = self.range_table
+        
         # Analyze all parameters, even if they are 0 (might be valid values)
         for parameter, value in health_data.items():
-            parameter_analysis[parameter] = self._analyze_single_parameter(
-                parameter, value, user_info
+            parameter_analysis[parameter] = self._analyze_with_range(
+                parameter, value, user_info, range_table.get(parameter, gender, age_band)
             )
         
         # Calculate overall health score based on analyzed parameters
@@ -86,222 +115,267 @@ class HealthAnalyzer:
             'total_parameters': len(parameter_analysis)
         }
     
+    def analyze_delta(self, previous_result: Dict[str, Any], changed_params: Dict[str, Optional[float]],
+                      user_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a previous analysis for a few changed parameter values.
+        
+        Only the changed parameters are re-analyzed (a value of None removes the
+        parameter). The overall score and risk level are reused unless a changed
+        parameter feeds into them. ``user_info`` must be the one the previous result
+        was computed with. The result equals ``analyze_parameters`` on the updated
+        health data; ``previous_result`` is not modified.
+        """
+        parameter_analysis = dict(previous_result['parameter_analysis'])
+        gender, age_band = self.range_table.resolve(user_info)
+        
+        for parameter, value in changed_params.items():
+            if value is None:
+                parameter_analysis.pop(parameter, None)
+            else:
+                parameter_analysis[parameter] = self._analyze_with_range(
+                    parameter, value, user_info, self.range_table.get(parameter, gender, age_band)
+                )
+        
+        score_inputs_changed = any(
+            parameter in self.SCORE_COMPONENTS or parameter in self.BODY_TYPE_PARAMETERS
+            for parameter in changed_params
+        )
+        if score_inputs_changed:
+            # At most eight weighted components; summing them again in order keeps
+            # the score bit-identical to a full analysis
+            overall_score = self._calculate_overall_score(parameter_analysis)
+            risk_level = self._determine_risk_level(overall_score)
+        else:
+            overall_score = previous_result['overall_score']
+            risk_level = previous_result['risk_level']
+        
+        return {
+            'parameter_analysis': parameter_analysis,
+            'overall_score': overall_score,
+            'risk_level': risk_level,
+            'analyzed_parameters': list(parameter_analysis.keys()),
+            'total_parameters': len(parameter_analysis)
+        }
+    
+    def analyze_batch(self, values, parameters: List[str] = None, gender=None, age=None,
+                      weight=None, height=None) -> Dict[str, Any]:
+        """Analyze many records at once with array operations.
+        
+        ``values`` is an N x P array with one column per name in ``parameters``, or a
+        pandas DataFrame whose columns are the parameters (``gender``, ``age``,
+        ``weight`` and ``height`` columns are then taken as the user columns). NaN
+        marks a parameter that is missing from a record. ``weight`` and ``height``
+        are the user's own entries, used to calculate a BMI of 0 as in
+        ``analyze_parameters``.
+        
+        Returns columnar results: per parameter arrays of ``value``, ``status``
+        ('' where missing), ``deviation``, ``ideal_min`` and ``ideal_max`` (NaN
+        where the single-record result has none), plus ``overall_score`` and
+        ``risk_level`` arrays. Every entry equals what ``analyze_parameters``
+        returns for the same record.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch analysis")
+        
+        if hasattr(values, 'columns'):
+            # pandas DataFrame: split the user columns from the parameter columns
+            frame = values
+            user_columns = {'gender': gender, 'age': age, 'weight': weight, 'height': height}
+            for column in user_columns:
+                if column in frame.columns and user_columns[column] is None:
+                    user_columns[column] = frame[column].to_numpy()
+            gender, age, weight, height = (user_columns[c] for c in ('gender', 'age', 'weight', 'height'))
+            parameters = [column for column in frame.columns if column not in user_columns]
+            values = frame[parameters].to_numpy(dtype=float)
+        
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or parameters is None or values.shape[1] != len(parameters):
+            raise ValueError("values must be an N x P array with one name per column in parameters")
+        rows = values.shape[0]
+        
+        # Resolve gender and age band per row the way RangeTable.resolve does
+        genders = self.range_table.GENDERS
+        if gender is None:
+            gender = np.full(rows, self.range_table.DEFAULT_GENDER)
+        else:
+            gender = np.char.lower(np.asarray(gender, dtype=str))
+            gender = np.where(np.isin(gender, genders), gender, self.range_table.DEFAULT_GENDER)
+        if age is None or self.range_table.band_count == 1:
+            age_band = np.zeros(rows, dtype=int)
+        else:
+            age_band = np.array([self.range_table.age_band(value) for value in age], dtype=int)
+        user_weight = np.zeros(rows) if weight is None else np.nan_to_num(np.asarray(weight, dtype=float))
+        user_height = np.zeros(rows) if height is None else np.nan_to_num(np.asarray(height, dtype=float))
+        
+        results = {}
+        for column, parameter in enumerate(parameters):
+            results[parameter] = self._analyze_parameter_column(
+                parameter, values[:, column], gender, age_band, user_weight, user_height
+            )
+        
+        overall_score = self._calculate_overall_score_batch(results, rows)
+        return {
+            'parameters': results,
+            'overall_score': overall_score,
+            'risk_level': self._determine_risk_level_batch(overall_score),
+            'total_parameters': (~np.isnan(values)).sum(axis=1),
+            'gender': gender,
+            'age': None if age is None else np.asarray(age)
+        }
+    
+    def _analyze_parameter_column(self, parameter: str, values, gender, age_band, user_weight,
+                                  user_height) -> Dict[str, Any]:
+        """Vectorized ``_analyze_single_parameter`` for one parameter column"""
+        rows = len(values)
+        present = ~np.isnan(values)
+        values = values.copy()
+        status = np.full(rows, '', dtype='<U14')
+        nan = np.full(rows, np.nan)
+        
+        if parameter not in self.range_table.parameters:
+            status[present] = 'unknown'
+            return {'value': values, 'status': status, 'deviation': nan,
+                    'ideal_min': nan, 'ideal_max': nan.copy()}
+        
+        ideal_min = np.empty(rows)
+        ideal_max = np.empty(rows)
+        for gender_key in self.range_table.GENDERS:
+            for band in range(self.range_table.band_count):
+                entry = self.range_table.get(parameter, gender_key, band)
+                mask = (gender == gender_key) & (age_band == band)
+                ideal_min[mask] = entry.min_value
+                ideal_max[mask] = entry.max_value
+        
+        # Rows that have no ideal range comparison in the single-record result
+        unranged = ~present
+        if parameter in self.REQUIRED_LAB_PARAMETERS:
+            not_provided = present & (values == 0)
+            status[not_provided] = 'not_provided'
+            unranged |= not_provided
+        if parameter == 'bmi':
+            zero = present & (values == 0)
+            can_calculate = zero & (user_weight != 0) & (user_height != 0)
+            height_m = user_height[can_calculate] / 100
+            values[can_calculate] = user_weight[can_calculate] / (height_m ** 2)
+            not_calculated = zero & ~can_calculate
+            status[not_calculated] = 'not_calculated'
+            unranged |= not_calculated
+        
+        ranged = ~unranged
+        low = values < ideal_min
+        high = values > ideal_max
+        status[ranged] = np.where(low, 'low', np.where(high, 'high', 'optimal'))[ranged]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            deviation = np.where(low, (ideal_min - values) / ideal_min * 100,
+                                 np.where(high, (values - ideal_max) / ideal_max * 100, 0.0))
+        deviation[unranged] = np.nan
+        ideal_min[unranged] = np.nan
+        ideal_max[unranged] = np.nan
+        return {'value': values, 'status': status, 'deviation': deviation,
+                'ideal_min': ideal_min, 'ideal_max': ideal_max}
+    
+    def _calculate_overall_score_batch(self, results: Dict[str, Any], rows: int):
+        """Vectorized ``_calculate_overall_score``, summing components in the same order"""
+        base_score = self.score_table.base_score_batch(results, rows)
+        balance_bonus = self._calculate_body_type_bonus_batch(results, rows)
+        return np.minimum(100, np.maximum(0, base_score + balance_bonus))
+    
+    def _calculate_body_type_bonus_batch(self, results: Dict[str, Any], rows: int):
+        """Vectorized ``_calculate_body_type_bonus``"""
+        if not all(key in results for key in ('weight', 'skeletal_muscle_mass', 'body_fat_mass')):
+            return np.zeros(rows)
+        
+        muscle_data = results['skeletal_muscle_mass']
+        fat_data = results['body_fat_mass']
+        present = ((results['weight']['status'] != '') & (muscle_data['status'] != '')
+                   & (fat_data['status'] != ''))
+        
+        muscle_max = np.where(np.isnan(muscle_data['ideal_max']), 100.0, muscle_data['ideal_max'])
+        fat_max = np.where(np.isnan(fat_data['ideal_max']), 100.0, fat_data['ideal_max'])
+        muscle_pct = muscle_data['value'] / muscle_max * 100
+        fat_pct = fat_data['value'] / fat_max * 100
+        
+        bonus = np.select(
+            [(muscle_pct >= 100) & (fat_pct <= 100),
+             (90 <= muscle_pct) & (muscle_pct <= 110) & (90 <= fat_pct) & (fat_pct <= 110)],
+            [5.0, 2.0],
+            0.0
+        )
+        return np.where(present, bonus, 0.0)
+    
+    def _determine_risk_level_batch(self, scores):
+        """Vectorized ``_determine_risk_level``"""
+        return np.select(
+            [scores >= 90, scores >= 80, scores >= 70, scores >= 60, scores >= 50],
+            ['Excellent (D-Shape)', 'Very Good (I-Shape)', 'Good Composition',
+             'Fair Composition', 'Needs Improvement'],
+            'Poor (C-Shape)'
+        )
+    
     def _analyze_single_parameter(self, parameter: str, value: float, user_info: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze a single health parameter"""
-        if parameter not in self.ideal_ranges:
-            return {
-                'value': value,
-                'status': 'unknown', 
-                'message': 'Parameter not in database',
-                'ideal_range': 'N/A'
-            }
-        
-        ranges = self.ideal_ranges[parameter]
-        
-        # Handle gender-specific parameters
-        if parameter in ['body_fat_percentage', 'weight', 'muscle_mass', 'protein', 'total_body_water', 'basal_metabolic_rate', 'waist_hip_ratio']:
-            gender = user_info.get('gender', 'male').lower()
-            if isinstance(ranges, dict) and gender in ranges:
-                ranges = ranges[gender]
-            elif isinstance(ranges, dict) and 'male' in ranges:
-                ranges = ranges['male']  # Default to male if gender not found
+        gender, age_band = self.range_table.resolve(user_info)
+        return self._analyze_with_range(
+            parameter, value, user_info, self.range_table.get(parameter, gender, age_band)
+        )
+    
+    def _analyze_with_range(self, parameter: str, value: float, user_info: Dict[str, Any],
+                            entry: Optional[RangeEntry]) -> ParameterResult:
+        """Analyze a single health parameter against its range table entry"""
+        if entry is None:
+            return ParameterResult(parameter, value, 'unknown', self.messages)
         
         # Handle special cases for zero values
         if value == 0:
-            if parameter in ['glucose', 'cholesterol_total', 'cholesterol_hdl', 'cholesterol_ldl', 
-                           'blood_pressure_systolic', 'blood_pressure_diastolic']:
-                return {
-                    'value': value,
-                    'status': 'not_provided',
-                    'message': 'Value not provided - please enter for analysis',
-                    'ideal_range': f"{ranges['min']}-{ranges['max']} {ranges['unit']}"
-                }
-        
-        # Calculate BMI if not provided but weight and height are available
-        if parameter == 'bmi' and value == 0:
-            weight = user_info.get('weight', 0)
-            height = user_info.get('height', 0)
-            if weight and height:
-                height_m = height / 100  # Convert cm to meters
-                value = weight / (height_m ** 2)
-            else:
-                return {
-                    'value': 0,
-                    'status': 'not_calculated',
-                    'message': 'Cannot calculate BMI - missing weight or height',
-                    'ideal_range': f"{ranges['min']}-{ranges['max']} {ranges['unit']}"
-                }
+            if parameter in self.REQUIRED_LAB_PARAMETERS:
+                return ParameterResult(parameter, value, 'not_provided', self.messages, entry)
         
-        # Determine status
-        status = self._get_parameter_status(value, ranges)
-        message = self._get_parameter_message(parameter, value, ranges, status)
+            # Calculate BMI if not provided but weight and height are available
+            if parameter == 'bmi':
+                weight = user_info.get('weight', 0)
+                height = user_info.get('height', 0)
+                if weight and height:
+                    height_m = height / 100  # Convert cm to meters
+                    value = weight / (height_m ** 2)
+                else:
+                    return ParameterResult(parameter, 0, 'not_calculated', self.messages, entry)
         
-        return {
-            'value': value,
-            'ideal_min': ranges['min'],
-            'ideal_max': ranges['max'],
-            'unit': ranges['unit'],
-            'status': status,
-            'message': message,
-            'deviation': self._calculate_deviation(value, ranges),
-            'ideal_range': f"{ranges['min']}-{ranges['max']} {ranges['unit']}"
-        }
+        # Determine status; the message and range strings are looked up on access
+        status = self._get_parameter_status(value, entry)
+        
+        population = None
+        if self.population_stats is not None:
+            population = self.population_stats.percentile(
+                parameter, value, user_info.get('gender'), user_info.get('age')
+            )
+        
+        return ParameterResult(parameter, value, status, self.messages, entry,
+                               self._calculate_deviation(value, entry), population)
     
-    def _get_parameter_status(self, value: float, ranges: Dict[str, float]) -> str:
+    def _get_parameter_status(self, value: float, entry: RangeEntry) -> str:
         """Determine if parameter is within ideal range"""
-        if ranges['min'] <= value <= ranges['max']:
+        if entry.min_value <= value <= entry.max_value:
             return 'optimal'
-        elif value < ranges['min']:
+        elif value < entry.min_value:
             return 'low'
         else:
             return 'high'
     
-    def _get_parameter_message(self, parameter: str, value: float, ranges: Dict[str, float], status: str) -> str:
-        """Generate descriptive message for parameter"""
-        messages = {
-            'glucose': {
-                'optimal': 'Blood glucose levels are within the normal range.',
-                'low': 'Blood glucose is below normal. Consider consulting a healthcare provider.',
-                'high': 'Blood glucose is elevated. Monitor diet and consider medical consultation.'
-            },
-            'cholesterol_total': {
-                'optimal': 'Total cholesterol is at a healthy level.',
-                'high': 'Total cholesterol is elevated. Diet and exercise modifications recommended.'
-            },
-            'cholesterol_hdl': {
-                'optimal': 'HDL (good) cholesterol is at a healthy level.',
-                'low': 'HDL cholesterol is low. Increase physical activity and healthy fats intake.'
-            },
-            'cholesterol_ldl': {
-                'optimal': 'LDL (bad) cholesterol is at a healthy level.',
-                'high': 'LDL cholesterol is elevated. Reduce saturated fats and increase fiber intake.'
-            },
-            'blood_pressure_systolic': {
-                'optimal': 'Systolic blood pressure is normal.',
-                'low': 'Systolic blood pressure is low. Monitor for symptoms.',
-                'high': 'Systolic blood pressure is elevated. Lifestyle changes recommended.'
-            },
-            'blood_pressure_diastolic': {
-                'optimal': 'Diastolic blood pressure is normal.',
-                'low': 'Diastolic blood pressure is low. Monitor for symptoms.',
-                'high': 'Diastolic blood pressure is elevated. Reduce sodium intake and increase exercise.'
-            },
-            'bmi': {
-                'optimal': 'BMI is within the healthy range.',
-                'low': 'BMI indicates underweight. Consider increasing caloric intake with nutritious foods.',
-                'high': 'BMI indicates overweight/obesity. Weight management recommended.'
-            },
-            'body_fat_percentage': {
-                'optimal': 'Body fat percentage is within the healthy range.',
-                'low': 'Body fat percentage is low. Ensure adequate nutrition.',
-                'high': 'Body fat percentage is elevated. Increase cardio and strength training.'
-            },
-            'weight': {
-                'optimal': 'Body weight is within the healthy range.',
-                'low': 'Body weight is below normal. Consider increasing caloric intake with nutritious foods.',
-                'high': 'Body weight is above normal. Consider a balanced diet and regular exercise.'
-            },
-            'muscle_mass': {
-                'optimal': 'Muscle mass is at a healthy level.',
-                'low': 'Muscle mass is below optimal. Focus on strength training and protein intake.',
-                'high': 'Excellent muscle mass. Continue strength training for maintenance.'
-            },
-            'protein': {
-                'optimal': 'Protein levels are adequate.',
-                'low': 'Protein levels are low. Increase protein-rich foods in your diet.',
-                'high': 'Protein levels are above normal range.'
-            },
-            'minerals': {
-                'optimal': 'Mineral levels are within normal range.',
-                'low': 'Mineral levels are low. Consider mineral-rich foods or supplements.',
-                'high': 'Mineral levels are elevated.'
-            },
-            'total_body_water': {
-                'optimal': 'Body water percentage is normal.',
-                'low': 'Body water is low. Increase fluid intake and monitor hydration.',
-                'high': 'Body water levels are elevated. Monitor for fluid retention.'
-            },
-            'visceral_fat_level': {
-                'optimal': 'Visceral fat level is healthy.',
-                'low': 'Visceral fat level is very low.',
-                'high': 'Visceral fat level is elevated. Focus on cardio exercise and diet.'
-            },
-            'basal_metabolic_rate': {
-                'optimal': 'Metabolic rate is within normal range.',
-                'low': 'Metabolic rate is low. Consider strength training to build muscle.',
-                'high': 'Metabolic rate is high, which can be beneficial for weight management.'
-            },
-            'waist_hip_ratio': {
-                'optimal': 'Waist-hip ratio is within healthy range.',
-                'low': 'Waist-hip ratio is low.',
-                'high': 'Waist-hip ratio is elevated. Focus on reducing waist circumference.'
-            },
-            'inbody_score': {
-                'optimal': 'InBody score indicates good overall body composition.',
-                'low': 'InBody score suggests room for improvement in body composition.',
-                'high': 'Excellent InBody score indicating optimal body composition.'
-            }
-        }
-        
-        return messages.get(parameter, {}).get(status, 'Status determined.')
-    
-    def _calculate_deviation(self, value: float, ranges: Dict[str, float]) -> float:
+    def _calculate_deviation(self, value: float, entry: RangeEntry) -> float:
         """Calculate how far the value deviates from ideal range"""
-        if ranges['min'] <= value <= ranges['max']:
+        if entry.min_value <= value <= entry.max_value:
             return 0.0
-        elif value < ranges['min']:
-            return (ranges['min'] - value) / ranges['min'] * 100
+        elif value < entry.min_value:
+            return (entry.min_value - value) / entry.min_value * 100
         else:
-            return (value - ranges['max']) / ranges['max'] * 100
+            return (value - entry.max_value) / entry.max_value * 100
     
     def _calculate_overall_score(self, analysis: Dict[str, Any]) -> float:
         """Calculate InBody Score based on official InBody methodology and body composition analysis"""
         
-        # InBody Score Components with Official Weights
-        inbody_components = {
-            # Primary Body Composition (60% total weight)
-            'skeletal_muscle_mass': 0.25,      # 25% - Most important for strength and metabolism
-            'body_fat_percentage': 0.20,       # 20% - Key obesity indicator
-            'visceral_fat': 0.15,              # 15% - Health risk indicator
-            
-            # Body Water Analysis (20% total weight)
-            'total_body_water': 0.10,          # 10% - Hydration status
-            'ecw_tbw_ratio': 0.10,             # 10% - Inflammation/swelling indicator
-            
-            # Supporting Metrics (20% total weight)
-            'bmi': 0.08,                       # 8% - Basic weight assessment
-            'lean_body_mass': 0.07,            # 7% - Non-fat body mass
-            'basal_metabolic_rate': 0.05       # 5% - Metabolic efficiency
-        }
-        
-        component_scores = []
-        total_weight_used = 0
-        
-        for component, weight in inbody_components.items():
-            if component in analysis and isinstance(analysis[component], dict):
-                data = analysis[component]
-                
-                # Calculate component score based on InBody standards
-                if component == 'body_fat_percentage':
-                    score = self._calculate_body_fat_score(data)
-                elif component == 'skeletal_muscle_mass':
-                    score = self._calculate_muscle_score(data)
-                elif component == 'visceral_fat':
-                    score = self._calculate_visceral_fat_score(data)
-                elif component == 'ecw_tbw_ratio':
-                    score = self._calculate_ecw_ratio_score(data)
-                else:
-                    # Standard scoring for other components
-                    score = self._calculate_standard_score(data)
-                
-                component_scores.append(score * weight)
-                total_weight_used += weight
-        
-        # Calculate base InBody score
-        if total_weight_used > 0:
-            base_score = sum(component_scores) / total_weight_used
-        else:
-            base_score = 50.0
+        # Weighted component scores from the InBody scoring table
+        base_score = self.score_table.base_score(analysis)
         
         # Apply InBody scoring adjustments
         # Bonus for optimal muscle-fat balance (C-shape, I-shape, D-shape analysis)
@@ -312,91 +386,6 @@ class HealthAnalyzer:
         
         return final_score
     
-    def _calculate_body_fat_score(self, data: Dict[str, Any]) -> float:
-        """Calculate score based on InBody body fat percentage standards"""
-        value = data.get('value', 0)
-        status = data.get('status', 'unknown')
-        
-        if status == 'optimal':
-            return 100
-        elif status == 'normal':
-            return 85
-        elif status in ['low', 'high']:
-            deviation = data.get('deviation', 0)
-            if deviation <= 15:
-                return 70
-            elif deviation <= 30:
-                return 50
-            else:
-                return 30
-        return 40
-    
-    def _calculate_muscle_score(self, data: Dict[str, Any]) -> float:
-        """Calculate score based on skeletal muscle mass development"""
-        value = data.get('value', 0)
-        status = data.get('status', 'unknown')
-        
-        if status == 'optimal':
-            return 100
-        elif status == 'normal':
-            return 85
-        elif status == 'low':
-            deviation = data.get('deviation', 0)
-            if deviation <= 10:
-                return 65
-            elif deviation <= 25:
-                return 40
-            else:
-                return 20
-        elif status == 'high':
-            return 95  # High muscle mass is generally positive
-        return 50
-    
-    def _calculate_visceral_fat_score(self, data: Dict[str, Any]) -> float:
-        """Calculate score based on visceral fat area (optimal < 100 cm²)"""
-        value = data.get('value', 0)
-        status = data.get('status', 'unknown')
-        
-        if status == 'optimal':
-            return 100
-        elif status == 'normal':
-            return 80
-        elif status == 'high':
-            deviation = data.get('deviation', 0)
-            if deviation <= 20:
-                return 60
-            elif deviation <= 50:
-                return 30
-            else:
-                return 10
-        return 50
-    
-    def _calculate_ecw_ratio_score(self, data: Dict[str, Any]) -> float:
-        """Calculate score based on ECW/TBW ratio (optimal: 0.360-0.390)"""
-        value = data.get('value', 0.38)
-        
-        if 0.360 <= value <= 0.390:
-            return 100
-        elif 0.350 <= value <= 0.400:
-            return 80
-        elif 0.340 <= value <= 0.410:
-            return 60
-        else:
-            return 30
-    
-    def _calculate_standard_score(self, data: Dict[str, Any]) -> float:
-        """Standard scoring for other parameters"""
-        status = data.get('status', 'unknown')
-        
-        if status == 'optimal':
-            return 100
-        elif status == 'normal':
-            return 85
-        elif status in ['low', 'high']:
-            deviation = data.get('deviation', 0)
-            return max(20, 100 - deviation * 2)
-        return 50
-    
     def _calculate_body_type_bonus(self, analysis: Dict[str, Any]) -> float:
         """Calculate bonus based on InBody body type classification (C, I, D shape)"""
         # This is a simplified implementation of the C-I-D shape analysis
@@ -445,8 +434,13 @@ class HealthAnalyzer:
         priority = []
         
         for param, data in analysis.items():
-            if isinstance(data, dict) and 'deviation' in data:
+            if isinstance(data, Mapping) and 'deviation' in data:
                 if data['deviation'] > 25:  # More than 25% deviation
                     priority.append(param)
         
         return sorted(priority, key=lambda x: analysis[x]['deviation'], reverse=True)
+
+
+# Flat (parameter, gender, age band) lookup table, compiled once per process
+RANGE_TABLE = RangeTable(IDEAL_RANGES, HealthAnalyzer.GENDER_SPECIFIC_PARAMETERS,
+                         AGE_BANDS, AGE_ADJUSTED_RANGES)
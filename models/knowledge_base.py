@@ -0,0 +1,43 @@
+import json
+import os
+from typing import Any, Dict
+
+
+KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'knowledge_base.json')
+
+
+class FrozenDict(dict):
+    """Read-only dict; still encodes with ``json`` and renders in templates like a dict"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # Rebuild through dict.__init__; the default protocol would call __setitem__
+        return (type(self), (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into FrozenDicts and lists into tuples"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def load_knowledge_base(path: str = KNOWLEDGE_BASE_PATH) -> FrozenDict:
+    """Read the recommendation knowledge base and freeze it"""
+    with open(path, encoding='utf-8') as data_file:
+        return freeze(json.load(data_file))
+
+
+# Loaded once per process at import; a pre-fork master shares it with its workers.
+# Sections: diet, workout, weekly_schedules, cardio_plans, strength_plans,
+# each keyed by strategy with an 'optimal' fallback entry.
+KNOWLEDGE_BASE: Dict[str, Any] = load_knowledge_base()
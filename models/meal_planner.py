@@ -0,0 +1,287 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from models.knowledge_base import FrozenDict
+
+
+NUTRIENT_DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'nutrients.json')
+
+# Macronutrients a plan is solved for, in the order of the target tuples
+MACROS = ('protein', 'carbs', 'fat')
+
+# Servings are rounded to this step before the final local search
+SERVING_STEP = 0.25
+
+
+class Food:
+    """One food of the nutrient database, with its nutrients per serving"""
+
+    __slots__ = ('name', 'category', 'grams', 'protein', 'carbs', 'fat', 'meals', 'exclude',
+                 'min_servings', 'max_servings')
+
+    def __init__(self, name: str, category: str, grams: float, protein: float, carbs: float, fat: float,
+                 meals: Sequence[str], exclude: Sequence[str], servings: Sequence[float]):
+        self.name = name
+        self.category = category
+        self.grams = grams
+        self.protein = protein
+        self.carbs = carbs
+        self.fat = fat
+        self.meals = frozenset(meals)
+        self.exclude = frozenset(exclude)
+        self.min_servings, self.max_servings = servings
+
+    def __repr__(self) -> str:
+        return f"Food({self.name!r})"
+
+
+class NutrientDatabase:
+    """Foods and meal templates loaded from the local nutrient file.
+
+    ``meals`` maps every meal to the food categories it is built from;
+    ``foods_for`` picks, in file order, the first food of each category that
+    fits the meal, is not excluded for the strategy and is not already used
+    that day.
+    """
+
+    def __init__(self, path: str = NUTRIENT_DB_PATH):
+        with open(path, encoding='utf-8') as data_file:
+            data = json.load(data_file)
+        self.meals: Dict[str, Tuple[str, ...]] = {meal: tuple(categories) for meal, categories in data['meals'].items()}
+        self.foods = tuple(
+            Food(food['name'], food['category'], food['grams'], food['protein'], food['carbs'], food['fat'],
+                 food['meals'], food['exclude'], data['servings'][food['category']])
+            for food in data['foods']
+        )
+        self._selections: Dict[str, Tuple[Tuple[str, Food], ...]] = {}
+
+    def foods_for(self, strategy: str) -> Tuple[Tuple[str, Food], ...]:
+        """(meal, food) pairs of a strategy's daily plan"""
+        selection = self._selections.get(strategy)
+        if selection is None:
+            used = set()
+            chosen = []
+            for meal, categories in self.meals.items():
+                for category in categories:
+                    for food in self.foods:
+                        if (food.category == category and meal in food.meals
+                                and strategy not in food.exclude and food.name not in used):
+                            used.add(food.name)
+                            chosen.append((meal, food))
+                            break
+            selection = self._selections[strategy] = tuple(chosen)
+        return selection
+
+
+class MealPlan:
+    """A solved daily meal plan; ``meals`` renders like the fixed sample plans"""
+
+    __slots__ = ('strategy', 'target', 'meals', 'totals', 'within_tolerance')
+
+    def __init__(self, strategy: str, target: Tuple[float, float, float], meals: FrozenDict, totals: FrozenDict,
+                 within_tolerance: bool):
+        self.strategy = strategy
+        self.target = target
+        self.meals = meals
+        self.totals = totals
+        self.within_tolerance = within_tolerance
+
+    def __repr__(self) -> str:
+        return f"MealPlan({self.strategy!r}, target={self.target!r})"
+
+
+def _objective(residuals: Sequence[float], weights: Sequence[float]) -> float:
+    return sum(weight * residual * residual for weight, residual in zip(weights, residuals))
+
+
+def _solve3(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Solve a 3 x 3 linear system by Cramer's rule"""
+    (a, b, c), (d, e, f), (g, h, i) = matrix
+    cofactors = (e * i - f * h, f * g - d * i, d * h - e * g)
+    determinant = a * cofactors[0] + b * cofactors[1] + c * cofactors[2]
+    x, y, z = vector
+    return [
+        (x * cofactors[0] + b * (f * z - y * i) + c * (y * h - e * z)) / determinant,
+        (a * (y * i - f * z) + x * cofactors[1] + c * (d * z - y * g)) / determinant,
+        (a * (e * z - y * h) + b * (y * g - d * z) + x * cofactors[2]) / determinant,
+    ]
+
+
+def solve_servings(foods: Sequence[Food], target: Sequence[float], regularization: float = 1e-4) -> List[float]:
+    """Servings of every food whose macros come closest to the target.
+
+    Minimizes the squared relative error of protein, carbs and fat plus a
+    small pull towards one serving, which makes the solution unique and
+    keeps portions ordinary. With three macros the unconstrained optimum
+    needs only a 3 x 3 solve; an active set pins foods at their serving
+    bounds until the solution is feasible. The servings are then rounded to
+    ``SERVING_STEP`` and a local search moves single foods up or down a step
+    while that lowers the error.
+    """
+    count = len(foods)
+    columns = [(food.protein, food.carbs, food.fat) for food in foods]
+    macro_count = len(MACROS)
+    weights = [1.0 / max(value, 1.0) ** 2 for value in target]
+    servings = [1.0] * count
+    pinned: Dict[int, float] = {}
+
+    for _ in range(2 * count + 1):
+        free = [index for index in range(count) if index not in pinned]
+        for index, amount in pinned.items():
+            servings[index] = amount
+        # Remaining target once pinned foods and one serving of each free food are counted
+        remaining = [target[m] - sum(columns[index][m] * servings[index] for index in pinned)
+                     - sum(columns[index][m] for index in free) for m in range(macro_count)]
+        system = [[sum(columns[index][row] * columns[index][col] for index in free)
+                   + (regularization / weights[row] if row == col else 0.0)
+                   for col in range(macro_count)] for row in range(macro_count)]
+        dual = _solve3(system, remaining)
+        for index in free:
+            servings[index] = 1.0 + sum(columns[index][m] * dual[m] for m in range(macro_count))
+
+        changed = False
+        for index in free:
+            food = foods[index]
+            if servings[index] < food.min_servings:
+                pinned[index] = food.min_servings
+                changed = True
+            elif servings[index] > food.max_servings:
+                pinned[index] = food.max_servings
+                changed = True
+        if not changed:
+            # Release pinned foods whose gradient points back inside their bounds
+            residuals = [sum(columns[index][m] * servings[index] for index in range(count)) - target[m]
+                         for m in range(macro_count)]
+            for index, amount in list(pinned.items()):
+                gradient = (sum(weights[m] * columns[index][m] * residuals[m] for m in range(macro_count))
+                            + regularization * (amount - 1.0))
+                if (amount == foods[index].min_servings and gradient < 0) or \
+                        (amount == foods[index].max_servings and gradient > 0):
+                    del pinned[index]
+                    changed = True
+            if not changed:
+                break
+
+    # Round to whole steps inside the bounds, then improve one step at a time
+    for index, food in enumerate(foods):
+        amount = round(servings[index] / SERVING_STEP) * SERVING_STEP
+        servings[index] = min(max(amount, food.min_servings), food.max_servings)
+    residuals = [sum(columns[index][m] * servings[index] for index in range(count)) - target[m]
+                 for m in range(macro_count)]
+    error = _objective(residuals, weights)
+    while True:
+        best = None
+        for index, (food, column) in enumerate(zip(foods, columns)):
+            for step in (SERVING_STEP, -SERVING_STEP):
+                amount = servings[index] + step
+                if amount < food.min_servings or amount > food.max_servings:
+                    continue
+                candidate = _objective([residuals[m] + column[m] * step for m in range(macro_count)], weights)
+                if candidate < error - 1e-12 and (best is None or candidate < best[0]):
+                    best = (candidate, index, step)
+        if best is None:
+            return servings
+        error, index, step = best
+        servings[index] += step
+        for m in range(macro_count):
+            residuals[m] += columns[index][m] * step
+
+
+class MealPlanner:
+    """Builds daily meal plans that hit macronutrient targets.
+
+    Plans are solved for the centre of a (strategy, macro bucket) key, where
+    every macro target is rounded to ``macro_bucket`` grams, and kept in an
+    LRU cache, so members with similar targets share one solve. A plan is
+    within tolerance when every macro total is within ``tolerance`` (a
+    fraction) of the bucket's target.
+    """
+
+    def __init__(self, database: Optional[NutrientDatabase] = None, max_entries: int = 1024,
+                 macro_bucket: int = 10, tolerance: float = 0.1):
+        self.database = database or NUTRIENT_DB
+        self.max_entries = max_entries
+        self.macro_bucket = macro_bucket
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self._plans: 'OrderedDict[Tuple[str, int, int, int], MealPlan]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bucket(self, macronutrients: Dict[str, Any]) -> Tuple[int, int, int]:
+        """Macro bucket of protein, carb and fat grams"""
+        size = self.macro_bucket
+        return (round(macronutrients['protein_grams'] / size), round(macronutrients['carb_grams'] / size),
+                round(macronutrients['fat_grams'] / size))
+
+    def plan(self, strategy: str, macronutrients: Dict[str, Any]) -> MealPlan:
+        """Return the meal plan of a strategy and macro targets, solving it on a cache miss"""
+        key = (strategy,) + self.bucket(macronutrients)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = self.solve(strategy, tuple(bucket * self.macro_bucket for bucket in key[1:]))
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def solve(self, strategy: str, target: Tuple[float, float, float]) -> MealPlan:
+        """Solve a plan for protein, carb and fat grams without the cache"""
+        selection = self.database.foods_for(strategy)
+        servings = solve_servings([food for _, food in selection], target)
+
+        meals: Dict[str, List[str]] = {meal: [] for meal in self.database.meals}
+        totals = dict.fromkeys(MACROS, 0.0)
+        for (meal, food), amount in zip(selection, servings):
+            if not amount:
+                continue
+            meals[meal].append(f"{food.name} ({round(food.grams * amount)} g)")
+            for macro in MACROS:
+                totals[macro] += getattr(food, macro) * amount
+
+        protein, carbs, fat = (round(totals[macro]) for macro in MACROS)
+        within_tolerance = all(abs(totals[macro] - goal) <= self.tolerance * goal
+                               for macro, goal in zip(MACROS, target))
+        return MealPlan(strategy, target,
+                        FrozenDict((meal, tuple(items)) for meal, items in meals.items()),
+                        FrozenDict(protein_grams=protein, carb_grams=carbs, fat_grams=fat,
+                                   calories=protein * 4 + carbs * 4 + fat * 9,
+                                   within_tolerance=within_tolerance),
+                        within_tolerance)
+
+    def clear(self) -> None:
+        """Drop every cached plan and reset the counters"""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached plans"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._plans),
+                'max_entries': self.max_entries
+            }
+
+
+# Loaded once per process, like the recommendation knowledge base
+NUTRIENT_DB = NutrientDatabase()
+
+# Shared by engines that are not given a planner
+MEAL_PLANNER = MealPlanner()
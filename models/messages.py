@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+# Directory with one JSON bundle per non-English locale (e.g. locales/es.json)
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+
+DEFAULT_LOCALE = 'en'
+
+# Messages for each parameter status (English)
+PARAMETER_MESSAGES = {
+    'glucose': {
+        'optimal': 'Blood glucose levels are within the normal range.',
+        'low': 'Blood glucose is below normal. Consider consulting a healthcare provider.',
+        'high': 'Blood glucose is elevated. Monitor diet and consider medical consultation.'
+    },
+    'cholesterol_total': {
+        'optimal': 'Total cholesterol is at a healthy level.',
+        'high': 'Total cholesterol is elevated. Diet and exercise modifications recommended.'
+    },
+    'cholesterol_hdl': {
+        'optimal': 'HDL (good) cholesterol is at a healthy level.',
+        'low': 'HDL cholesterol is low. Increase physical activity and healthy fats intake.'
+    },
+    'cholesterol_ldl': {
+        'optimal': 'LDL (bad) cholesterol is at a healthy level.',
+        'high': 'LDL cholesterol is elevated. Reduce saturated fats and increase fiber intake.'
+    },
+    'blood_pressure_systolic': {
+        'optimal': 'Systolic blood pressure is normal.',
+        'low': 'Systolic blood pressure is low. Monitor for symptoms.',
+        'high': 'Systolic blood pressure is elevated. Lifestyle changes recommended.'
+    },
+    'blood_pressure_diastolic': {
+        'optimal': 'Diastolic blood pressure is normal.',
+        'low': 'Diastolic blood pressure is low. Monitor for symptoms.',
+        'high': 'Diastolic blood pressure is elevated. Reduce sodium intake and increase exercise.'
+    },
+    'bmi': {
+        'optimal': 'BMI is within the healthy range.',
+        'low': 'BMI indicates underweight. Consider increasing caloric intake with nutritious foods.',
+        'high': 'BMI indicates overweight/obesity. Weight management recommended.'
+    },
+    'body_fat_percentage': {
+        'optimal': 'Body fat percentage is within the healthy range.',
+        'low': 'Body fat percentage is low. Ensure adequate nutrition.',
+        'high': 'Body fat percentage is elevated. Increase cardio and strength training.'
+    },
+    'weight': {
+        'optimal': 'Body weight is within the healthy range.',
+        'low': 'Body weight is below normal. Consider increasing caloric intake with nutritious foods.',
+        'high': 'Body weight is above normal. Consider a balanced diet and regular exercise.'
+    },
+    'muscle_mass': {
+        'optimal': 'Muscle mass is at a healthy level.',
+        'low': 'Muscle mass is below optimal. Focus on strength training and protein intake.',
+        'high': 'Excellent muscle mass. Continue strength training for maintenance.'
+    },
+    'protein': {
+        'optimal': 'Protein levels are adequate.',
+        'low': 'Protein levels are low. Increase protein-rich foods in your diet.',
+        'high': 'Protein levels are above normal range.'
+    },
+    'minerals': {
+        'optimal': 'Mineral levels are within normal range.',
+        'low': 'Mineral levels are low. Consider mineral-rich foods or supplements.',
+        'high': 'Mineral levels are elevated.'
+    },
+    'total_body_water': {
+        'optimal': 'Body water percentage is normal.',
+        'low': 'Body water is low. Increase fluid intake and monitor hydration.',
+        'high': 'Body water levels are elevated. Monitor for fluid retention.'
+    },
+    'visceral_fat_level': {
+        'optimal': 'Visceral fat level is healthy.',
+        'low': 'Visceral fat level is very low.',
+        'high': 'Visceral fat level is elevated. Focus on cardio exercise and diet.'
+    },
+    'basal_metabolic_rate': {
+        'optimal': 'Metabolic rate is within normal range.',
+        'low': 'Metabolic rate is low. Consider strength training to build muscle.',
+        'high': 'Metabolic rate is high, which can be beneficial for weight management.'
+    },
+    'waist_hip_ratio': {
+        'optimal': 'Waist-hip ratio is within healthy range.',
+        'low': 'Waist-hip ratio is low.',
+        'high': 'Waist-hip ratio is elevated. Focus on reducing waist circumference.'
+    },
+    'inbody_score': {
+        'optimal': 'InBody score indicates good overall body composition.',
+        'low': 'InBody score suggests room for improvement in body composition.',
+        'high': 'Excellent InBody score indicating optimal body composition.'
+    }
+}
+
+# Messages that do not belong to a single parameter (English)
+GENERAL_MESSAGES = {
+    'unknown': 'Parameter not in database',
+    'not_provided': 'Value not provided - please enter for analysis',
+    'not_calculated': 'Cannot calculate BMI - missing weight or height',
+    'default': 'Status determined.'
+}
+
+
+class MessageBundle:
+    """Messages of one locale, flattened for single-lookup access"""
+    
+    __slots__ = ('locale', 'parameter_messages', 'general')
+    
+    def __init__(self, locale: str, parameter_messages: Dict[Tuple[str, str], str],
+                 general: Dict[str, str]):
+        self.locale = locale
+        self.parameter_messages = parameter_messages
+        self.general = general
+    
+    def parameter_message(self, parameter: str, status: str) -> str:
+        """Message for a parameter status, or the default message"""
+        return self.parameter_messages.get((parameter, status), self.general['default'])
+
+
+class MessageCatalog:
+    """Shared message catalog; non-English bundles are loaded on first use.
+    
+    A locale bundle is a JSON file with ``parameters`` (same layout as
+    ``PARAMETER_MESSAGES``) and ``general`` sections. Messages missing from a
+    bundle fall back to English, and unknown locales get the English bundle.
+    """
+    
+    def __init__(self, locales_dir: str = LOCALES_DIR):
+        self.locales_dir = locales_dir
+        self._bundles: Dict[str, MessageBundle] = {
+            DEFAULT_LOCALE: self._build(DEFAULT_LOCALE, PARAMETER_MESSAGES, GENERAL_MESSAGES)
+        }
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _build(locale: str, parameters: Dict[str, Dict[str, str]],
+               general: Dict[str, str]) -> MessageBundle:
+        """Flatten nested parameter messages into a bundle"""
+        flat = {(parameter, status): message
+                for parameter, statuses in parameters.items()
+                for status, message in statuses.items()}
+        return MessageBundle(locale, flat, dict(general))
+    
+    def available_locales(self) -> List[str]:
+        """Locales with a bundle on disk, plus English"""
+        locales = [DEFAULT_LOCALE]
+        if os.path.isdir(self.locales_dir):
+            locales += sorted(name[:-5] for name in os.listdir(self.locales_dir) if name.endswith('.json'))
+        return locales
+    
+    def _normalize(self, locale: Optional[str]) -> List[str]:
+        """Candidate bundle names for a locale, most specific first ('pt-BR' -> pt_br, pt)"""
+        if not locale:
+            return [DEFAULT_LOCALE]
+        name = locale.strip().lower().replace('-', '_')
+        language = name.split('_')[0]
+        return [name, language] if language != name else [name]
+    
+    def bundle(self, locale: Optional[str] = None) -> MessageBundle:
+        """Return the bundle for a locale, loading it the first time it is requested"""
+        bundle = self._bundles.get(locale or DEFAULT_LOCALE)
+        if bundle is not None:
+            return bundle
+        
+        with self._lock:
+            bundle = self._bundles[DEFAULT_LOCALE]
+            for name in self._normalize(locale):
+                if name in self._bundles:
+                    bundle = self._bundles[name]
+                    break
+                path = os.path.join(self.locales_dir, f"{name}.json")
+                if os.path.exists(path):
+                    bundle = self._load(name, path)
+                    self._bundles[name] = bundle
+                    break
+            # Remember regional aliases ('es-MX' -> es) so later requests are a single lookup;
+            # unknown locales are not cached so arbitrary names cannot grow the catalog
+            if bundle.locale != DEFAULT_LOCALE:
+                self._bundles[locale] = bundle
+        return bundle
+    
+    def _load(self, locale: str, path: str) -> MessageBundle:
+        """Read a locale bundle and fill its gaps from English"""
+        with open(path, encoding='utf-8') as bundle_file:
+            data = json.load(bundle_file)
+        
+        english = self._bundles[DEFAULT_LOCALE]
+        translated = self._build(locale, data.get('parameters', {}), data.get('general', {}))
+        parameter_messages = dict(english.parameter_messages)
+        parameter_messages.update(translated.parameter_messages)
+        general = dict(english.general)
+        general.update(translated.general)
+        return MessageBundle(locale, parameter_messages, general)
+
+
+# Process-wide catalog shared by every HealthAnalyzer
+MESSAGE_CATALOG = MessageCatalog()
@@ -0,0 +1,127 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from models.messages import MESSAGE_CATALOG, MessageBundle
+from models.range_table import RangeEntry
+
+
+# Keys of a result compared against an ideal range, and of one without a
+# comparison (unknown parameter, value not provided, BMI not calculated)
+RANGED_KEYS = ('value', 'ideal_min', 'ideal_max', 'unit', 'status', 'message', 'deviation', 'ideal_range')
+UNRANGED_KEYS = ('value', 'status', 'message', 'ideal_range')
+RESULT_KEYS = frozenset(RANGED_KEYS + ('population',))
+
+
+def _restore(parameter: str, value: float, status: str, locale: str, entry: Optional[RangeEntry],
+             deviation: Optional[float], population: Optional[Dict[str, Any]]) -> 'ParameterResult':
+    """Unpickle a result against this process's message bundle"""
+    return ParameterResult(parameter, value, status, MESSAGE_CATALOG.bundle(locale),
+                           entry, deviation, population)
+
+
+class ParameterResult(Mapping):
+    """Analysis of one parameter, read-only and dict-compatible.
+
+    Holds the raw outcome (value, status, deviation and the shared range
+    entry); the message and range strings are looked up only when accessed.
+    Item and attribute access expose the same keys the analysis dict used to
+    have (keys a result does not have are left unset), so templates and
+    ``.get()`` callers keep working; ``to_dict()`` returns that dict for
+    serialization.
+    """
+
+    __slots__ = ('parameter', 'value', 'status', 'deviation', 'ideal_min', 'ideal_max', 'unit',
+                 'population', '_entry', '_messages')
+
+    def __init__(self, parameter: str, value: float, status: str, messages: MessageBundle,
+                 entry: Optional[RangeEntry] = None, deviation: Optional[float] = None,
+                 population: Optional[Dict[str, Any]] = None):
+        self.parameter = parameter
+        self.value = value
+        self.status = status
+        self._entry = entry
+        self._messages = messages
+        # Only results compared against the range carry a deviation and the range bounds
+        if deviation is not None:
+            self.deviation = deviation
+            self.ideal_min = entry.min_value
+            self.ideal_max = entry.max_value
+            self.unit = entry.unit
+            if population is not None:
+                self.population = population
+
+    @property
+    def ranged(self) -> bool:
+        """Whether the value was compared against an ideal range"""
+        return hasattr(self, 'deviation')
+
+    @property
+    def ideal_range(self) -> str:
+        return self._entry.ideal_range if self._entry is not None else 'N/A'
+
+    @property
+    def message(self) -> str:
+        if not hasattr(self, 'deviation'):
+            return self._messages.general[self.status]
+        return self._messages.parameter_message(self.parameter, self.status)
+
+    def _keys(self) -> Tuple[str, ...]:
+        if not hasattr(self, 'deviation'):
+            return UNRANGED_KEYS
+        if hasattr(self, 'population'):
+            return RANGED_KEYS + ('population',)
+        return RANGED_KEYS
+
+    def __getitem__(self, key: str) -> Any:
+        if key in RESULT_KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in RESULT_KEYS:
+            return getattr(self, key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in RESULT_KEYS and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the result's keys, e.g. for JSON encoding"""
+        entry = self._entry
+        if not hasattr(self, 'deviation'):
+            return {
+                'value': self.value,
+                'status': self.status,
+                'message': self._messages.general[self.status],
+                'ideal_range': entry.ideal_range if entry is not None else 'N/A'
+            }
+        result = {
+            'value': self.value,
+            'ideal_min': entry.min_value,
+            'ideal_max': entry.max_value,
+            'unit': entry.unit,
+            'status': self.status,
+            'message': self._messages.parameter_message(self.parameter, self.status),
+            'deviation': self.deviation,
+            'ideal_range': entry.ideal_range
+        }
+        if hasattr(self, 'population'):
+            result['population'] = self.population
+        return result
+
+    def __reduce__(self):
+        # Results cross process boundaries (batch workers); send the locale, not the bundle
+        return (_restore, (self.parameter, self.value, self.status, self._messages.locale, self._entry,
+                           getattr(self, 'deviation', None), getattr(self, 'population', None)))
+
+    def __repr__(self) -> str:
+        return f"ParameterResult({self.parameter!r}, {self.to_dict()!r})"
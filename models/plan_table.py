@@ -0,0 +1,130 @@
+from typing import Any, Dict, Optional, Tuple
+
+from models.knowledge_base import FrozenDict, KNOWLEDGE_BASE
+from models.meal_planner import MealPlan
+
+
+class PlanFragment:
+    """Parts of a recommendation that do not depend on the member's numbers.
+
+    ``diet`` holds the food lists, meal timing and supplements of the diet
+    strategy; ``workout_plan`` is the complete workout plan of the workout
+    strategy. Both are frozen and shared by every request that maps to the
+    fragment; the meal plan is solved per macro target by the MealPlanner.
+    """
+
+    __slots__ = ('diet_strategy', 'workout_strategy', 'diet', 'workout_plan')
+
+    def __init__(self, diet_strategy: str, workout_strategy: str, diet: FrozenDict, workout_plan: FrozenDict):
+        self.diet_strategy = diet_strategy
+        self.workout_strategy = workout_strategy
+        self.diet = diet
+        self.workout_plan = workout_plan
+
+    def diet_plan(self, daily_calories: int, macronutrients: Dict[str, Any], meal_plan: MealPlan) -> Dict[str, Any]:
+        """The diet plan of one member: the shared parts plus their calories, macros and meal plan"""
+        diet = self.diet
+        return {
+            'strategy': self.diet_strategy,
+            'daily_calories': daily_calories,
+            'macronutrients': macronutrients,
+            'foods_to_include': diet['foods_to_include'],
+            'foods_to_avoid': diet['foods_to_avoid'],
+            'meal_timing': diet['meal_timing'],
+            'supplements': diet['supplements'],
+            'sample_meal_plan': meal_plan.meals,
+            'meal_plan_totals': meal_plan.totals
+        }
+
+    def __repr__(self) -> str:
+        return f"PlanFragment({self.diet_strategy!r}, {self.workout_strategy!r})"
+
+
+class PlanTable:
+    """Plan fragments indexed by (diet strategy, workout strategy, gender, activity level, calorie bucket).
+
+    Compiled once from the knowledge base. The knowledge base has no
+    gender, activity or calorie specific plans yet, so every gender,
+    activity level and calorie bucket of a strategy pair shares one
+    fragment. Unknown strategies fall back to 'optimal', unknown genders
+    to 'female' and unknown activity levels to 'moderate', matching the
+    daily calorie calculation; calories are clamped into the bucket range.
+    """
+
+    GENDERS = ('male', 'female')
+    ACTIVITY_LEVELS = ('sedentary', 'light', 'moderate', 'active', 'very_active')
+    DEFAULT_STRATEGY = 'optimal'
+    DEFAULT_GENDER = 'female'
+    DEFAULT_ACTIVITY_LEVEL = 'moderate'
+
+    def __init__(self, knowledge_base: Dict[str, Any], calorie_bucket_size: int = 500,
+                 calorie_range: Tuple[int, int] = (1000, 4000)):
+        self.calorie_bucket_size = calorie_bucket_size
+        self.min_bucket = calorie_range[0] // calorie_bucket_size
+        self.max_bucket = calorie_range[1] // calorie_bucket_size
+        self.diet_strategies = frozenset(knowledge_base['diet'])
+        self.workout_strategies = frozenset(knowledge_base['workout'])
+
+        self._fragments: Dict[Tuple[str, str, str, str, int], PlanFragment] = {}
+        for diet_strategy in knowledge_base['diet']:
+            diet = self._diet(knowledge_base, diet_strategy)
+            for workout_strategy in knowledge_base['workout']:
+                fragment = PlanFragment(diet_strategy, workout_strategy, diet,
+                                        self._workout_plan(knowledge_base, workout_strategy))
+                for gender in self.GENDERS:
+                    for activity_level in self.ACTIVITY_LEVELS:
+                        for bucket in range(self.min_bucket, self.max_bucket + 1):
+                            self._fragments[(diet_strategy, workout_strategy, gender, activity_level, bucket)] = fragment
+
+    @staticmethod
+    def _section(knowledge_base: Dict[str, Any], section: str, strategy: str) -> Any:
+        plans = knowledge_base[section]
+        return plans.get(strategy, plans['optimal'])
+
+    def _diet(self, knowledge_base: Dict[str, Any], strategy: str) -> FrozenDict:
+        base = knowledge_base['diet'][strategy]
+        return FrozenDict(
+            foods_to_include=base['foods_to_include'],
+            foods_to_avoid=base['foods_to_avoid'],
+            meal_timing=base['meal_timing'],
+            supplements=base['supplements']
+        )
+
+    def _workout_plan(self, knowledge_base: Dict[str, Any], strategy: str) -> FrozenDict:
+        return FrozenDict(
+            strategy=strategy,
+            cardio_plan=self._section(knowledge_base, 'cardio_plans', strategy),
+            strength_plan=self._section(knowledge_base, 'strength_plans', strategy),
+            special_notes=knowledge_base['workout'][strategy]['special_notes'],
+            weekly_schedule=self._section(knowledge_base, 'weekly_schedules', strategy)
+        )
+
+    def calorie_bucket(self, daily_calories: Any) -> int:
+        """Index of the calorie bucket daily calories fall into"""
+        try:
+            bucket = int(daily_calories) // self.calorie_bucket_size
+        except (TypeError, ValueError):
+            return self.min_bucket
+        return min(max(bucket, self.min_bucket), self.max_bucket)
+
+    def lookup(self, diet_strategy: str, workout_strategy: str, gender: Optional[str] = None,
+               activity_level: Optional[str] = None, daily_calories: Any = None) -> PlanFragment:
+        """Return the shared plan fragment of a strategy pair and member profile"""
+        if diet_strategy not in self.diet_strategies:
+            diet_strategy = self.DEFAULT_STRATEGY
+        if workout_strategy not in self.workout_strategies:
+            workout_strategy = self.DEFAULT_STRATEGY
+        gender = gender.lower() if isinstance(gender, str) else None
+        if gender not in self.GENDERS:
+            gender = self.DEFAULT_GENDER
+        if activity_level not in self.ACTIVITY_LEVELS:
+            activity_level = self.DEFAULT_ACTIVITY_LEVEL
+        return self._fragments[(diet_strategy, workout_strategy, gender, activity_level,
+                                self.calorie_bucket(daily_calories))]
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+
+# Shared by every RecommendationEngine in the process
+PLAN_TABLE = PlanTable(KNOWLEDGE_BASE)
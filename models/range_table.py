@@ -0,0 +1,77 @@
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+
+class RangeEntry:
+    """Ideal range of one parameter for one gender and age band"""
+
+    __slots__ = ('min_value', 'max_value', 'unit', 'ideal_range')
+
+    def __init__(self, min_value: float, max_value: float, unit: str):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.unit = unit
+        # Display string, formatted once instead of on every analysis
+        self.ideal_range = f"{min_value}-{max_value} {unit}"
+
+    def __repr__(self) -> str:
+        return f"RangeEntry({self.ideal_range!r})"
+
+
+class RangeTable:
+    """Flat lookup of ideal ranges indexed by (parameter, gender, age band).
+
+    Compiled once from the nested ``ideal_ranges`` definition: parameters that
+    are not gender-specific share one entry across genders, and genders the
+    table does not know fall back to the male ranges. ``age_bands`` are the
+    exclusive upper age limits of every band but the last; ``age_adjusted``
+    replaces the entry of a (parameter, gender, band) key.
+    """
+
+    GENDERS = ('male', 'female')
+    DEFAULT_GENDER = 'male'
+
+    def __init__(self, ideal_ranges: Dict[str, Dict[str, Any]], gender_specific: Iterable[str],
+                 age_bands: Sequence[float] = (),
+                 age_adjusted: Optional[Dict[Tuple[str, str, int], Dict[str, Any]]] = None):
+        self.age_bands = tuple(age_bands)
+        self.band_count = len(self.age_bands) + 1
+        self.parameters = frozenset(ideal_ranges)
+        gender_specific = set(gender_specific)
+
+        self._entries: Dict[Tuple[str, str, int], RangeEntry] = {}
+        for parameter, ranges in ideal_ranges.items():
+            shared = None
+            if not (parameter in gender_specific and self.DEFAULT_GENDER in ranges):
+                shared = RangeEntry(ranges['min'], ranges['max'], ranges['unit'])
+            for gender in self.GENDERS:
+                if shared is None:
+                    gender_ranges = ranges.get(gender, ranges[self.DEFAULT_GENDER])
+                    entry = RangeEntry(gender_ranges['min'], gender_ranges['max'], gender_ranges['unit'])
+                else:
+                    entry = shared
+                for band in range(self.band_count):
+                    self._entries[(parameter, gender, band)] = entry
+
+        for (parameter, gender, band), ranges in (age_adjusted or {}).items():
+            self._entries[(parameter, gender, band)] = RangeEntry(ranges['min'], ranges['max'], ranges['unit'])
+
+    def age_band(self, age: Any) -> int:
+        """Index of the age band an age falls into (the first band if unknown)"""
+        if not self.age_bands:
+            return 0
+        try:
+            return bisect_right(self.age_bands, float(age))
+        except (TypeError, ValueError):
+            return 0
+
+    def resolve(self, user_info: Dict[str, Any]) -> Tuple[str, int]:
+        """Normalize a user's gender and age into a table key part"""
+        gender = (user_info.get('gender') or self.DEFAULT_GENDER).lower()
+        if gender not in self.GENDERS:
+            gender = self.DEFAULT_GENDER
+        return gender, self.age_band(user_info.get('age'))
+
+    def get(self, parameter: str, gender: str, band: int = 0) -> Optional[RangeEntry]:
+        """Entry for a resolved gender and age band, or None for unknown parameters"""
+        return self._entries.get((parameter, gender, band))
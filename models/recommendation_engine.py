@@ -1,13 +1,61 @@
-from typing import Dict, Any, List, Tuple
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional, Tuple
+from models.knowledge_base import KNOWLEDGE_BASE
+from models.meal_planner import MEAL_PLANNER, MealPlanner
+from models.plan_table import PLAN_TABLE, PlanFragment
+from utils.startup import lazy_import, module_available
 import random
 
+# numpy is only needed for batch recommendations; it is imported on first use
+NUMPY_AVAILABLE = module_available('numpy')
+np = lazy_import('numpy')
+
+
+# Activity multipliers of the daily calorie calculation
+ACTIVITY_MULTIPLIERS = {
+    'sedentary': 1.2,
+    'light': 1.375,
+    'moderate': 1.55,
+    'active': 1.725,
+    'very_active': 1.9
+}
+
+# Statuses that make a compared parameter a priority regardless of its deviation
+PRIORITY_STATUSES = ('high', 'low', 'very_high', 'very_low')
+
+
+# Macronutrient ratios based on strategy
+MACRO_RATIOS = {
+    'low_muscle_mass': {'protein': 0.30, 'carbs': 0.40, 'fat': 0.30},  # High protein for muscle building
+    'high_bmi': {'protein': 0.25, 'carbs': 0.35, 'fat': 0.40},  # Higher fat, lower carbs for weight loss
+    'high_glucose': {'protein': 0.25, 'carbs': 0.30, 'fat': 0.45},  # Lower carbs for glucose control
+    'high_cholesterol': {'protein': 0.25, 'carbs': 0.50, 'fat': 0.25},  # Lower fat for cholesterol
+    'high_blood_pressure': {'protein': 0.20, 'carbs': 0.55, 'fat': 0.25},  # DASH diet style
+    'optimal': {'protein': 0.25, 'carbs': 0.45, 'fat': 0.30}  # Balanced approach
+}
+
+# General improvement timelines
+PARAMETER_TIMELINES = {
+    'glucose': '2-3 months for significant improvement',
+    'cholesterol': '6-8 weeks for noticeable changes',
+    'blood_pressure': '4-6 weeks with consistent lifestyle changes',
+    'bmi': '3-6 months for healthy weight loss',
+    'body_fat_percentage': '2-4 months with proper diet and exercise'
+}
+
 
 class RecommendationEngine:
     """Generates personalized diet and workout recommendations based on health analysis"""
     
-    def __init__(self):
-        self.diet_recommendations = self._initialize_diet_database()
-        self.workout_recommendations = self._initialize_workout_database()
+    def __init__(self, meal_planner: Optional[MealPlanner] = None):
+        # Shared read-only knowledge base, loaded once per process
+        self.knowledge_base = KNOWLEDGE_BASE
+        self.diet_recommendations = KNOWLEDGE_BASE['diet']
+        self.workout_recommendations = KNOWLEDGE_BASE['workout']
+        # Strategy and profile keyed plan fragments, compiled once per process
+        self.plan_table = PLAN_TABLE
+        # Macro-targeted meal plans, cached per (strategy, macro bucket)
+        self.meal_planner = meal_planner or MEAL_PLANNER
     
     def generate_recommendations(self, health_data_or_analysis, user_info_or_gender=None, age=None, strategy='optimal') -> Dict[str, Any]:
         """Generate comprehensive recommendations - supports both old and new interfaces"""
@@ -50,11 +98,19 @@ class RecommendationEngine:
         # Get priority parameters that need attention
         priority_params = self._get_priority_parameters(analysis)
         
+        # Look up the shared plan fragment; only calories and macros are per member
+        daily_calories = self._calculate_daily_calories(user_info)
+        fragment = self._plan_fragment(priority_params, user_info, daily_calories)
+        
         # Generate diet recommendations
-        diet_plan = self._generate_diet_recommendations(analysis, user_info, priority_params)
+        diet_plan = self._generate_diet_recommendations(fragment, daily_calories, user_info)
         
-        # Generate workout recommendations
-        workout_plan = self._generate_workout_recommendations(analysis, user_info, priority_params)
+        # Workout recommendations are shared as a whole
+        return self._assemble_recommendations(analysis, user_info, priority_params, diet_plan, fragment.workout_plan)
+    
+    def _assemble_recommendations(self, analysis: Dict[str, Any], user_info: Dict[str, Any], priority_params: List[str],
+                                  diet_plan: Dict[str, Any], workout_plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the score dependent parts to the diet and workout plans"""
         
         # Generate lifestyle recommendations
         lifestyle_tips = self._generate_lifestyle_recommendations(analysis, user_info)
@@ -71,269 +127,163 @@ class RecommendationEngine:
             'overall_strategy': self._generate_overall_strategy(analysis, user_info)
         }
     
-    def _initialize_diet_database(self) -> Dict[str, Dict]:
-        """Initialize diet recommendation database"""
+    def update_recommendations(self, previous_recommendations: Dict[str, Any], previous_analysis: Dict[str, Any],
+                               analysis: Dict[str, Any], user_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Reuse previous recommendations when an updated analysis cannot change them
+        
+        Recommendations depend on the analysis only through the priority parameter
+        ordering and the overall score band, so they are regenerated only when
+        either of those changes. ``user_info`` must be unchanged.
+        """
+        priority_params = self._get_priority_parameters(analysis)
+        if (priority_params == previous_recommendations.get('priority_focus')
+                and self._score_band(analysis) == self._score_band(previous_analysis)):
+            return previous_recommendations
+        
+        return self.generate_recommendations(analysis, user_info)
+    
+    def generate_recommendations_batch(self, batch: Dict[str, Any], age=None, gender=None, weight=None,
+                                       height=None, activity_level=None) -> Dict[str, Any]:
+        """Priorities, strategies, calories and macros of many members at once with array operations.
+        
+        ``batch`` is the result of ``HealthAnalyzer.analyze_batch``. ``age``, ``gender``,
+        ``weight``, ``height`` and ``activity_level`` are per member sequences of the
+        user's own entries (``age`` defaults to the column kept in ``batch``). A column
+        that is not given, a NaN or None number and a gender or activity level that is
+        not a string take the defaults of a missing ``user_info`` key. Priorities
+        follow the column order of the batch, which is the order of the record's keys
+        in the single-member path.
+        
+        Returns columnar results: ``priority_focus`` (a list per member),
+        ``diet_strategy``, ``workout_strategy``, ``gender``, ``activity_level``,
+        ``daily_calories`` and ``overall_score`` arrays and a dict of
+        ``macronutrients`` arrays. ``batch_member_recommendations`` assembles the
+        recommendations of one member, equal to what ``generate_recommendations``
+        returns for the same record.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch recommendations")
+        
+        overall_score = np.asarray(batch['overall_score'])
+        rows = len(overall_score)
+        if age is None:
+            age = batch.get('age')
+        
+        # Priority parameters: compared parameters ordered by deviation, highest first
+        names = list(batch['parameters'])
+        deviation = np.empty((rows, len(names)))
+        include = np.zeros((rows, len(names)), dtype=bool)
+        for column, name in enumerate(names):
+            data = batch['parameters'][name]
+            deviation[:, column] = data['deviation']
+            with np.errstate(invalid='ignore'):
+                include[:, column] = ~np.isnan(data['deviation']) & (
+                    (data['deviation'] > 20) | np.isin(data['status'], PRIORITY_STATUSES))
+        # A stable sort keeps the column order between equal deviations, as list.sort does
+        order = np.argsort(np.where(include, -deviation, np.inf), axis=1, kind='stable')
+        counts = include.sum(axis=1)
+        ordered_names = np.array(names, dtype=object)[order] if names else np.empty((rows, 0), dtype=object)
+        priority_focus = [ordered_names[row, :counts[row]].tolist() for row in range(rows)]
+        
+        # Strategies of the primary issue, resolved the way PlanTable.lookup does
+        diet_strategies = np.array([self._resolve_strategy(self._diet_strategy([name]), self.plan_table.diet_strategies)
+                                    for name in names] + ['optimal'], dtype=object)
+        workout_strategies = np.array([self._resolve_strategy(self._workout_strategy([name]),
+                                                              self.plan_table.workout_strategies)
+                                       for name in names] + ['optimal'], dtype=object)
+        primary = np.where(counts > 0, order[:, 0] if names else 0, len(names))
+        diet_strategy = diet_strategies[primary]
+        workout_strategy = workout_strategies[primary]
+        
+        # Mifflin-St Jeor, operation for operation as in _calculate_daily_calories
+        age = np.trunc(self._batch_number_column(age, rows, 30))
+        weight = self._batch_number_column(weight, rows, 70)
+        height = self._batch_number_column(height, rows, 170)
+        is_male = np.array([True if value is None else isinstance(value, str) and value.lower() == 'male'
+                            for value in (gender if gender is not None else [None] * rows)], dtype=bool)
+        activity_level = np.array([value if isinstance(value, str) and value in ACTIVITY_MULTIPLIERS else 'moderate'
+                                   for value in (activity_level if activity_level is not None else [None] * rows)],
+                                  dtype=object)
+        multiplier = np.array([ACTIVITY_MULTIPLIERS[value] for value in activity_level], dtype=float)
+        bmr = np.where(is_male,
+                       88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age),
+                       447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age))
+        daily_calories = np.trunc(bmr * multiplier).astype(np.int64)
+        
         return {
-            'high_glucose': {
-                'foods_to_include': [
-                    'Leafy greens (spinach, kale)',
-                    'Whole grains (quinoa, brown rice)',
-                    'Lean proteins (chicken, fish, tofu)',
-                    'Nuts and seeds (almonds, chia seeds)',
-                    'Berries (blueberries, strawberries)',
-                    'Avocados',
-                    'Greek yogurt (unsweetened)'
-                ],
-                'foods_to_avoid': [
-                    'Refined sugars and sweets',
-                    'White bread and pasta',
-                    'Sugary drinks and sodas',
-                    'Processed snacks',
-                    'High-glycemic fruits (watermelon, pineapple)'
-                ],
-                'meal_timing': 'Eat smaller, frequent meals every 3-4 hours',
-                'supplements': ['Chromium', 'Alpha-lipoic acid', 'Cinnamon extract']
-            },
-            'high_cholesterol': {
-                'foods_to_include': [
-                    'Oats and barley',
-                    'Fatty fish (salmon, mackerel)',
-                    'Nuts (walnuts, almonds)',
-                    'Olive oil',
-                    'Beans and legumes',
-                    'Apples and citrus fruits',
-                    'Vegetables (eggplant, okra)'
-                ],
-                'foods_to_avoid': [
-                    'Saturated fats (red meat, butter)',
-                    'Trans fats (fried foods)',
-                    'Full-fat dairy products',
-                    'Processed meats',
-                    'Baked goods with shortening'
-                ],
-                'meal_timing': 'Include soluble fiber with each meal',
-                'supplements': ['Plant sterols', 'Psyllium husk', 'Fish oil']
-            },
-            'high_blood_pressure': {
-                'foods_to_include': [
-                    'Bananas (potassium-rich)',
-                    'Beets and beet juice',
-                    'Dark chocolate (85% cacao)',
-                    'Garlic',
-                    'Pomegranates',
-                    'Low-fat dairy',
-                    'Leafy greens'
-                ],
-                'foods_to_avoid': [
-                    'High-sodium foods',
-                    'Processed and canned foods',
-                    'Alcohol (limit intake)',
-                    'Caffeine (if sensitive)',
-                    'Pickled foods'
-                ],
-                'meal_timing': 'Reduce sodium to less than 2300mg daily',
-                'supplements': ['Magnesium', 'Potassium', 'Coenzyme Q10']
-            },
-            'high_bmi': {
-                'foods_to_include': [
-                    'High-fiber vegetables',
-                    'Lean proteins',
-                    'Whole grains (portion-controlled)',
-                    'Fruits (berries, apples)',
-                    'Healthy fats (limited portions)',
-                    'Green tea',
-                    'Water-rich foods'
-                ],
-                'foods_to_avoid': [
-                    'Calorie-dense processed foods',
-                    'Sugary drinks',
-                    'Large portions',
-                    'Fried foods',
-                    'Alcohol'
-                ],
-                'meal_timing': 'Practice portion control and mindful eating',
-                'supplements': ['Green tea extract', 'Conjugated linoleic acid']
-            },
-            'low_muscle_mass': {
-                'foods_to_include': [
-                    'Lean proteins (chicken, fish, tofu, legumes)',
-                    'Eggs and egg whites',
-                    'Greek yogurt and cottage cheese',
-                    'Quinoa and brown rice',
-                    'Nuts and seeds (almonds, chia seeds)',
-                    'Milk and dairy products',
-                    'Lean beef and turkey'
-                ],
-                'foods_to_avoid': [
-                    'Excessive processed foods',
-                    'Empty calorie snacks',
-                    'Excessive alcohol',
-                    'High sugar foods without protein'
-                ],
-                'meal_timing': 'Include protein with every meal and post-workout',
-                'supplements': ['Whey protein', 'Creatine', 'BCAAs', 'Vitamin D']
-            },
-            'high_visceral_fat': {
-                'foods_to_include': [
-                    'High-fiber vegetables',
-                    'Whole grains in moderation',
-                    'Lean proteins',
-                    'Healthy fats (olive oil, avocado)',
-                    'Green tea',
-                    'Berries and low-sugar fruits',
-                    'Fermented foods (yogurt, kimchi)'
-                ],
-                'foods_to_avoid': [
-                    'Refined sugars and carbohydrates',
-                    'Trans fats and fried foods',
-                    'Excessive alcohol',
-                    'Processed meats',
-                    'High-sodium foods'
-                ],
-                'meal_timing': 'Intermittent fasting may be beneficial',
-                'supplements': ['Omega-3', 'Probiotics', 'Green tea extract']
-            },
-            'low_body_water': {
-                'foods_to_include': [
-                    'Water-rich fruits (watermelon, cucumber)',
-                    'Leafy greens',
-                    'Coconut water',
-                    'Herbal teas',
-                    'Soups and broths',
-                    'Electrolyte-rich foods'
-                ],
-                'foods_to_avoid': [
-                    'Excessive caffeine',
-                    'Alcohol',
-                    'High-sodium processed foods',
-                    'Diuretic substances'
-                ],
-                'meal_timing': 'Drink water throughout the day, especially before meals',
-                'supplements': ['Electrolyte supplements', 'Magnesium']
-            },
-            'optimal': {
-                'foods_to_include': [
-                    'Variety of whole foods',
-                    'Lean proteins (fish, poultry, legumes)',
-                    'Whole grains (quinoa, brown rice, oats)',
-                    'Fruits and vegetables',
-                    'Healthy fats (olive oil, nuts, avocado)',
-                    'Low-fat dairy or alternatives'
-                ],
-                'foods_to_avoid': [
-                    'Excessive processed foods',
-                    'Refined sugars',
-                    'Trans fats',
-                    'Excessive alcohol',
-                    'High sodium foods'
-                ],
-                'meal_timing': 'Regular, balanced meals throughout the day',
-                'supplements': ['Multivitamin', 'Omega-3', 'Vitamin D']
-            }
+            'priority_focus': priority_focus,
+            'diet_strategy': diet_strategy,
+            'workout_strategy': workout_strategy,
+            'gender': np.where(is_male, 'male', 'female'),
+            'activity_level': activity_level,
+            'daily_calories': daily_calories,
+            'macronutrients': self._calculate_macronutrients_batch(daily_calories, diet_strategy, weight),
+            'overall_score': overall_score
         }
     
-    def _initialize_workout_database(self) -> Dict[str, Dict]:
-        """Initialize workout recommendation database"""
-        return {
-            'high_glucose': {
-                'cardio': {
-                    'frequency': '5-6 days per week',
-                    'duration': '30-45 minutes',
-                    'intensity': 'Moderate',
-                    'exercises': ['Brisk walking', 'Swimming', 'Cycling', 'Elliptical']
-                },
-                'strength': {
-                    'frequency': '2-3 days per week',
-                    'duration': '30-40 minutes',
-                    'exercises': ['Full body resistance training', 'Circuit training', 'Bodyweight exercises']
-                },
-                'special_notes': 'Monitor blood sugar before and after exercise'
-            },
-            'high_cholesterol': {
-                'cardio': {
-                    'frequency': '4-5 days per week',
-                    'duration': '30-60 minutes',
-                    'intensity': 'Moderate to vigorous',
-                    'exercises': ['Running', 'Cycling', 'Swimming', 'Dancing']
-                },
-                'strength': {
-                    'frequency': '2 days per week',
-                    'duration': '30 minutes',
-                    'exercises': ['Weight training', 'Resistance bands', 'Functional movements']
-                },
-                'special_notes': 'Focus on exercises that raise heart rate'
-            },
-            'high_blood_pressure': {
-                'cardio': {
-                    'frequency': '4-5 days per week',
-                    'duration': '30-45 minutes',
-                    'intensity': 'Moderate',
-                    'exercises': ['Walking', 'Swimming', 'Low-impact aerobics', 'Yoga']
-                },
-                'strength': {
-                    'frequency': '2 days per week',
-                    'duration': '20-30 minutes',
-                    'exercises': ['Light to moderate weight training', 'Avoid heavy lifting']
-                },
-                'special_notes': 'Avoid holding breath during exercises, monitor blood pressure'
-            },
-            'high_bmi': {
-                'cardio': {
-                    'frequency': '5-6 days per week',
-                    'duration': '45-60 minutes',
-                    'intensity': 'Moderate to vigorous',
-                    'exercises': ['HIIT', 'Running', 'Cycling', 'Swimming', 'Group fitness classes']
-                },
-                'strength': {
-                    'frequency': '3 days per week',
-                    'duration': '30-45 minutes',
-                    'exercises': ['Full body strength training', 'Compound movements', 'Circuit training']
-                },
-                'special_notes': 'Focus on calorie burning and muscle building'
-            },
-            'low_muscle_mass': {
-                'cardio': {
-                    'frequency': '3-4 days per week',
-                    'duration': '20-30 minutes',
-                    'intensity': 'Moderate',
-                    'exercises': ['Walking', 'Light cycling', 'Swimming']
-                },
-                'strength': {
-                    'frequency': '4-5 days per week',
-                    'duration': '45-60 minutes',
-                    'exercises': ['Progressive resistance training', 'Compound movements', 'Free weights', 'Bodyweight exercises']
-                },
-                'special_notes': 'Focus on progressive overload and adequate protein intake for muscle building'
-            },
-            'high_visceral_fat': {
-                'cardio': {
-                    'frequency': '5-6 days per week',
-                    'duration': '30-45 minutes',
-                    'intensity': 'Moderate to high',
-                    'exercises': ['HIIT training', 'Running', 'Cycling', 'Rowing']
-                },
-                'strength': {
-                    'frequency': '3 days per week',
-                    'duration': '30-40 minutes',
-                    'exercises': ['Full body circuits', 'Core strengthening', 'Metabolic training']
-                },
-                'special_notes': 'Combine cardio with strength training for optimal visceral fat reduction'
-            },
-            'optimal': {
-                'cardio': {
-                    'frequency': '3-4 days per week',
-                    'duration': '30-45 minutes',
-                    'intensity': 'Moderate',
-                    'exercises': ['Variety of cardio activities', 'Mix of steady-state and intervals']
-                },
-                'strength': {
-                    'frequency': '2-3 days per week',
-                    'duration': '30-40 minutes',
-                    'exercises': ['Progressive strength training', 'Functional movements']
-                },
-                'special_notes': 'Maintain current fitness level and continue variety'
+    def batch_member_recommendations(self, batch_recommendations: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """Recommendations of one member of ``generate_recommendations_batch``"""
+        columns = batch_recommendations
+        daily_calories = int(columns['daily_calories'][index])
+        macronutrients = {key: int(values[index]) for key, values in columns['macronutrients'].items()}
+        fragment = self.plan_table.lookup(columns['diet_strategy'][index], columns['workout_strategy'][index],
+                                          columns['gender'][index], columns['activity_level'][index], daily_calories)
+        meal_plan = self.meal_planner.plan(fragment.diet_strategy, macronutrients)
+        analysis = {'overall_score': columns['overall_score'][index]}
+        return self._assemble_recommendations(analysis, {}, columns['priority_focus'][index],
+                                              fragment.diet_plan(daily_calories, macronutrients, meal_plan),
+                                              fragment.workout_plan)
+    
+    @staticmethod
+    def _resolve_strategy(strategy: str, known) -> str:
+        return strategy if strategy in known else 'optimal'
+    
+    @staticmethod
+    def _batch_number_column(values, rows: int, default: float):
+        """Float column of a user entry; missing entries take the default"""
+        if values is None:
+            return np.full(rows, float(default))
+        column = np.array(values, dtype=float)
+        column[np.isnan(column)] = default
+        return column
+    
+    def _calculate_macronutrients_batch(self, daily_calories, strategy, weight) -> Dict[str, Any]:
+        """Vectorized ``_calculate_macronutrients``; rounds half to even like round()"""
+        ratios = {nutrient: np.array([MACRO_RATIOS.get(name, MACRO_RATIOS['optimal'])[nutrient] for name in strategy],
+                                     dtype=float)
+                  for nutrient in ('protein', 'carbs', 'fat')}
+        
+        protein_grams = np.round(daily_calories * ratios['protein'] / 4)
+        carb_grams = np.round(daily_calories * ratios['carbs'] / 4)
+        fat_grams = np.round(daily_calories * ratios['fat'] / 9)
+        
+        # Ensure protein meets minimum requirements (0.8-1.2g per kg body weight)
+        min_protein = np.round(weight * 0.8)
+        optimal_protein = np.round(weight * 1.2)
+        protein_grams = np.where(protein_grams < min_protein, min_protein,
+                                 np.where((strategy == 'low_muscle_mass') & (protein_grams < optimal_protein),
+                                          optimal_protein, protein_grams))
+        
+        protein_grams = protein_grams.astype(np.int64)
+        carb_grams = carb_grams.astype(np.int64)
+        fat_grams = fat_grams.astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'protein_grams': protein_grams,
+                'carb_grams': carb_grams,
+                'fat_grams': fat_grams,
+                'protein_calories': protein_grams * 4,
+                'carb_calories': carb_grams * 4,
+                'fat_calories': fat_grams * 9,
+                'protein_percentage': np.round((protein_grams * 4 / daily_calories) * 100),
+                'carb_percentage': np.round((carb_grams * 4 / daily_calories) * 100),
+                'fat_percentage': np.round((fat_grams * 9 / daily_calories) * 100)
             }
-        }
+    
+    def _score_band(self, analysis: Dict[str, Any]) -> int:
+        """Band of the overall score between the thresholds the recommendations use"""
+        overall_score = analysis.get('overall_score', 50)
+        return sum(1 for threshold in (40, 60, 80) if overall_score >= threshold)
     
     def _get_priority_parameters(self, analysis: Dict[str, Any]) -> List[str]:
         """Get parameters that need immediate attention"""
@@ -343,116 +293,60 @@ class RecommendationEngine:
         parameter_analysis = analysis.get('parameter_analysis', analysis)
         
         for param, data in parameter_analysis.items():
-            if isinstance(data, dict) and 'deviation' in data:
+            if isinstance(data, Mapping) and 'deviation' in data:
                 deviation = data.get('deviation', 0)
                 status = data.get('status', 'unknown')
                 
                 # Add to priority if significant deviation or non-optimal status
-                if deviation > 20 or status in ['high', 'low', 'very_high', 'very_low']:
+                if deviation > 20 or status in PRIORITY_STATUSES:
                     priority.append(param)
         
         # Sort by deviation (highest first)
         priority.sort(key=lambda x: parameter_analysis.get(x, {}).get('deviation', 0), reverse=True)
         return priority
     
-    def _generate_diet_recommendations(self, analysis: Dict[str, Any], user_info: Dict[str, Any], priority_params: List[str]) -> Dict[str, Any]:
-        """Generate personalized diet recommendations"""
-        
-        # Determine primary diet strategy based on highest priority parameter
+    def _diet_strategy(self, priority_params: List[str]) -> str:
+        """Determine primary diet strategy based on highest priority parameter"""
         if not priority_params:
-            diet_strategy = 'optimal'
-        else:
-            primary_issue = priority_params[0]
-            if 'glucose' in primary_issue:
-                diet_strategy = 'high_glucose'
-            elif 'cholesterol' in primary_issue:
-                diet_strategy = 'high_cholesterol'
-            elif 'blood_pressure' in primary_issue:
-                diet_strategy = 'high_blood_pressure'
-            elif 'bmi' in primary_issue or 'body_fat' in primary_issue or 'weight' in primary_issue:
-                diet_strategy = 'high_bmi'
-            elif 'muscle_mass' in primary_issue or 'protein' in primary_issue:
-                diet_strategy = 'low_muscle_mass'
-            elif 'visceral_fat' in primary_issue:
-                diet_strategy = 'high_visceral_fat'
-            elif 'body_water' in primary_issue:
-                diet_strategy = 'low_body_water'
-            else:
-                diet_strategy = 'optimal'
-        
-        # Get base recommendations with fallback
-        try:
-            base_recommendations = self.diet_recommendations[diet_strategy].copy()
-        except KeyError:
-            # Fallback to optimal if strategy not found
-            diet_strategy = 'optimal'
-            base_recommendations = self.diet_recommendations[diet_strategy].copy()
-        
-        # Calculate daily caloric needs
-        daily_calories = self._calculate_daily_calories(user_info)
-        
-        # Calculate macronutrients based on strategy
-        macronutrients = self._calculate_macronutrients(daily_calories, diet_strategy, user_info)
-        
-        # Generate meal plan
-        meal_plan = self._generate_sample_meal_plan(diet_strategy, daily_calories)
-        
-        return {
-            'strategy': diet_strategy,
-            'daily_calories': daily_calories,
-            'macronutrients': macronutrients,
-            'foods_to_include': base_recommendations['foods_to_include'],
-            'foods_to_avoid': base_recommendations['foods_to_avoid'],
-            'meal_timing': base_recommendations['meal_timing'],
-            'supplements': base_recommendations['supplements'],
-            'sample_meal_plan': meal_plan
-        }
+            return 'optimal'
+        primary_issue = priority_params[0]
+        if 'glucose' in primary_issue:
+            return 'high_glucose'
+        elif 'cholesterol' in primary_issue:
+            return 'high_cholesterol'
+        elif 'blood_pressure' in primary_issue:
+            return 'high_blood_pressure'
+        elif 'bmi' in primary_issue or 'body_fat' in primary_issue or 'weight' in primary_issue:
+            return 'high_bmi'
+        elif 'muscle_mass' in primary_issue or 'protein' in primary_issue:
+            return 'low_muscle_mass'
+        elif 'visceral_fat' in primary_issue:
+            return 'high_visceral_fat'
+        elif 'body_water' in primary_issue:
+            return 'low_body_water'
+        return 'optimal'
     
-    def _generate_workout_recommendations(self, analysis: Dict[str, Any], user_info: Dict[str, Any], priority_params: List[str]) -> Dict[str, Any]:
-        """Generate personalized workout recommendations"""
-        
-        # Determine workout strategy
-        if not priority_params:
-            workout_strategy = 'optimal'
-        else:
-            primary_issue = priority_params[0]
-            if 'glucose' in primary_issue:
-                workout_strategy = 'high_glucose'
-            elif 'cholesterol' in primary_issue:
-                workout_strategy = 'high_cholesterol'
-            elif 'blood_pressure' in primary_issue:
-                workout_strategy = 'high_blood_pressure'
-            elif 'bmi' in primary_issue or 'body_fat' in primary_issue or 'weight' in primary_issue:
-                workout_strategy = 'high_bmi'
-            elif 'muscle_mass' in primary_issue or 'protein' in primary_issue:
-                workout_strategy = 'low_muscle_mass'
-            elif 'visceral_fat' in primary_issue:
-                workout_strategy = 'high_visceral_fat'
-            else:
-                workout_strategy = 'optimal'
-        
-        # Get base recommendations with fallback
-        try:
-            base_recommendations = self.workout_recommendations[workout_strategy].copy()
-        except KeyError:
-            # Fallback to optimal if strategy not found
-            workout_strategy = 'optimal'
-            base_recommendations = self.workout_recommendations[workout_strategy].copy()
+    def _workout_strategy(self, priority_params: List[str]) -> str:
+        """Determine workout strategy; the diet strategies without a workout plan use 'optimal'"""
+        strategy = self._diet_strategy(priority_params)
+        return strategy if strategy in self.workout_recommendations else 'optimal'
+    
+    def _plan_fragment(self, priority_params: List[str], user_info: Dict[str, Any], daily_calories: int) -> PlanFragment:
+        """Shared diet and workout plan parts for the strategies and member profile"""
+        return self.plan_table.lookup(self._diet_strategy(priority_params), self._workout_strategy(priority_params),
+                                      user_info.get('gender', 'male'), user_info.get('activity_level', 'moderate'),
+                                      daily_calories)
+    
+    def _generate_diet_recommendations(self, fragment: PlanFragment, daily_calories: int, user_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate personalized diet recommendations"""
         
-        # Generate detailed workout plans
-        cardio_plan = self._generate_detailed_cardio_plan(workout_strategy, user_info)
-        strength_plan = self._generate_detailed_strength_plan(workout_strategy, user_info)
+        # Calculate macronutrients based on strategy
+        macronutrients = self._calculate_macronutrients(daily_calories, fragment.diet_strategy, user_info)
         
-        # Generate weekly workout schedule
-        weekly_schedule = self._generate_weekly_workout_schedule(workout_strategy, user_info)
+        # Meal plan solved for the macronutrient targets
+        meal_plan = self.meal_planner.plan(fragment.diet_strategy, macronutrients)
         
-        return {
-            'strategy': workout_strategy,
-            'cardio_plan': cardio_plan,
-            'strength_plan': strength_plan,
-            'special_notes': base_recommendations['special_notes'],
-            'weekly_schedule': weekly_schedule
-        }
+        return fragment.diet_plan(daily_calories, macronutrients, meal_plan)
     
     def _generate_lifestyle_recommendations(self, analysis: Dict[str, Any], user_info: Dict[str, Any]) -> List[str]:
         """Generate general lifestyle recommendations"""
@@ -490,16 +384,7 @@ class RecommendationEngine:
             else:
                 bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
             
-            # Activity multipliers
-            activity_multipliers = {
-                'sedentary': 1.2,
-                'light': 1.375,
-                'moderate': 1.55,
-                'active': 1.725,
-                'very_active': 1.9
-            }
-            
-            multiplier = activity_multipliers.get(activity_level, 1.55)
+            multiplier = ACTIVITY_MULTIPLIERS.get(activity_level, 1.55)
             daily_calories = int(bmr * multiplier)
             
             return daily_calories
@@ -511,17 +396,7 @@ class RecommendationEngine:
         """Calculate macronutrient distribution based on strategy and user needs"""
         weight = float(user_info.get('weight', 70))
         
-        # Macronutrient ratios based on strategy
-        macro_ratios = {
-            'low_muscle_mass': {'protein': 0.30, 'carbs': 0.40, 'fat': 0.30},  # High protein for muscle building
-            'high_bmi': {'protein': 0.25, 'carbs': 0.35, 'fat': 0.40},  # Higher fat, lower carbs for weight loss
-            'high_glucose': {'protein': 0.25, 'carbs': 0.30, 'fat': 0.45},  # Lower carbs for glucose control
-            'high_cholesterol': {'protein': 0.25, 'carbs': 0.50, 'fat': 0.25},  # Lower fat for cholesterol
-            'high_blood_pressure': {'protein': 0.20, 'carbs': 0.55, 'fat': 0.25},  # DASH diet style
-            'optimal': {'protein': 0.25, 'carbs': 0.45, 'fat': 0.30}  # Balanced approach
-        }
-        
-        ratios = macro_ratios.get(strategy, macro_ratios['optimal'])
+        ratios = MACRO_RATIOS.get(strategy, MACRO_RATIOS['optimal'])
         
         # Calculate grams
         protein_calories = daily_calories * ratios['protein']
@@ -554,97 +429,6 @@ class RecommendationEngine:
             'fat_percentage': round((fat_grams * 9 / daily_calories) * 100)
         }
     
-    def _generate_sample_meal_plan(self, strategy: str, daily_calories: int) -> Dict[str, List[str]]:
-        """Generate a sample daily meal plan"""
-        
-        meal_plans = {
-            'high_glucose': {
-                'breakfast': ['Steel-cut oats with berries and nuts', 'Greek yogurt with cinnamon'],
-                'lunch': ['Grilled chicken salad with olive oil dressing', 'Quinoa with vegetables'],
-                'dinner': ['Baked salmon with steamed broccoli', 'Small portion of brown rice'],
-                'snacks': ['Apple with almond butter', 'Handful of walnuts']
-            },
-            'high_cholesterol': {
-                'breakfast': ['Oatmeal with ground flaxseed and berries', 'Green tea'],
-                'lunch': ['Lentil soup with whole grain roll', 'Mixed green salad'],
-                'dinner': ['Grilled fish with roasted vegetables', 'Barley pilaf'],
-                'snacks': ['Handful of almonds', 'Apple slices']
-            },
-            'high_blood_pressure': {
-                'breakfast': ['Low-sodium whole grain cereal with banana', 'Low-fat milk'],
-                'lunch': ['Turkey and vegetable wrap (low-sodium)', 'Fresh fruit'],
-                'dinner': ['Herb-seasoned chicken breast', 'Steamed vegetables', 'Sweet potato'],
-                'snacks': ['Unsalted nuts', 'Fresh berries']
-            },
-            'high_bmi': {
-                'breakfast': ['Vegetable omelet with spinach', 'Whole grain toast (1 slice)'],
-                'lunch': ['Large salad with grilled protein', 'Light vinaigrette'],
-                'dinner': ['Lean protein with roasted vegetables', 'Small portion complex carbs'],
-                'snacks': ['Raw vegetables with hummus', 'Greek yogurt']
-            },
-            'optimal': {
-                'breakfast': ['Balanced meal with protein, healthy fats, and complex carbs'],
-                'lunch': ['Lean protein with vegetables and whole grains'],
-                'dinner': ['Variety of nutrients in appropriate portions'],
-                'snacks': ['Nutritious options like fruits, nuts, or yogurt']
-            }
-        }
-        
-        return meal_plans.get(strategy, meal_plans['optimal'])
-    
-    def _generate_weekly_workout_schedule(self, strategy: str, user_info: Dict[str, Any]) -> Dict[str, str]:
-        """Generate a weekly workout schedule"""
-        
-        schedules = {
-            'high_glucose': {
-                'Monday': 'Cardio (30 min walking) + Light strength training',
-                'Tuesday': 'Moderate cardio (cycling or swimming)',
-                'Wednesday': 'Strength training (full body)',
-                'Thursday': 'Cardio (30 min)',
-                'Friday': 'Strength training + Flexibility',
-                'Saturday': 'Longer cardio session (45 min)',
-                'Sunday': 'Active recovery (gentle yoga or walking)'
-            },
-            'high_cholesterol': {
-                'Monday': 'Moderate cardio (30-45 min)',
-                'Tuesday': 'Strength training (upper body)',
-                'Wednesday': 'Cardio (running or cycling)',
-                'Thursday': 'Strength training (lower body)',
-                'Friday': 'High-intensity cardio',
-                'Saturday': 'Full body strength training',
-                'Sunday': 'Active recovery or light cardio'
-            },
-            'high_blood_pressure': {
-                'Monday': 'Gentle cardio (walking or swimming)',
-                'Tuesday': 'Light strength training',
-                'Wednesday': 'Yoga or tai chi',
-                'Thursday': 'Moderate cardio',
-                'Friday': 'Strength training (avoid heavy lifting)',
-                'Saturday': 'Cardio activity of choice',
-                'Sunday': 'Relaxation and stretching'
-            },
-            'high_bmi': {
-                'Monday': 'HIIT training (20-30 min)',
-                'Tuesday': 'Strength training (full body)',
-                'Wednesday': 'Cardio (45-60 min)',
-                'Thursday': 'Strength training (upper body)',
-                'Friday': 'Cardio + core work',
-                'Saturday': 'Strength training (lower body)',
-                'Sunday': 'Active recovery (hiking, sports)'
-            },
-            'optimal': {
-                'Monday': 'Cardio workout',
-                'Tuesday': 'Strength training',
-                'Wednesday': 'Cardio or sports activity',
-                'Thursday': 'Strength training',
-                'Friday': 'Flexible workout (cardio or strength)',
-                'Saturday': 'Longer activity session',
-                'Sunday': 'Rest or gentle activity'
-            }
-        }
-        
-        return schedules.get(strategy, schedules['optimal'])
-    
     def _estimate_improvement_timeline(self, analysis: Dict[str, Any], priority_params: List[str]) -> Dict[str, str]:
         """Estimate timeline for health improvements"""
         
@@ -654,17 +438,8 @@ class RecommendationEngine:
             timeline['overall'] = 'Continue current healthy habits for maintenance'
             return timeline
         
-        # General improvement timelines
-        parameter_timelines = {
-            'glucose': '2-3 months for significant improvement',
-            'cholesterol': '6-8 weeks for noticeable changes',
-            'blood_pressure': '4-6 weeks with consistent lifestyle changes',
-            'bmi': '3-6 months for healthy weight loss',
-            'body_fat_percentage': '2-4 months with proper diet and exercise'
-        }
-        
         for param in priority_params:
-            for key, timeline_text in parameter_timelines.items():
+            for key, timeline_text in PARAMETER_TIMELINES.items():
                 if key in param:
                     timeline[param] = timeline_text
                     break
@@ -695,88 +470,3 @@ class RecommendationEngine:
         
         else:
             return "Comprehensive health overhaul needed. Implement immediate changes in diet and exercise. Strongly recommend consulting healthcare professionals for medical guidance."
-
-    def _generate_detailed_cardio_plan(self, strategy: str, user_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate detailed cardio workout plan"""
-        cardio_plans = {
-            'low_muscle_mass': {
-                'frequency': '3-4 days per week',
-                'duration': '20-30 minutes',
-                'intensity': 'Moderate',
-                'type': 'Low-impact cardio to preserve muscle',
-                'examples': ['Brisk walking', 'Light cycling', 'Swimming', 'Elliptical'],
-                'notes': 'Keep cardio moderate to avoid muscle loss'
-            },
-            'high_bmi': {
-                'frequency': '5-6 days per week',
-                'duration': '45-60 minutes',
-                'intensity': 'Moderate to High',
-                'type': 'Fat-burning cardio',
-                'examples': ['HIIT training', 'Running', 'Cycling', 'Rowing', 'Dancing'],
-                'notes': 'Mix steady-state and interval training'
-            },
-            'high_glucose': {
-                'frequency': '5 days per week',
-                'duration': '30-45 minutes',
-                'intensity': 'Moderate',
-                'type': 'Blood sugar control cardio',
-                'examples': ['Walking after meals', 'Swimming', 'Cycling', 'Dancing'],
-                'notes': 'Exercise within 30 minutes after meals'
-            },
-            'optimal': {
-                'frequency': '3-4 days per week',
-                'duration': '30-45 minutes',
-                'intensity': 'Moderate',
-                'type': 'General fitness cardio',
-                'examples': ['Running', 'Cycling', 'Swimming', 'Group fitness'],
-                'notes': 'Vary activities to prevent boredom'
-            }
-        }
-        
-        return cardio_plans.get(strategy, cardio_plans['optimal'])
-
-    def _generate_detailed_strength_plan(self, strategy: str, user_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate detailed strength training plan"""
-        strength_plans = {
-            'low_muscle_mass': {
-                'frequency': '4-5 days per week',
-                'duration': '45-60 minutes',
-                'focus': 'Muscle building and strength',
-                'sets_reps': '3-4 sets of 6-12 reps',
-                'exercises': [
-                    'Compound movements: Squats, Deadlifts, Bench Press',
-                    'Pull-ups/Chin-ups or Lat Pulldowns',
-                    'Overhead Press, Rows',
-                    'Progressive overload essential'
-                ],
-                'notes': 'Focus on compound exercises with progressive overload'
-            },
-            'high_bmi': {
-                'frequency': '3-4 days per week',
-                'duration': '30-45 minutes',
-                'focus': 'Fat loss and muscle preservation',
-                'sets_reps': '2-3 sets of 12-15 reps',
-                'exercises': [
-                    'Full-body circuit training',
-                    'Bodyweight exercises',
-                    'Light to moderate weights',
-                    'Functional movements'
-                ],
-                'notes': 'Higher reps with shorter rest periods'
-            },
-            'optimal': {
-                'frequency': '3-4 days per week',
-                'duration': '45 minutes',
-                'focus': 'General strength and fitness',
-                'sets_reps': '3 sets of 8-12 reps',
-                'exercises': [
-                    'Balanced upper/lower body',
-                    'Core strengthening',
-                    'Flexibility work',
-                    'Progressive training'
-                ],
-                'notes': 'Maintain balanced muscle development'
-            }
-        }
-        
-        return strength_plans.get(strategy, strength_plans['optimal'])
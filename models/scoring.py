@@ -0,0 +1,211 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Tuple
+
+from utils.startup import lazy_import, module_available
+
+# numpy is only needed for batch scoring; it is imported on first use
+NUMPY_AVAILABLE = module_available('numpy')
+np = lazy_import('numpy')
+
+
+# Score pieces, evaluated against one component's analysis entry:
+#   number                                      constant score
+#   ('status', {status: piece}, otherwise)      piece for the entry's status
+#   ('steps', field, ((limit, score), ...), otherwise)
+#                                               score of the first limit the field is <= to
+#   ('linear', field, base, factor, floor)      max(floor, base - field * factor)
+#   ('bands', field, ((low, high, score), ...), otherwise)
+#                                               score of the first band holding the field
+# Fields are 'deviation' or 'value'; an entry without the field uses the
+# component's 'defaults' (0 unless given).
+
+# Deviation-based score of a parameter outside its range (standard components)
+STANDARD_OUT_OF_RANGE = ('linear', 'deviation', 100, 2, 20)
+
+# InBody Score components with their official weights and scoring rules, in
+# the order they are summed
+SCORE_RULES: Dict[str, Dict[str, Any]] = {
+    # Primary Body Composition (60% total weight)
+    'skeletal_muscle_mass': {
+        'weight': 0.25,                    # 25% - Most important for strength and metabolism
+        'score': ('status', {
+            'optimal': 100,
+            'normal': 85,
+            'low': ('steps', 'deviation', ((10, 65), (25, 40)), 20),
+            'high': 95                     # High muscle mass is generally positive
+        }, 50)
+    },
+    'body_fat_percentage': {
+        'weight': 0.20,                    # 20% - Key obesity indicator
+        'score': ('status', {
+            'optimal': 100,
+            'normal': 85,
+            'low': ('steps', 'deviation', ((15, 70), (30, 50)), 30),
+            'high': ('steps', 'deviation', ((15, 70), (30, 50)), 30)
+        }, 40)
+    },
+    'visceral_fat': {
+        'weight': 0.15,                    # 15% - Health risk indicator
+        'score': ('status', {
+            'optimal': 100,
+            'normal': 80,
+            'high': ('steps', 'deviation', ((20, 60), (50, 30)), 10)
+        }, 50)
+    },
+
+    # Body Water Analysis (20% total weight)
+    'total_body_water': {
+        'weight': 0.10,                    # 10% - Hydration status
+        'score': ('status', {'optimal': 100, 'normal': 85,
+                             'low': STANDARD_OUT_OF_RANGE, 'high': STANDARD_OUT_OF_RANGE}, 50)
+    },
+    'ecw_tbw_ratio': {
+        'weight': 0.10,                    # 10% - Inflammation/swelling indicator (optimal: 0.360-0.390)
+        'score': ('bands', 'value', ((0.360, 0.390, 100), (0.350, 0.400, 80), (0.340, 0.410, 60)), 30),
+        'defaults': {'value': 0.38}
+    },
+
+    # Supporting Metrics (20% total weight)
+    'bmi': {
+        'weight': 0.08,                    # 8% - Basic weight assessment
+        'score': ('status', {'optimal': 100, 'normal': 85,
+                             'low': STANDARD_OUT_OF_RANGE, 'high': STANDARD_OUT_OF_RANGE}, 50)
+    },
+    'lean_body_mass': {
+        'weight': 0.07,                    # 7% - Non-fat body mass
+        'score': ('status', {'optimal': 100, 'normal': 85,
+                             'low': STANDARD_OUT_OF_RANGE, 'high': STANDARD_OUT_OF_RANGE}, 50)
+    },
+    'basal_metabolic_rate': {
+        'weight': 0.05,                    # 5% - Metabolic efficiency
+        'score': ('status', {'optimal': 100, 'normal': 85,
+                             'low': STANDARD_OUT_OF_RANGE, 'high': STANDARD_OUT_OF_RANGE}, 50)
+    }
+}
+
+
+class ScoreTable:
+    """Weighted component scores compiled from a declarative rule table.
+
+    Every piece is compiled twice: into a closure over a single analysis entry
+    and into a NumPy evaluation over the columns returned by
+    ``HealthAnalyzer.analyze_batch``. Both sum the weighted components in
+    table order, so a record scores bit-identically either way.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]]):
+        self.rules = rules
+        self.weights = {component: rule['weight'] for component, rule in rules.items()}
+        self.components: List[Tuple[str, float, Callable[[Dict[str, Any]], float]]] = [
+            (component, rule['weight'], self._compile(rule['score'], rule.get('defaults', {})))
+            for component, rule in rules.items()
+        ]
+
+    def _compile(self, piece, defaults: Dict[str, Any]) -> Callable[[Dict[str, Any]], float]:
+        """Compile a score piece into a function of one analysis entry"""
+        if not isinstance(piece, tuple):
+            return lambda data: piece
+
+        kind = piece[0]
+        if kind == 'status':
+            by_status = {status: self._compile(sub_piece, defaults) for status, sub_piece in piece[1].items()}
+            otherwise = piece[2]
+
+            def score_status(data):
+                score = by_status.get(data.get('status', 'unknown'))
+                return otherwise if score is None else score(data)
+            return score_status
+
+        field = piece[1]
+        missing = defaults.get(field, 0)
+        if kind == 'steps':
+            steps, otherwise = piece[2], piece[3]
+
+            def score_steps(data):
+                value = data.get(field, missing)
+                for limit, score in steps:
+                    if value <= limit:
+                        return score
+                return otherwise
+            return score_steps
+
+        if kind == 'linear':
+            base, factor, floor = piece[2], piece[3], piece[4]
+            return lambda data: max(floor, base - data.get(field, missing) * factor)
+
+        if kind == 'bands':
+            bands, otherwise = piece[2], piece[3]
+
+            def score_bands(data):
+                value = data.get(field, missing)
+                for low, high, score in bands:
+                    if low <= value <= high:
+                        return score
+                return otherwise
+            return score_bands
+
+        raise ValueError(f"Unknown score piece: {kind}")
+
+    def base_score(self, analysis: Dict[str, Any]) -> float:
+        """Weighted mean score of the components present in a single analysis"""
+        component_scores = []
+        total_weight_used = 0
+
+        for component, weight, score in self.components:
+            data = analysis.get(component)
+            if isinstance(data, Mapping):
+                component_scores.append(score(data) * weight)
+                total_weight_used += weight
+
+        if total_weight_used > 0:
+            return sum(component_scores) / total_weight_used
+        return 50.0
+
+    def _evaluate(self, piece, data: Dict[str, Any]):
+        """Evaluate a score piece over batch columns (status, deviation and value arrays)"""
+        if not isinstance(piece, tuple):
+            return float(piece)
+
+        kind = piece[0]
+        if kind == 'status':
+            status = data['status']
+            conditions = [status == name for name in piece[1]]
+            choices = [self._evaluate(sub_piece, data) for sub_piece in piece[1].values()]
+            return np.select(conditions, choices, float(piece[2]))
+
+        values = data[piece[1]]
+        if kind == 'steps':
+            return np.select([values <= limit for limit, _ in piece[2]],
+                             [float(score) for _, score in piece[2]], float(piece[3]))
+        if kind == 'linear':
+            return np.maximum(piece[4], piece[2] - values * piece[3])
+        if kind == 'bands':
+            return np.select([(low <= values) & (values <= high) for low, high, _ in piece[2]],
+                             [float(score) for _, _, score in piece[2]], float(piece[3]))
+        raise ValueError(f"Unknown score piece: {kind}")
+
+    def base_score_batch(self, results: Dict[str, Any], rows: int):
+        """Vectorized ``base_score`` over ``analyze_batch`` parameter columns"""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch scoring")
+
+        weighted_scores = np.zeros(rows)
+        total_weight_used = np.zeros(rows)
+
+        for component, rule in self.rules.items():
+            if component not in results:
+                continue
+            data = results[component]
+            present = data['status'] != ''
+            with np.errstate(invalid='ignore'):
+                score = self._evaluate(rule['score'], data)
+
+            weighted_scores = weighted_scores + np.where(present, score * rule['weight'], 0.0)
+            total_weight_used = total_weight_used + np.where(present, rule['weight'], 0.0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total_weight_used > 0, weighted_scores / total_weight_used, 50.0)
+
+
+# Compiled once per process
+SCORE_TABLE = ScoreTable(SCORE_RULES)
@@ -16,6 +16,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Initialize form validation
     initializeFormValidation();
     
+    // Submit forms with a JSON endpoint in place
+    initializeApiForms();
+    
     // Initialize health score animation
     animateHealthScore();
     
@@ -263,39 +266,399 @@ function showAlert(message, type = 'info') {
 }
 
 // Form submission handlers
-function handleFormSubmission(formId, endpoint) {
-    const form = document.getElementById(formId);
+function initializeApiForms() {
+    // Forms with a JSON endpoint are analyzed in place; without JavaScript they post to their page route
+    document.querySelectorAll('form[data-api-endpoint]').forEach(form => {
+        handleFormSubmission(form, form.dataset.apiEndpoint);
+    });
+}
+
+// Last response per endpoint, sent back as If-None-Match so an unchanged result comes back as an empty 304
+const apiResponses = {};
+
+function handleFormSubmission(form, endpoint) {
+    if (typeof form === 'string') {
+        form = document.getElementById(form);
+    }
     if (!form) return;
 
+    const submitButton = form.querySelector('button[type="submit"]');
+    const buttonLabel = submitButton ? submitButton.innerHTML : '';
+
     form.addEventListener('submit', async function(e) {
+        // Page scripts may have rejected the submission already
+        if (e.defaultPrevented) return;
         e.preventDefault();
         
-        const submitButton = form.querySelector('button[type="submit"]');
-        const originalText = showLoadingSpinner(submitButton);
+        if (submitButton) showLoadingSpinner(submitButton);
         
         try {
-            const formData = new FormData(form);
+            const headers = {'Accept': 'application/json'};
+            const previous = apiResponses[endpoint];
+            if (previous) {
+                headers['If-None-Match'] = previous.etag;
+            }
+            
             const response = await fetch(endpoint, {
                 method: 'POST',
-                body: formData
+                body: new FormData(form),
+                headers: headers
             });
             
-            if (response.ok) {
-                // Handle successful response
-                const result = await response.text();
-                document.body.innerHTML = result;
+            let data;
+            if (response.status === 304 && previous) {
+                data = previous.data;
             } else {
-                throw new Error('Failed to process request');
+                data = await response.json();
+                if (!response.ok) {
+                    throw new Error(data.error || 'Failed to process request');
+                }
+                apiResponses[endpoint] = {etag: response.headers.get('ETag'), data: data};
             }
+            
+            renderResults(data);
         } catch (error) {
-            showAlert('An error occurred while processing your request. Please try again.', 'danger');
+            showAlert(escapeHtml(error.message || 'An error occurred while processing your request. Please try again.'), 'danger');
             console.error('Form submission error:', error);
         } finally {
-            hideLoadingSpinner(submitButton, originalText);
+            if (submitButton) hideLoadingSpinner(submitButton, buttonLabel);
         }
     });
 }
 
+// Client-side results page, laid out like templates/results.html
+function escapeHtml(value) {
+    return String(value === null || value === undefined ? '' : value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+function titleCase(value) {
+    return String(value).replace(/_/g, ' ').replace(/\w\S*/g, word => word.charAt(0).toUpperCase() + word.slice(1).toLowerCase());
+}
+
+function listItems(items, className = '', icon = '') {
+    return (items || []).map(item => `<li class="${className}">${icon}${escapeHtml(item)}</li>`).join('');
+}
+
+function ordinal(number) {
+    // Same suffixes as the ordinal template filter: 1st, 22nd, 13th
+    const rest = number % 100;
+    if (rest >= 10 && rest <= 20) return `${number}th`;
+    return number + ({1: 'st', 2: 'nd', 3: 'rd'}[number % 10] || 'th');
+}
+
+function scoreClass(score) {
+    if (score >= 80) return 'text-success';
+    if (score >= 60) return 'text-warning';
+    return 'text-danger';
+}
+
+function riskBadgeClass(riskLevel) {
+    if (riskLevel.includes('Excellent')) return 'bg-success';
+    if (riskLevel.includes('Very Good')) return 'bg-primary';
+    if (riskLevel.includes('Good')) return 'bg-info';
+    if (riskLevel.includes('Fair')) return 'bg-warning text-dark';
+    if (riskLevel.includes('Needs Improvement')) return 'bg-warning';
+    return 'bg-danger';
+}
+
+function statusBadgeClass(status) {
+    if (status === 'optimal') return 'bg-success';
+    if (status === 'low') return 'bg-warning';
+    return 'bg-danger';
+}
+
+function deviationClass(deviation) {
+    if (deviation <= 10) return 'bg-success';
+    if (deviation <= 25) return 'bg-warning';
+    return 'bg-danger';
+}
+
+function renderParameter(param, data) {
+    let extra = '';
+    if (data.population) {
+        extra += `<div class="small mt-1"><i class="fas fa-users me-1"></i>${escapeHtml(ordinal(data.population.percentile))} percentile of ${escapeHtml(data.population.cohort)}</div>`;
+    }
+    if (data.deviation > 0) {
+        extra += `
+            <div class="progress mt-2" style="height: 8px;">
+                <div class="progress-bar ${deviationClass(data.deviation)}" style="width: ${Math.min(data.deviation, 100)}%"></div>
+            </div>
+            <small class="text-muted">${data.deviation.toFixed(1)}% deviation from ideal</small>`;
+    }
+    return `
+        <div class="col-lg-6 mb-4">
+            <div class="border rounded p-3">
+                <div class="d-flex justify-content-between align-items-center mb-2">
+                    <h6 class="mb-0">${escapeHtml(titleCase(param))}</h6>
+                    <span class="badge ${statusBadgeClass(data.status)}">${escapeHtml(titleCase(data.status))}</span>
+                </div>
+                <div class="mb-2"><strong>Your Value:</strong> ${escapeHtml(data.value)} ${escapeHtml(data.unit)}</div>
+                <div class="mb-2"><strong>Ideal Range:</strong> ${escapeHtml(data.ideal_min)} - ${escapeHtml(data.ideal_max)} ${escapeHtml(data.unit)}</div>
+                <div class="small text-muted">${escapeHtml(data.message)}</div>
+                ${extra}
+            </div>
+        </div>`;
+}
+
+function renderShapeBar(title, titleClass, barClass, data, fallbackValue, fallbackMax) {
+    data = data || {};
+    const value = data.value !== undefined ? data.value : fallbackValue;
+    const max = data.ideal_max !== undefined ? data.ideal_max : fallbackMax;
+    const pct = value / max * 100;
+    return `
+        <div class="col-md-4">
+            <div class="border rounded p-3 mb-3">
+                <h6 class="${titleClass} mb-3">${title}</h6>
+                <div class="progress mb-2" style="height: 20px;">
+                    <div class="progress-bar ${barClass}" style="width: ${Math.min(pct, 100)}%"></div>
+                </div>
+                <small class="text-dark">${pct.toFixed(0)}% of ideal</small>
+            </div>
+        </div>`;
+}
+
+function renderDietPlan(diet) {
+    const meals = Object.entries(diet.sample_meal_plan || {}).map(([meal, items]) => `
+        <div class="mb-2">
+            <strong>${escapeHtml(titleCase(meal))}:</strong>
+            <ul class="small mb-1">${listItems(items)}</ul>
+        </div>`).join('');
+    const totals = diet.meal_plan_totals;
+    const totalsLine = totals ? `
+        <small class="text-muted">
+            Plan totals: ${escapeHtml(totals.protein_grams)} g protein, ${escapeHtml(totals.carb_grams)} g carbs,
+            ${escapeHtml(totals.fat_grams)} g fat (${escapeHtml(totals.calories)} calories)
+        </small>` : '';
+    return `
+        <div class="col-lg-6 mb-4">
+            <div class="card shadow h-100">
+                <div class="card-header bg-success text-white">
+                    <h5 class="mb-0"><i class="fas fa-utensils me-2"></i>Personalized Diet Plan</h5>
+                </div>
+                <div class="card-body">
+                    <div class="mb-3">
+                        <h6 class="text-success">Daily Calorie Target</h6>
+                        <p class="h5">${escapeHtml(diet.daily_calories)} calories</p>
+                    </div>
+                    <div class="mb-3">
+                        <h6 class="text-success">Foods to Include</h6>
+                        <ul class="list-unstyled">${listItems(diet.foods_to_include, 'mb-1', '<i class="fas fa-check text-success me-2"></i>')}</ul>
+                    </div>
+                    <div class="mb-3">
+                        <h6 class="text-danger">Foods to Avoid</h6>
+                        <ul class="list-unstyled">${listItems(diet.foods_to_avoid, 'mb-1', '<i class="fas fa-times text-danger me-2"></i>')}</ul>
+                    </div>
+                    <div class="mb-3">
+                        <h6 class="text-info">Sample Daily Meal Plan</h6>
+                        ${meals}
+                        ${totalsLine}
+                    </div>
+                    <div class="alert alert-light">
+                        <small><strong>Meal Timing:</strong> ${escapeHtml(diet.meal_timing)}</small>
+                    </div>
+                </div>
+            </div>
+        </div>`;
+}
+
+function renderWorkoutPlan(workout) {
+    const cardio = workout.cardio_plan || {};
+    const strength = workout.strength_plan || {};
+    const schedule = Object.entries(workout.weekly_schedule || {}).map(([day, activity]) => `
+        <div class="d-flex justify-content-between border-bottom py-1">
+            <strong>${escapeHtml(day)}:</strong>
+            <small>${escapeHtml(activity)}</small>
+        </div>`).join('');
+    const notes = workout.special_notes ? `
+        <div class="alert alert-info">
+            <small><i class="fas fa-exclamation-circle me-1"></i>${escapeHtml(workout.special_notes)}</small>
+        </div>` : '';
+    return `
+        <div class="col-lg-6 mb-4">
+            <div class="card shadow h-100">
+                <div class="card-header bg-warning text-dark">
+                    <h5 class="mb-0"><i class="fas fa-dumbbell me-2"></i>Personalized Workout Plan</h5>
+                </div>
+                <div class="card-body">
+                    <div class="mb-3">
+                        <h6 class="text-warning">Cardio Training</h6>
+                        <ul class="list-unstyled">
+                            <li><strong>Frequency:</strong> ${escapeHtml(cardio.frequency)}</li>
+                            <li><strong>Duration:</strong> ${escapeHtml(cardio.duration)}</li>
+                            <li><strong>Intensity:</strong> ${escapeHtml(cardio.intensity)}</li>
+                        </ul>
+                        <div class="mb-2">
+                            <strong>Recommended Exercises:</strong>
+                            <ul class="small">${listItems(cardio.exercises)}</ul>
+                        </div>
+                    </div>
+                    <div class="mb-3">
+                        <h6 class="text-warning">Strength Training</h6>
+                        <ul class="list-unstyled">
+                            <li><strong>Frequency:</strong> ${escapeHtml(strength.frequency)}</li>
+                            <li><strong>Duration:</strong> ${escapeHtml(strength.duration)}</li>
+                        </ul>
+                        <div class="mb-2">
+                            <strong>Exercise Types:</strong>
+                            <ul class="small">${listItems(strength.exercises)}</ul>
+                        </div>
+                    </div>
+                    <div class="mb-3">
+                        <h6 class="text-info">Weekly Schedule</h6>
+                        ${schedule}
+                    </div>
+                    ${notes}
+                </div>
+            </div>
+        </div>`;
+}
+
+function renderResults(data) {
+    const analysis = data.analysis || {};
+    const recommendations = data.recommendations || {};
+    const userInfo = data.user_info || {};
+    const parameters = analysis.parameter_analysis || {};
+    const riskLevel = analysis.risk_level || '';
+    const score = analysis.overall_score || 0;
+
+    const parameterCards = Object.entries(parameters)
+        .filter(([, value]) => value && typeof value === 'object')
+        .map(([param, value]) => renderParameter(param, value))
+        .join('');
+    const timeline = Object.entries(recommendations.timeline || {}).map(([param, text]) => `
+        <div class="mb-3">
+            <h6 class="text-secondary">${escapeHtml(titleCase(param))}</h6>
+            <p class="small">${escapeHtml(text)}</p>
+        </div>`).join('');
+
+    const main = document.querySelector('main');
+    main.innerHTML = `
+        <div class="container py-5">
+            <div class="row mb-4">
+                <div class="col-12 text-center">
+                    <h1 class="display-5 fw-bold text-primary">Your InBody Analysis Results</h1>
+                    <p class="lead text-muted">Comprehensive body composition analysis for ${escapeHtml(userInfo.name || 'you')}</p>
+                </div>
+            </div>
+
+            <div class="row mb-5">
+                <div class="col-lg-4 mx-auto">
+                    <div class="card border-0 shadow text-center">
+                        <div class="card-body p-4">
+                            <h5 class="card-title text-primary">InBody Score</h5>
+                            <div class="display-4 fw-bold ${scoreClass(score)}">${score.toFixed(0)}</div>
+                            <p class="card-text"><span class="badge ${riskBadgeClass(riskLevel)}">${escapeHtml(riskLevel)}</span></p>
+                            <small class="text-muted">Based on body composition analysis</small>
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="row mb-5">
+                <div class="col-12">
+                    <div class="card shadow">
+                        <div class="card-header bg-primary text-white">
+                            <h5 class="mb-0"><i class="fas fa-chart-bar me-2"></i>Body Composition Analysis</h5>
+                        </div>
+                        <div class="card-body"><div class="row">${parameterCards}</div></div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="row mb-5">
+                <div class="col-12">
+                    <div class="card shadow">
+                        <div class="card-header bg-info text-white">
+                            <h5 class="mb-0"><i class="fas fa-shapes me-2"></i>InBody Shape Analysis</h5>
+                        </div>
+                        <div class="card-body">
+                            <div class="row text-center mb-4">
+                                ${renderShapeBar('Weight', 'text-primary', 'bg-primary', parameters.weight, 70, 70)}
+                                ${renderShapeBar('Skeletal Muscle', 'text-success', 'bg-success', parameters.muscle_mass, 35, 35)}
+                                ${renderShapeBar('Body Fat', 'text-warning', 'bg-warning', parameters.body_fat_percentage, 15, 20)}
+                            </div>
+                            <div class="alert alert-light border">
+                                <h6 class="mb-3 text-dark"><i class="fas fa-info-circle me-2"></i>Body Shape Interpretation:</h6>
+                                <div class="row">
+                                    <div class="col-md-4 mb-3"><div class="text-center p-3 border rounded">
+                                        <h6 class="text-success">D-Shape (Athletic)</h6>
+                                        <p class="small text-dark mb-0">High muscle mass, optimal fat<br>Ideal body composition</p>
+                                    </div></div>
+                                    <div class="col-md-4 mb-3"><div class="text-center p-3 border rounded">
+                                        <h6 class="text-primary">I-Shape (Balanced)</h6>
+                                        <p class="small text-dark mb-0">Balanced muscle and fat<br>Healthy composition</p>
+                                    </div></div>
+                                    <div class="col-md-4 mb-3"><div class="text-center p-3 border rounded">
+                                        <h6 class="text-warning">C-Shape (Needs Work)</h6>
+                                        <p class="small text-dark mb-0">Low muscle, high fat<br>Focus on muscle building</p>
+                                    </div></div>
+                                </div>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="row">
+                ${renderDietPlan(recommendations.diet_plan || {})}
+                ${renderWorkoutPlan(recommendations.workout_plan || {})}
+            </div>
+
+            <div class="row">
+                <div class="col-lg-6 mb-4">
+                    <div class="card shadow">
+                        <div class="card-header bg-info text-white">
+                            <h5 class="mb-0"><i class="fas fa-lightbulb me-2"></i>Lifestyle Recommendations</h5>
+                        </div>
+                        <div class="card-body">
+                            <ul class="list-unstyled">${listItems(recommendations.lifestyle_tips, 'mb-2', '<i class="fas fa-check-circle text-info me-2"></i>')}</ul>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-lg-6 mb-4">
+                    <div class="card shadow">
+                        <div class="card-header bg-secondary text-white">
+                            <h5 class="mb-0"><i class="fas fa-clock me-2"></i>Improvement Timeline</h5>
+                        </div>
+                        <div class="card-body">${timeline}</div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="row">
+                <div class="col-12">
+                    <div class="card shadow">
+                        <div class="card-header bg-dark text-white">
+                            <h5 class="mb-0"><i class="fas fa-target me-2"></i>Your Body Transformation Strategy</h5>
+                        </div>
+                        <div class="card-body"><p class="lead">${escapeHtml(recommendations.overall_strategy)}</p></div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="row mt-5">
+                <div class="col-12 text-center">
+                    <a href="/upload" class="btn btn-primary btn-lg me-3">
+                        <i class="fas fa-upload me-2"></i>Analyze Another Report
+                    </a>
+                    <button class="btn btn-outline-primary btn-lg" onclick="window.print()">
+                        <i class="fas fa-print me-2"></i>Print Results
+                    </button>
+                </div>
+            </div>
+        </div>`;
+
+    document.title = 'InBody Analysis Results - BodyTune AI';
+    window.scrollTo(0, 0);
+    fixTextVisibility();
+    animateProgressBars();
+}
+
 // Initialize smooth scrolling for anchor links
 function initializeSmoothScrolling() {
     document.querySelectorAll('a[href^="#"]').forEach(anchor => {
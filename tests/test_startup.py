@@ -0,0 +1,51 @@
+"""Import-time budget of app.py
+
+Every measurement imports ``app`` in a fresh interpreter from the project
+root, without the opt-in preload.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_BUDGET_MS = 800
+RUNS = 3
+
+# Heavy optional modules ``import app`` must leave to first use
+DEFERRED_MODULES = ('numpy', 'PyPDF2', 'PIL', 'pytesseract', 'pandas')
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': sorted({name.split('.')[0] for name in sys.modules} & set(%r))}))
+""" % (DEFERRED_MODULES,)
+
+
+@pytest.fixture(scope='module')
+def cold_imports():
+    env = {key: value for key, value in os.environ.items() if key != 'BODYTUNE_PRELOAD'}
+    results = []
+    for _ in range(RUNS):
+        completed = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], capture_output=True, text=True,
+                                   cwd=PROJECT_ROOT, env=env, check=True)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def test_import_app_within_budget(cold_imports):
+    median_ms = statistics.median(result['seconds'] for result in cold_imports) * 1000
+    assert median_ms <= IMPORT_BUDGET_MS, f"import app took {median_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)"
+
+
+def test_import_app_defers_heavy_modules(cold_imports):
+    for result in cold_imports:
+        assert result['loaded'] == [], f"import app loaded {', '.join(result['loaded'])}"
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+class AnalysisCache:
+    """In-memory LRU cache with a TTL for analysis and recommendation results.
+
+    Keys are built from a canonical form of ``health_data`` and the
+    ``user_info`` fields the analyzer and recommendation engine read, so an
+    identical resubmission (browser back, double submit, a reverted tweak)
+    is served without recomputing anything. Cached results are shared between
+    requests and must be treated as read-only.
+    """
+
+    # user_info fields that influence the analysis or the recommendations
+    USER_FIELDS = ('gender', 'age', 'weight', 'height', 'activity_level')
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def make_key(cls, health_data: Dict[str, Any], user_info: Dict[str, Any],
+                 locale: Optional[str] = None) -> str:
+        """Build the cache key for an analysis request"""
+        user_fields = []
+        for field in cls.USER_FIELDS:
+            value = user_info.get(field)
+            # Both stages lowercase the gender before using it
+            if field == 'gender' and isinstance(value, str):
+                value = value.lower()
+            user_fields.append(value)
+
+        # Parameter order is kept: it decides the order of the analysis and of
+        # equally ranked priorities. JSON keeps 85 and 85.0 apart, as the output does.
+        canonical = json.dumps([list(health_data.items()), user_fields, locale],
+                               separators=(',', ':'), default=str)
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss or after it expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value and evict the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.expired = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current cache size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl
+            }
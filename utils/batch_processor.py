@@ -0,0 +1,163 @@
+import os
+import threading
+import zipfile
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from werkzeug.utils import secure_filename
+
+
+# Per-process parser and analyzer, created by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(cache_path: Optional[str], cache_max_entries: int) -> None:
+    """Build the parser and analyzer once per worker process"""
+    from models.health_analyzer import HealthAnalyzer
+    from utils.report_parser import ReportParser
+    from utils.parse_cache import ParseCache
+
+    cache = ParseCache(cache_path, max_entries=cache_max_entries) if cache_path else None
+    _worker_state['parser'] = ReportParser(cache=cache)
+    _worker_state['analyzer'] = HealthAnalyzer()
+
+
+def _process_member(member: str, file_path: str, user_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse and analyze one member's report (executed inside a worker process)"""
+    try:
+        health_data = _worker_state['parser'].parse_report(file_path)
+        analysis = _worker_state['analyzer'].analyze_parameters(health_data, user_info)
+        # Results go back to the parent process and out as JSON, so send plain dicts
+        analysis['parameter_analysis'] = {
+            parameter: data.to_dict() if hasattr(data, 'to_dict') else data
+            for parameter, data in analysis['parameter_analysis'].items()
+        }
+        return {
+            'member': member,
+            'status': 'ok',
+            'health_data': health_data,
+            'analysis': analysis
+        }
+    except Exception as e:
+        return {'member': member, 'status': 'error', 'error': str(e) or type(e).__name__}
+
+
+class BatchProcessor:
+    """Parses and analyzes many reports in parallel across CPU cores.
+
+    Each worker process runs its own ``ReportParser`` (with inline OCR) and
+    ``HealthAnalyzer``, so throughput scales with the number of cores.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_path: Optional[str] = None,
+                 cache_max_entries: int = 2000,
+                 allowed_extensions: Tuple[str, ...] = ('pdf', 'png', 'jpg', 'jpeg', 'gif'),
+                 max_files: int = 200, max_archive_size: int = 256 * 1024 * 1024):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.cache_max_entries = cache_max_entries
+        self.allowed_extensions = allowed_extensions
+        self.max_files = max_files
+        self.max_archive_size = max_archive_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.cache_path, self.cache_max_entries)
+                )
+            return self._executor
+
+    def _is_allowed(self, filename: str) -> bool:
+        """Check the extension of a report file"""
+        return '.' in filename and filename.rsplit('.', 1)[1].lower() in self.allowed_extensions
+
+    def extract_archive(self, archive_path: str, target_dir: str) -> List[Tuple[str, str]]:
+        """Unpack the report files of a zip archive; returns (member, path) pairs"""
+        reports = []
+        with zipfile.ZipFile(archive_path) as archive:
+            entries = [info for info in archive.infolist()
+                       if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+                       and self._is_allowed(info.filename)]
+
+            if len(entries) > self.max_files:
+                raise ValueError(f"Archive contains more than {self.max_files} reports")
+            if sum(info.file_size for info in entries) > self.max_archive_size:
+                raise ValueError("Archive is too large to process")
+
+            for index, info in enumerate(entries):
+                # Flatten paths and prefix with the index so names cannot collide or escape
+                filename = secure_filename(Path(info.filename).name)
+                if not filename:
+                    continue
+                file_path = os.path.join(target_dir, f"{index:04d}_{filename}")
+                with archive.open(info) as source, open(file_path, 'wb') as target:
+                    while True:
+                        chunk = source.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+                reports.append((Path(filename).stem, file_path))
+        return reports
+
+    def process(self, reports: List[Tuple[str, str]], user_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse and analyze reports in parallel; returns a summary table and per-member results"""
+        if len(reports) > self.max_files:
+            raise ValueError(f"A batch can contain at most {self.max_files} reports")
+
+        executor = self._get_executor()
+        futures = [executor.submit(_process_member, member, file_path, user_info)
+                   for member, file_path in reports]
+        results = []
+        pool_broken = False
+        for (member, _), future in zip(reports, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                pool_broken = True
+                results.append({'member': member, 'status': 'error',
+                                'error': 'Worker process stopped unexpectedly'})
+        if pool_broken:
+            # Start a fresh pool for the next batch
+            self.shutdown()
+
+        summary = []
+        for result in results:
+            row = {'member': result['member'], 'status': result['status']}
+            if result['status'] == 'ok':
+                analysis = result['analysis']
+                parameter_analysis = analysis['parameter_analysis']
+                row.update({
+                    'overall_score': round(analysis['overall_score'], 1),
+                    'risk_level': analysis['risk_level'],
+                    'parameters_found': len(parameter_analysis),
+                    'parameters_out_of_range': sum(
+                        1 for data in parameter_analysis.values()
+                        if isinstance(data, Mapping) and data.get('status') in ('low', 'high')
+                    )
+                })
+            else:
+                row['error'] = result['error']
+            summary.append(row)
+
+        return {
+            'total': len(results),
+            'processed': sum(1 for result in results if result['status'] == 'ok'),
+            'failed': sum(1 for result in results if result['status'] != 'ok'),
+            'summary': summary,
+            'results': results
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -45,6 +45,9 @@ class HealthReport(db.Model):
     report_file_path = db.Column(db.String(200), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # History and trend queries read one user's reports in date order
+    __table_args__ = (db.Index('ix_health_report_user_created', 'user_id', 'created_at'),)
+    
     def __repr__(self):
         return f'<HealthReport {self.id} - Score: {self.overall_score}>'
 
@@ -89,19 +92,34 @@ def create_sample_user():
     
     return sample_user
 
-def save_health_report(user_id: int, health_data: dict, analysis_results: dict) -> HealthReport:
+# Callables run after a health report is committed, as
+# listener(health_report, health_data, user_info)
+REPORT_SAVED_LISTENERS = []
+
+def on_report_saved(listener):
+    """Register a callable to run after every saved health report"""
+    REPORT_SAVED_LISTENERS.append(listener)
+    return listener
+
+def _reading(health_data: dict, parameter: str):
+    """A parameter's value, or None when it was not measured (blank manual fields arrive as 0)"""
+    value = health_data.get(parameter)
+    return value if isinstance(value, (int, float)) and value > 0 else None
+
+def save_health_report(user_id: int, health_data: dict, analysis_results: dict,
+                       user_info: dict = None) -> HealthReport:
     """Save health report to database"""
     
     health_report = HealthReport(
         user_id=user_id,
-        glucose=health_data.get('glucose'),
-        cholesterol_total=health_data.get('cholesterol_total'),
-        cholesterol_hdl=health_data.get('cholesterol_hdl'),
-        cholesterol_ldl=health_data.get('cholesterol_ldl'),
-        blood_pressure_systolic=health_data.get('blood_pressure_systolic'),
-        blood_pressure_diastolic=health_data.get('blood_pressure_diastolic'),
-        bmi=health_data.get('bmi'),
-        body_fat_percentage=health_data.get('body_fat_percentage'),
+        glucose=_reading(health_data, 'glucose'),
+        cholesterol_total=_reading(health_data, 'cholesterol_total'),
+        cholesterol_hdl=_reading(health_data, 'cholesterol_hdl'),
+        cholesterol_ldl=_reading(health_data, 'cholesterol_ldl'),
+        blood_pressure_systolic=_reading(health_data, 'blood_pressure_systolic'),
+        blood_pressure_diastolic=_reading(health_data, 'blood_pressure_diastolic'),
+        bmi=_reading(health_data, 'bmi'),
+        body_fat_percentage=_reading(health_data, 'body_fat_percentage'),
         overall_score=analysis_results.get('overall_score'),
         risk_level=analysis_results.get('risk_level')
     )
@@ -109,6 +127,14 @@ def save_health_report(user_id: int, health_data: dict, analysis_results: dict)
     db.session.add(health_report)
     db.session.commit()
     
+    if REPORT_SAVED_LISTENERS:
+        if user_info is None:
+            # Fall back to the stored profile for the cohort fields
+            user = db.session.get(User, user_id) if user_id is not None else None
+            user_info = {'gender': user.gender, 'age': user.age} if user else {}
+        for listener in REPORT_SAVED_LISTENERS:
+            listener(health_report, health_data, user_info)
+    
     return health_report
 
 def get_user_history(user_id: int) -> list:
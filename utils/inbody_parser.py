@@ -1,6 +1,6 @@
-import re
 from typing import Dict, Any
 from utils.report_parser import ReportParser
+from utils.pattern_registry import pattern_registry
 
 
 class InBodyReportParser(ReportParser):
@@ -8,75 +8,7 @@ class InBodyReportParser(ReportParser):
     
     def __init__(self):
         super().__init__()
-        self.inbody_patterns = self._initialize_inbody_patterns()
-    
-    def _initialize_inbody_patterns(self) -> Dict[str, list]:
-        """Initialize specific patterns for InBody reports"""
-        return {
-            'height': [
-                r'height[:\s]*(\d+\.?\d*)\s*cm',
-                r'(\d+\.?\d*)\s*cm',
-            ],
-            'age': [
-                r'age[:\s]*(\d+)',
-                r'(\d+)\s*years?'
-            ],
-            'gender': [
-                r'gender[:\s]*(male|female|m|f)',
-                r'(male|female|m|f)'
-            ],
-            'weight': [
-                r'weight[:\s]*(\d+\.?\d*)\s*kg',
-                r'(\d+\.?\d*)\s*kg'
-            ],
-            'body_fat_percentage': [
-                r'body\s*fat\s*mass[:\s]*(\d+\.?\d*)',
-                r'BFM[:\s]*(\d+\.?\d*)',
-                r'(\d+\.?\d*)\s*%.*fat'
-            ],
-            'muscle_mass': [
-                r'skeletal\s*muscle\s*mass[:\s]*(\d+\.?\d*)',
-                r'SMM[:\s]*(\d+\.?\d*)',
-                r'muscle[:\s]*(\d+\.?\d*)\s*kg'
-            ],
-            'protein': [
-                r'protein[:\s]*(\d+\.?\d*)\s*kg',
-                r'(\d+\.?\d*)\s*kg.*protein'
-            ],
-            'minerals': [
-                r'minerals[:\s]*(\d+\.?\d*)\s*kg',
-                r'(\d+\.?\d*)\s*kg.*mineral'
-            ],
-            'total_body_water': [
-                r'total\s*body\s*water[:\s]*(\d+\.?\d*)',
-                r'TBW[:\s]*(\d+\.?\d*)',
-                r'(\d+\.?\d*)\s*L.*water'
-            ],
-            'visceral_fat_level': [
-                r'visceral\s*fat\s*level[:\s]*(\d+)',
-                r'level[:\s]*(\d+)',
-                r'VFL[:\s]*(\d+)'
-            ],
-            'basal_metabolic_rate': [
-                r'basal\s*metabolic\s*rate[:\s]*(\d+)',
-                r'BMR[:\s]*(\d+)',
-                r'(\d+)\s*kcal'
-            ],
-            'waist_hip_ratio': [
-                r'waist[:\-\s]*hip\s*ratio[:\s]*(\d+\.?\d*)',
-                r'WHR[:\s]*(\d+\.?\d*)',
-                r'(\d+\.?\d*)\s*ratio'
-            ],
-            'inbody_score': [
-                r'inbody\s*score[:\s]*(\d+)',
-                r'score[:\s]*(\d+)',
-                r'(\d+)\s*/\s*100'
-            ],
-            'bmi': [
-                r'BMI[:\s]*(\d+\.?\d*)',
-                r'body\s*mass\s*index[:\s]*(\d+\.?\d*)'
-            ]
-        }
+        self.inbody_patterns = pattern_registry.get('inbody').parameter_patterns
     
     def parse_inbody_report_from_image_data(self) -> Dict[str, float]:
         """Parse InBody report data from the provided image data"""
@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+
+from utils.json_response import dumps
+
+
+class JobManager:
+    """Runs report processing jobs in a background executor and tracks their status.
+
+    Job state is kept in a small SQLite database rather than in process memory,
+    so any worker process can answer a status poll for a job started by another
+    one. Finished jobs are removed after ``ttl`` seconds.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+
+    def __init__(self, path: str, max_workers: int = 4, ttl: int = 3600):
+        self.path = path
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection (SQLite connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                ' id TEXT PRIMARY KEY,'
+                ' status TEXT NOT NULL,'
+                ' result TEXT,'
+                ' error TEXT,'
+                ' created_at REAL NOT NULL,'
+                ' updated_at REAL NOT NULL)'
+            )
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the executor on first use (and again after a fork)"""
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='bodytune-job')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _update(self, job_id: str, **fields) -> None:
+        """Update columns of a job row"""
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f'{column} = ?' for column in fields)
+        with self._lock:
+            self._connect().execute(
+                f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id)
+            )
+
+    def submit(self, func: Callable[..., Dict[str, Any]], *args) -> str:
+        """Queue a job and return its id; ``func`` must return a JSON-serializable dict"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute('DELETE FROM jobs WHERE updated_at < ?', (now - self.ttl,))
+            connection.execute(
+                'INSERT INTO jobs (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)',
+                (job_id, self.QUEUED, now, now)
+            )
+            executor = self._get_executor()
+
+        executor.submit(self._run, job_id, func, args)
+        return job_id
+
+    def _run(self, job_id: str, func: Callable[..., Dict[str, Any]], args: tuple) -> None:
+        """Execute a job and record its result or error"""
+        self._update(job_id, status=self.RUNNING)
+        try:
+            result = func(*args)
+            self._update(job_id, status=self.FINISHED, result=dumps(result).decode('utf-8'))
+        except Exception as e:
+            self._update(job_id, status=self.FAILED, error=str(e) or type(e).__name__)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the status of a job (and its result once finished), or None if unknown"""
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT status, result, error, created_at, updated_at FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        status, result, error, created_at, updated_at = row
+        return {
+            'job_id': job_id,
+            'status': status,
+            'result': json.loads(result) if result is not None else None,
+            'error': error,
+            'created_at': created_at,
+            'updated_at': updated_at
+        }
@@ -0,0 +1,49 @@
+import hashlib
+import json
+from typing import Any
+
+from flask import Response, current_app, request
+
+from utils.startup import lazy_import, module_available
+
+
+ORJSON_AVAILABLE = module_available('orjson')
+orjson = lazy_import('orjson')
+
+
+def _json_default(value: Any) -> Any:
+    """Encode result objects that are not plain dicts (e.g. ParameterResult)"""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON, with orjson when it is installed.
+
+    Result objects that are not plain dicts (e.g. ParameterResult) are
+    encoded through their ``to_dict()``; frozen dicts and tuples encode as
+    objects and arrays.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_json_default, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """JSON response with a strong ETag of its body.
+
+    The endpoints that use it are POSTs, which HTTP caches do not revalidate,
+    so the client sends ``If-None-Match`` itself; a matching successful
+    response is answered with an empty 304.
+    """
+    body = dumps(payload)
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    if status == 200 and request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body, status=status, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,93 @@
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+
+class OCRServiceError(Exception):
+    """Base class for OCR service errors"""
+
+
+class OCRBusyError(OCRServiceError):
+    """Raised when every OCR worker is busy and the queue is full"""
+
+
+class OCRTimeoutError(OCRServiceError):
+    """Raised when an OCR job does not finish within its timeout"""
+
+
+def _image_to_string(image_source: Union[str, bytes], timeout: float) -> str:
+    """Run tesseract on an image file path or image bytes (executed inside a worker process)"""
+    import pytesseract
+    from PIL import Image
+
+    if isinstance(image_source, bytes):
+        image_source = io.BytesIO(image_source)
+
+    try:
+        with Image.open(image_source) as image:
+            return pytesseract.image_to_string(image, timeout=timeout)
+    except RuntimeError as e:
+        # pytesseract kills tesseract and raises RuntimeError when the timeout expires
+        if 'timeout' in str(e).lower():
+            raise TimeoutError(str(e))
+        raise
+    except Exception as e:
+        # Some library exceptions cannot be pickled back to the parent process
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+class OCRService:
+    """Runs OCR jobs in a dedicated process pool with a bounded queue and per-job timeouts.
+
+    At most ``max_workers`` jobs run at once and ``max_queue`` more may wait for a
+    worker. Further submissions are rejected with ``OCRBusyError`` instead of
+    piling up, so a burst of image uploads cannot hold every request worker.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 4, timeout: float = 30.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def image_to_string(self, image_source: Union[str, bytes]) -> str:
+        """OCR an image (file path or bytes) in the worker pool and wait for the text"""
+        if not self._slots.acquire(blocking=False):
+            raise OCRBusyError("OCR queue is full")
+
+        try:
+            future = self._get_executor().submit(_image_to_string, image_source, self.timeout)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        # Queued jobs wait for a worker, so allow for the time spent in the queue
+        queue_wait = self.timeout * (self.max_queue // self.max_workers + 1)
+        try:
+            return future.result(timeout=self.timeout + queue_wait)
+        except (FutureTimeoutError, TimeoutError):
+            future.cancel()
+            raise OCRTimeoutError(f"OCR did not finish within {self.timeout:.0f} seconds")
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for the next job
+            self.shutdown()
+            raise
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
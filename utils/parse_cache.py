@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, Union, BinaryIO
+
+
+class ParseCache:
+    """Persistent cache of extracted report parameters, keyed by file content.
+
+    Entries are stored in a small SQLite database so they survive restarts and
+    are shared between worker processes. The key is a hash of the uploaded file
+    bytes plus the parser version, so changing the extraction patterns never
+    serves stale values. The least recently used entries are evicted once the
+    cache holds more than ``max_entries`` reports.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection (SQLite connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS parse_cache ('
+                ' key TEXT PRIMARY KEY,'
+                ' data TEXT NOT NULL,'
+                ' last_used REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)'
+            )
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def make_key(content: Union[bytes, BinaryIO], parser_version: str) -> str:
+        """Build the cache key for file content (bytes or a seekable stream) and a parser version"""
+        if isinstance(content, (bytes, bytearray)):
+            digest = hashlib.sha256(content).hexdigest()
+        else:
+            # Hash the stream in chunks and rewind it for the parser
+            position = content.tell()
+            hasher = hashlib.sha256()
+            for chunk in iter(lambda: content.read(1024 * 1024), b''):
+                hasher.update(chunk)
+            content.seek(position)
+            digest = hasher.hexdigest()
+        return f"{parser_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """Return the cached parameters for a key, or None on a miss"""
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                'SELECT data FROM parse_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            connection.execute(
+                'UPDATE parse_cache SET last_used = ? WHERE key = ?', (time.time(), key)
+            )
+            return json.loads(row[0])
+
+    def set(self, key: str, data: Dict[str, float]) -> None:
+        """Store extracted parameters and evict the least recently used entries"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO parse_cache (key, data, last_used) VALUES (?, ?, ?)',
+                (key, json.dumps(data), time.time())
+            )
+            connection.execute(
+                'DELETE FROM parse_cache WHERE key IN ('
+                ' SELECT key FROM parse_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset the counters"""
+        with self._lock:
+            self._connect().execute('DELETE FROM parse_cache')
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this process and the current cache size"""
+        with self._lock:
+            entries = self._connect().execute('SELECT COUNT(*) FROM parse_cache').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries
+        }
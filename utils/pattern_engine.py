@@ -0,0 +1,227 @@
+import re
+from typing import Dict, List, Tuple, Optional
+
+
+# Characters that end the literal prefix of a pattern
+_REGEX_METACHARACTERS = set('.^$*+?{}[]\\|()')
+
+# Lowercase characters other than ASCII letters that ``re.IGNORECASE`` folds
+# onto an ASCII letter. They are mapped onto that letter before the keyword
+# scan so that it finds exactly the positions the full patterns can match at.
+_CASE_FOLD_EXTRAS = str.maketrans({'ı': 'i', 'ſ': 's'})
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the leading literal text every match of the pattern starts with"""
+    prefix = ''
+    for char in pattern:
+        if char in _REGEX_METACHARACTERS:
+            break
+        prefix += char
+
+    # A quantifier applies to the last literal character, so it is optional
+    rest = pattern[len(prefix):]
+    if prefix and rest[:1] in ('*', '?', '{'):
+        prefix = prefix[:-1]
+
+    return prefix.lower()
+
+
+class MultiPatternExtractor:
+    """Extracts parameter values from text in a single pass over a priority-ordered pattern table.
+
+    Every pattern is keyed on its leading literal text (``glucose``, ``hdl``,
+    ``blood``...). One combined keyword scanner walks the text once and the full
+    patterns are only tried at the positions where one of their keywords occurs.
+    Keywords drop out of the scanner as soon as none of their patterns can still
+    change the result, and the scan stops when no keyword is left.
+
+    The result is identical to running ``re.search(pattern, text, re.IGNORECASE)``
+    for every pattern of a parameter in order and keeping the first one that
+    matches. Like ``ReportParser``, callers pass text that is already lowercased.
+    """
+
+    def __init__(self, parameter_patterns: Dict[str, list]):
+        self.parameters = list(parameter_patterns)
+
+        # (parameter, priority, compiled pattern) in table order
+        self._patterns: List[Tuple[str, int, 're.Pattern']] = []
+        self._parameter_pattern_ids: Dict[str, List[int]] = {}
+        prefixes: List[str] = []
+
+        for parameter, patterns in parameter_patterns.items():
+            for priority, pattern in enumerate(patterns):
+                self._parameter_pattern_ids.setdefault(parameter, []).append(len(self._patterns))
+                self._patterns.append((parameter, priority, re.compile(pattern, re.IGNORECASE)))
+                prefixes.append(_literal_prefix(pattern))
+
+        # A keyword that starts with another keyword is covered by the shorter
+        # one, so at most one keyword can match at any position of the text
+        self._keywords: List[str] = []
+        for prefix in sorted(set(prefixes) - {''}, key=len):
+            if not any(prefix.startswith(keyword) for keyword in self._keywords):
+                self._keywords.append(prefix)
+
+        # Keyword of every pattern (None for patterns without a literal prefix)
+        self._pattern_keywords: List[Optional[str]] = []
+        self._candidates: Dict[str, List[int]] = {keyword: [] for keyword in self._keywords}
+        self._unanchored: List[int] = []
+        for pattern_id, prefix in enumerate(prefixes):
+            keyword = next((k for k in self._keywords if prefix and prefix.startswith(k)), None)
+            self._pattern_keywords.append(keyword)
+            if keyword is None:
+                self._unanchored.append(pattern_id)
+            else:
+                self._candidates[keyword].append(pattern_id)
+
+        # Scanners compiled for the sets of keywords still in play
+        self._scanners: Dict[Tuple[str, ...], Optional['re.Pattern']] = {}
+
+    def _scanner_for(self, keywords: Tuple[str, ...]) -> Optional['re.Pattern']:
+        """Return the combined keyword scanner for a set of keywords"""
+        scanner = self._scanners.get(keywords, False)
+        if scanner is False:
+            scanner = re.compile('|'.join(map(re.escape, keywords))) if keywords else None
+            self._scanners[keywords] = scanner
+        return scanner
+
+    def start(self) -> 'ExtractionState':
+        """Start an incremental extraction that text can be fed into chunk by chunk"""
+        return ExtractionState(self)
+
+    def extract(self, text: str) -> Dict[str, float]:
+        """Extract the value of every parameter found in the text"""
+        state = self.start()
+        state.feed(text)
+        state.close()
+        return state.result()
+
+    @staticmethod
+    def _convert(match: 're.Match') -> Optional[float]:
+        """Convert the first group of a match to float, or None if it has no usable value"""
+        try:
+            return float(match.group(1))
+        except (ValueError, IndexError, TypeError):
+            return None
+
+
+class ExtractionState:
+    """Incremental extraction over text that arrives in chunks (e.g. one PDF page at a time).
+
+    Feeding the chunks of a text gives the same result as extracting from the
+    concatenated text. The last ``CARRY_WINDOW`` characters of each chunk are held
+    back and scanned together with the next chunk, so a match may run across a
+    chunk boundary as long as it is shorter than the window.
+    """
+
+    CARRY_WINDOW = 256
+
+    def __init__(self, extractor: MultiPatternExtractor):
+        self._extractor = extractor
+        # Best (priority, value) found so far for each parameter
+        self._best: Dict[str, Tuple[int, float]] = {}
+        self._retired = set()
+        self._live = {keyword: len(ids) for keyword, ids in extractor._candidates.items()}
+        self._scanner = extractor._scanner_for(tuple(extractor._keywords))
+        self._carry = ''
+        self._closed = False
+
+    @property
+    def complete(self) -> bool:
+        """True once every parameter of the pattern table has a value"""
+        return len(self._best) == len(self._extractor.parameters)
+
+    @property
+    def settled(self) -> bool:
+        """True once no further text can change the result"""
+        return self._scanner is None and all(
+            pattern_id in self._retired for pattern_id in self._extractor._unanchored
+        )
+
+    def feed(self, chunk: str) -> None:
+        """Scan the next chunk of (lowercased) text"""
+        if self._closed:
+            raise ValueError("Cannot feed text into a closed extraction")
+        text = self._carry + chunk
+        limit = len(text) - self.CARRY_WINDOW
+        if limit <= 0:
+            self._carry = text
+            return
+        self._scan(text, limit)
+        self._carry = text[limit:]
+
+    def close(self) -> None:
+        """Scan the text held back at the end of the last chunk"""
+        if not self._closed:
+            self._scan(self._carry, len(self._carry))
+            self._carry = ''
+            self._closed = True
+
+    def result(self) -> Dict[str, float]:
+        """Return the values found so far in parameter order"""
+        best = self._best
+        return {parameter: best[parameter][1] for parameter in self._extractor.parameters if parameter in best}
+
+    def _retire(self, pattern_id: int) -> bool:
+        """Drop a pattern that can no longer change the result; True if its keyword died"""
+        if pattern_id in self._retired:
+            return False
+        self._retired.add(pattern_id)
+        keyword = self._extractor._pattern_keywords[pattern_id]
+        if keyword is None:
+            return False
+        self._live[keyword] -= 1
+        return self._live[keyword] == 0
+
+    def _resolve(self, parameter: str, priority: int, value: float) -> bool:
+        """Record a value; patterns of the same or lower priority are retired"""
+        self._best[parameter] = (priority, value)
+        patterns = self._extractor._patterns
+        keyword_died = False
+        for pattern_id in self._extractor._parameter_pattern_ids[parameter]:
+            if patterns[pattern_id][1] >= priority:
+                keyword_died = self._retire(pattern_id) or keyword_died
+        return keyword_died
+
+    def _try(self, pattern_id: int, match: Optional['re.Match']) -> bool:
+        """Handle the leftmost match of a pattern; True if the live keywords changed"""
+        if not match:
+            return False
+        # Only the leftmost match of a pattern is ever used
+        keywords_changed = self._retire(pattern_id)
+        value = MultiPatternExtractor._convert(match)
+        if value is not None:
+            parameter, priority, _ = self._extractor._patterns[pattern_id]
+            keywords_changed = self._resolve(parameter, priority, value) or keywords_changed
+        return keywords_changed
+
+    def _scan(self, text: str, limit: int) -> None:
+        """Try the patterns at every keyword occurrence that starts before ``limit``"""
+        extractor = self._extractor
+        scan_text = text.translate(_CASE_FOLD_EXTRAS) if ('ı' in text or 'ſ' in text) else text
+        position = 0
+
+        while self._scanner is not None:
+            hit = self._scanner.search(scan_text, position)
+            if hit is None or hit.start() >= limit:
+                break
+            position = hit.start()
+
+            keywords_changed = False
+            for pattern_id in extractor._candidates[hit.group()]:
+                if pattern_id not in self._retired:
+                    match = extractor._patterns[pattern_id][2].match(text, position)
+                    keywords_changed = self._try(pattern_id, match) or keywords_changed
+
+            if keywords_changed:
+                self._scanner = extractor._scanner_for(
+                    tuple(k for k in extractor._keywords if self._live[k])
+                )
+            # Keywords may overlap (e.g. "body" inside "inbody"), so resume right after the hit start
+            position += 1
+
+        for pattern_id in extractor._unanchored:
+            if pattern_id not in self._retired:
+                match = extractor._patterns[pattern_id][2].search(text)
+                if match and match.start() < limit:
+                    self._try(pattern_id, match)
@@ -0,0 +1,228 @@
+# Extraction pattern tables, one per report vendor. Each table maps a parameter
+# to its regex patterns in priority order. Vendor tables only list the labels
+# specific to that vendor's printout; ``utils.pattern_registry`` puts them in
+# front of the generic patterns and compiles each table once per process.
+
+
+# Generic patterns used for any medical or body composition report
+GENERIC_PATTERNS = {
+    # Basic health parameters
+    'glucose': [
+        r'glucose[:\s]*(\d+\.?\d*)',
+        r'blood\s+sugar[:\s]*(\d+\.?\d*)',
+        r'fasting\s+glucose[:\s]*(\d+\.?\d*)',
+        r'random\s+glucose[:\s]*(\d+\.?\d*)'
+    ],
+    'cholesterol_total': [
+        r'total\s+cholesterol[:\s]*(\d+\.?\d*)',
+        r'cholesterol\s+total[:\s]*(\d+\.?\d*)',
+        r'cholesterol[:\s]*(\d+\.?\d*)',
+        r'TC[:\s]*(\d+\.?\d*)'
+    ],
+    'cholesterol_hdl': [
+        r'HDL[:\s]*(\d+\.?\d*)',
+        r'HDL-C[:\s]*(\d+\.?\d*)',
+        r'high\s+density[:\s]*(\d+\.?\d*)'
+    ],
+    'cholesterol_ldl': [
+        r'LDL[:\s]*(\d+\.?\d*)',
+        r'LDL-C[:\s]*(\d+\.?\d*)',
+        r'low\s+density[:\s]*(\d+\.?\d*)'
+    ],
+    'blood_pressure_systolic': [
+        r'BP[:\s]*(\d+)/\d+',
+        r'blood\s+pressure[:\s]*(\d+)/\d+',
+        r'systolic[:\s]*(\d+\.?\d*)'
+    ],
+    'blood_pressure_diastolic': [
+        r'BP[:\s]*\d+/(\d+)',
+        r'blood\s+pressure[:\s]*\d+/\d+',
+        r'diastolic[:\s]*(\d+\.?\d*)'
+    ],
+    'bmi': [
+        r'BMI[:\s]*(\d+\.?\d*)',
+        r'body\s+mass\s+index[:\s]*(\d+\.?\d*)'
+    ],
+    # InBody specific parameters
+    'weight': [
+        r'weight[:\s]*(\d+\.?\d*)',
+        r'body\s+weight[:\s]*(\d+\.?\d*)'
+    ],
+    'body_fat_percentage': [
+        r'body\s+fat[:\s]*(\d+\.?\d*)%?',
+        r'fat\s+percentage[:\s]*(\d+\.?\d*)%?',
+        r'body\s+fat\s+%[:\s]*(\d+\.?\d*)',
+        r'BFM[:\s]*(\d+\.?\d*)'
+    ],
+    'muscle_mass': [
+        r'muscle\s+mass[:\s]*(\d+\.?\d*)',
+        r'skeletal\s+muscle[:\s]*(\d+\.?\d*)',
+        r'SMM[:\s]*(\d+\.?\d*)'
+    ],
+    'protein': [
+        r'protein[:\s]*(\d+\.?\d*)',
+        r'total\s+protein[:\s]*(\d+\.?\d*)'
+    ],
+    'minerals': [
+        r'minerals[:\s]*(\d+\.?\d*)',
+        r'bone\s+mineral[:\s]*(\d+\.?\d*)'
+    ],
+    'total_body_water': [
+        r'total\s+body\s+water[:\s]*(\d+\.?\d*)',
+        r'TBW[:\s]*(\d+\.?\d*)',
+        r'body\s+water[:\s]*(\d+\.?\d*)'
+    ],
+    'visceral_fat_level': [
+        r'visceral\s+fat[:\s]*(\d+\.?\d*)',
+        r'visceral\s+fat\s+level[:\s]*(\d+\.?\d*)',
+        r'VFL[:\s]*(\d+\.?\d*)'
+    ],
+    'basal_metabolic_rate': [
+        r'basal\s+metabolic\s+rate[:\s]*(\d+\.?\d*)',
+        r'BMR[:\s]*(\d+\.?\d*)',
+        r'metabolic\s+rate[:\s]*(\d+\.?\d*)'
+    ],
+    'waist_hip_ratio': [
+        r'waist[:\-\s]*hip\s+ratio[:\s]*(\d+\.?\d*)',
+        r'WHR[:\s]*(\d+\.?\d*)'
+    ],
+    'inbody_score': [
+        r'inbody\s+score[:\s]*(\d+\.?\d*)',
+        r'score[:\s]*(\d+\.?\d*)'
+    ]
+}
+
+# Loose patterns for InBody result sheets, used by ``InBodyReportParser``
+INBODY_PATTERNS = {
+    'height': [
+        r'height[:\s]*(\d+\.?\d*)\s*cm',
+        r'(\d+\.?\d*)\s*cm',
+    ],
+    'age': [
+        r'age[:\s]*(\d+)',
+        r'(\d+)\s*years?'
+    ],
+    'gender': [
+        r'gender[:\s]*(male|female|m|f)',
+        r'(male|female|m|f)'
+    ],
+    'weight': [
+        r'weight[:\s]*(\d+\.?\d*)\s*kg',
+        r'(\d+\.?\d*)\s*kg'
+    ],
+    'body_fat_percentage': [
+        r'body\s*fat\s*mass[:\s]*(\d+\.?\d*)',
+        r'BFM[:\s]*(\d+\.?\d*)',
+        r'(\d+\.?\d*)\s*%.*fat'
+    ],
+    'muscle_mass': [
+        r'skeletal\s*muscle\s*mass[:\s]*(\d+\.?\d*)',
+        r'SMM[:\s]*(\d+\.?\d*)',
+        r'muscle[:\s]*(\d+\.?\d*)\s*kg'
+    ],
+    'protein': [
+        r'protein[:\s]*(\d+\.?\d*)\s*kg',
+        r'(\d+\.?\d*)\s*kg.*protein'
+    ],
+    'minerals': [
+        r'minerals[:\s]*(\d+\.?\d*)\s*kg',
+        r'(\d+\.?\d*)\s*kg.*mineral'
+    ],
+    'total_body_water': [
+        r'total\s*body\s*water[:\s]*(\d+\.?\d*)',
+        r'TBW[:\s]*(\d+\.?\d*)',
+        r'(\d+\.?\d*)\s*L.*water'
+    ],
+    'visceral_fat_level': [
+        r'visceral\s*fat\s*level[:\s]*(\d+)',
+        r'level[:\s]*(\d+)',
+        r'VFL[:\s]*(\d+)'
+    ],
+    'basal_metabolic_rate': [
+        r'basal\s*metabolic\s*rate[:\s]*(\d+)',
+        r'BMR[:\s]*(\d+)',
+        r'(\d+)\s*kcal'
+    ],
+    'waist_hip_ratio': [
+        r'waist[:\-\s]*hip\s*ratio[:\s]*(\d+\.?\d*)',
+        r'WHR[:\s]*(\d+\.?\d*)',
+        r'(\d+\.?\d*)\s*ratio'
+    ],
+    'inbody_score': [
+        r'inbody\s*score[:\s]*(\d+)',
+        r'score[:\s]*(\d+)',
+        r'(\d+)\s*/\s*100'
+    ],
+    'bmi': [
+        r'BMI[:\s]*(\d+\.?\d*)',
+        r'body\s*mass\s*index[:\s]*(\d+\.?\d*)'
+    ]
+}
+
+# InBody 270: single-page result sheet with the core body composition values
+INBODY_270_PATTERNS = {
+    'weight': [
+        r'weight\s*\(kg\)[:\s]*(\d+\.?\d*)'
+    ],
+    'muscle_mass': [
+        r'skeletal\s+muscle\s+mass[:\s]*(\d+\.?\d*)'
+    ],
+    'body_fat_percentage': [
+        r'percent\s+body\s+fat[:\s]*(\d+\.?\d*)',
+        r'PBF[:\s]*(\d+\.?\d*)'
+    ],
+    'bmi': [
+        r'body\s+mass\s+index\s*\(kg/m2\)[:\s]*(\d+\.?\d*)'
+    ],
+    'basal_metabolic_rate': [
+        r'basal\s+metabolic\s+rate\s*\(kcal\)[:\s]*(\d+)'
+    ],
+    'visceral_fat_level': [
+        r'visceral\s+fat\s+level[:\s]*(\d+)'
+    ],
+    'inbody_score': [
+        r'inbody\s+score[:\s]*(\d+)'
+    ]
+}
+
+# InBody 570: adds the body composition analysis block (water, protein, minerals)
+INBODY_570_PATTERNS = {
+    **INBODY_270_PATTERNS,
+    'total_body_water': [
+        r'total\s+body\s+water\s*\(l\)[:\s]*(\d+\.?\d*)'
+    ],
+    'protein': [
+        r'protein\s*\(kg\)[:\s]*(\d+\.?\d*)'
+    ],
+    'minerals': [
+        r'minerals?\s*\(kg\)[:\s]*(\d+\.?\d*)'
+    ]
+}
+
+# InBody 770: adds the research parameters block with the waist-hip ratio
+INBODY_770_PATTERNS = {
+    **INBODY_570_PATTERNS,
+    'waist_hip_ratio': [
+        r'waist[\-\s]*hip\s+ratio[:\s]*(\d+\.?\d*)'
+    ]
+}
+
+# Laboratory panels (lipid panel, basic/comprehensive metabolic panel)
+LAB_PANEL_PATTERNS = {
+    'glucose': [
+        r'glucose,?\s+fasting[:\s]*(\d+\.?\d*)',
+        r'glucose,?\s+serum[:\s]*(\d+\.?\d*)'
+    ],
+    'cholesterol_total': [
+        r'cholesterol,\s*total[:\s]*(\d+\.?\d*)',
+        r'total\s+cholesterol[:\s]*(\d+\.?\d*)'
+    ],
+    'cholesterol_hdl': [
+        r'hdl\s+cholesterol[:\s]*(\d+\.?\d*)',
+        r'cholesterol,\s*hdl[:\s]*(\d+\.?\d*)'
+    ],
+    'cholesterol_ldl': [
+        r'ldl\s+cholesterol(?:\s+calc)?[:\s]*(\d+\.?\d*)',
+        r'cholesterol,\s*ldl(?:\s+calc)?[:\s]*(\d+\.?\d*)'
+    ]
+}
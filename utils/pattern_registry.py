@@ -0,0 +1,126 @@
+import hashlib
+import importlib
+import json
+import re
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from utils.pattern_engine import MultiPatternExtractor
+
+
+class PatternSet:
+    """An immutable, pre-compiled table of extraction patterns"""
+
+    __slots__ = ('name', 'parameter_patterns', 'extractor', 'fingerprint')
+
+    def __init__(self, name: str, parameter_patterns: Mapping[str, list]):
+        self.name = name
+        self.parameter_patterns: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {parameter: tuple(patterns) for parameter, patterns in parameter_patterns.items()}
+        )
+        self.extractor = MultiPatternExtractor(self.parameter_patterns)
+        self.fingerprint = hashlib.sha256(
+            json.dumps(self.parameter_patterns.copy()).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def __repr__(self) -> str:
+        return f"PatternSet({self.name!r}, {len(self.parameter_patterns)} parameters)"
+
+
+def merge_patterns(vendor: Mapping[str, list], generic: Mapping[str, list]) -> Dict[str, List[str]]:
+    """Put vendor-specific patterns in front of the generic patterns of each parameter"""
+    merged = {parameter: list(vendor.get(parameter, ())) + list(patterns)
+              for parameter, patterns in generic.items()}
+    for parameter, patterns in vendor.items():
+        merged.setdefault(parameter, list(patterns))
+    return merged
+
+
+class PatternRegistry:
+    """Process-wide registry of pattern sets, each built on first use.
+
+    Packs are registered with a loader returning their pattern table, so a
+    vendor's table is only compiled once a report from that vendor shows up.
+    A pack registered with a ``detect`` regex is chosen for reports whose
+    first page (or OCR text) matches it; other reports use the default pack.
+    """
+
+    def __init__(self, default: str = 'generic'):
+        self.default = default
+        self._loaders: Dict[str, Tuple[Callable[[], Mapping[str, list]], str]] = {}
+        self._detectors: List[Tuple[str, 're.Pattern']] = []
+        self._sets: Dict[str, PatternSet] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Mapping[str, list]],
+                 detect: Optional[str] = None, version: str = '1') -> None:
+        """Register a pack; bump ``version`` when its patterns change"""
+        with self._lock:
+            self._loaders[name] = (loader, version)
+            self._sets.pop(name, None)
+            self._detectors = [(pack, regex) for pack, regex in self._detectors if pack != name]
+            if detect is not None:
+                self._detectors.append((name, re.compile(detect, re.IGNORECASE)))
+
+    def get(self, name: Optional[str] = None) -> PatternSet:
+        """Return a pack's pattern set, loading and compiling it the first time"""
+        name = name or self.default
+        pattern_set = self._sets.get(name)
+        if pattern_set is None:
+            with self._lock:
+                pattern_set = self._sets.get(name)
+                if pattern_set is None:
+                    if name not in self._loaders:
+                        raise KeyError(f"Unknown pattern pack: {name}")
+                    loader, _ = self._loaders[name]
+                    pattern_set = PatternSet(name, loader())
+                    self._sets[name] = pattern_set
+        return pattern_set
+
+    def detect(self, text: str) -> str:
+        """Return the name of the pack for a report whose (lowercased) text starts with ``text``"""
+        for name, regex in self._detectors:
+            if regex.search(text):
+                return name
+        return self.default
+
+    def for_text(self, text: str) -> PatternSet:
+        """Return the pattern set for a report"""
+        return self.get(self.detect(text))
+
+    def names(self) -> List[str]:
+        """Names of every registered pack"""
+        return list(self._loaders)
+
+    def loaded(self) -> List[str]:
+        """Names of the packs compiled in this process so far"""
+        return list(self._sets)
+
+    def fingerprint(self) -> str:
+        """Identify the registered packs, their versions and detection rules"""
+        with self._lock:
+            registered = {
+                'packs': sorted((name, version) for name, (_, version) in self._loaders.items()),
+                'detectors': [(name, regex.pattern) for name, regex in self._detectors],
+                'default': self.default
+            }
+        return hashlib.sha256(json.dumps(registered).encode('utf-8')).hexdigest()[:16]
+
+
+def _pack_loader(table: str, vendor: bool = True) -> Callable[[], Dict[str, List[str]]]:
+    """Loader that imports a table from ``utils.pattern_packs`` when it is first needed"""
+    def load() -> Dict[str, List[str]]:
+        packs = importlib.import_module('utils.pattern_packs')
+        patterns = getattr(packs, table)
+        return merge_patterns(patterns, packs.GENERIC_PATTERNS) if vendor else patterns
+    return load
+
+
+pattern_registry = PatternRegistry()
+pattern_registry.register('generic', _pack_loader('GENERIC_PATTERNS', vendor=False))
+pattern_registry.register('inbody', _pack_loader('INBODY_PATTERNS', vendor=False))
+pattern_registry.register('inbody_270', _pack_loader('INBODY_270_PATTERNS'), detect=r'inbody\s*270')
+pattern_registry.register('inbody_570', _pack_loader('INBODY_570_PATTERNS'), detect=r'inbody\s*570')
+pattern_registry.register('inbody_770', _pack_loader('INBODY_770_PATTERNS'), detect=r'inbody\s*770')
+pattern_registry.register('lab_panel', _pack_loader('LAB_PANEL_PATTERNS'),
+                          detect=r'(lipid|metabolic)\s+panel')
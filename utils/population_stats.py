@@ -0,0 +1,243 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, Any, Optional, Tuple
+
+
+# Value range covered by the sketch of each parameter; values outside it are
+# counted in the first or last bin
+PARAMETER_BOUNDS: Dict[str, Tuple[float, float]] = {
+    'glucose': (40, 400),
+    'cholesterol_total': (80, 400),
+    'cholesterol_hdl': (10, 120),
+    'cholesterol_ldl': (20, 300),
+    'blood_pressure_systolic': (70, 220),
+    'blood_pressure_diastolic': (40, 140),
+    'bmi': (10, 60),
+    'body_fat_percentage': (2, 60),
+    'weight': (30, 200),
+    'muscle_mass': (10, 70),
+    'protein': (2, 20),
+    'minerals': (1, 6),
+    'total_body_water': (10, 70),
+    'visceral_fat_level': (1, 30),
+    'basal_metabolic_rate': (800, 3000),
+    'waist_hip_ratio': (0.6, 1.2),
+    'inbody_score': (30, 100)
+}
+
+GENDERS = ('male', 'female')
+AGE_BAND_WIDTH = 10
+MAX_AGE_BAND = 8  # 80 and older
+
+
+class QuantileSketch:
+    """Fixed-bin histogram sketch of one parameter's distribution.
+
+    Adding a value is O(1). The cumulative counts are rebuilt once after a
+    batch of updates, after which a percentile query is O(1) (one bin lookup
+    with linear interpolation inside the bin).
+    """
+
+    __slots__ = ('low', 'high', 'counts', 'total', '_cumulative')
+
+    BINS = 200
+
+    def __init__(self, low: float, high: float, counts: Optional[array] = None):
+        self.low = low
+        self.high = high
+        self.counts = counts if counts is not None else array('I', bytes(4 * self.BINS))
+        self.total = sum(self.counts)
+        self._cumulative: Optional[array] = None
+
+    def _bin(self, value: float) -> Tuple[int, float]:
+        """Bin index of a value and its position inside the bin (0-1)"""
+        position = (value - self.low) / (self.high - self.low) * self.BINS
+        if position <= 0:
+            return 0, 0.0
+        if position >= self.BINS:
+            return self.BINS - 1, 1.0
+        index = int(position)
+        return index, position - index
+
+    def add(self, value: float) -> None:
+        """Count one observation"""
+        self.counts[self._bin(value)[0]] += 1
+        self.total += 1
+        self._cumulative = None
+
+    def percentile(self, value: float) -> float:
+        """Percentage of observations below a value (0-100)"""
+        if not self.total:
+            return 0.0
+        cumulative = self._cumulative
+        if cumulative is None:
+            # Number of observations in the bins before each bin
+            cumulative = array('d', [0.0]) * self.BINS
+            running = 0
+            for index, count in enumerate(self.counts):
+                cumulative[index] = running
+                running += count
+            self._cumulative = cumulative
+        index, fraction = self._bin(value)
+        below = cumulative[index] + self.counts[index] * fraction
+        return below / self.total * 100
+
+    def to_bytes(self) -> bytes:
+        """Compact serialized form (compressed bin counts)"""
+        return zlib.compress(self.counts.tobytes())
+
+    @classmethod
+    def from_bytes(cls, low: float, high: float, data: bytes) -> 'QuantileSketch':
+        """Restore a sketch saved with ``to_bytes``"""
+        counts = array('I')
+        counts.frombytes(zlib.decompress(data))
+        return cls(low, high, counts)
+
+
+class PopulationStats:
+    """Population percentiles per (parameter, gender, age band), updated as reports are saved.
+
+    Sketches are persisted in a small SQLite database (one compressed row per
+    cohort) and each update is a read-increment-write inside an immediate
+    transaction, so several worker processes can record reports safely. Every
+    process keeps the sketches in memory for O(1) queries and reloads them
+    from disk at most every ``refresh_interval`` seconds.
+    """
+
+    def __init__(self, path: str, min_samples: int = 30, refresh_interval: float = 300.0):
+        self.path = path
+        self.min_samples = min_samples
+        self.refresh_interval = refresh_interval
+        self._sketches: Dict[Tuple[str, str, int], QuantileSketch] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection (SQLite connections must not cross a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS population_sketches ('
+                ' parameter TEXT NOT NULL,'
+                ' gender TEXT NOT NULL,'
+                ' age_band INTEGER NOT NULL,'
+                ' counts BLOB NOT NULL,'
+                ' PRIMARY KEY (parameter, gender, age_band))'
+            )
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def cohort(gender: Any, age: Any) -> Optional[Tuple[str, int]]:
+        """(gender, age band) of a member, or None when either is unknown"""
+        gender = gender.lower() if isinstance(gender, str) else None
+        if gender not in GENDERS:
+            return None
+        try:
+            age = int(float(age))
+        except (TypeError, ValueError):
+            return None
+        if age <= 0:
+            return None
+        return gender, min(age // AGE_BAND_WIDTH, MAX_AGE_BAND)
+
+    @staticmethod
+    def cohort_label(gender: str, age_band: int) -> str:
+        """Readable cohort name, e.g. 'women aged 20-29'"""
+        people = 'men' if gender == 'male' else 'women'
+        start = age_band * AGE_BAND_WIDTH
+        if age_band >= MAX_AGE_BAND:
+            return f"{people} aged {start}+"
+        return f"{people} aged {start}-{start + AGE_BAND_WIDTH - 1}"
+
+    def _ensure_loaded(self) -> None:
+        """Load the sketches from disk on first use and after the refresh interval"""
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < self.refresh_interval:
+            return
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT parameter, gender, age_band, counts FROM population_sketches'
+            ).fetchall()
+            sketches = {}
+            for parameter, gender, age_band, data in rows:
+                if parameter in PARAMETER_BOUNDS:
+                    low, high = PARAMETER_BOUNDS[parameter]
+                    sketches[(parameter, gender, age_band)] = QuantileSketch.from_bytes(low, high, data)
+            self._sketches = sketches
+            self._loaded_at = now
+
+    def record(self, health_data: Dict[str, Any], gender: Any, age: Any) -> int:
+        """Add a saved report's values to its cohort's sketches; returns the number recorded"""
+        cohort = self.cohort(gender, age)
+        if cohort is None:
+            return 0
+        gender, age_band = cohort
+        values = {parameter: float(value) for parameter, value in health_data.items()
+                  if parameter in PARAMETER_BOUNDS and isinstance(value, (int, float)) and value > 0}
+        if not values:
+            return 0
+
+        self._ensure_loaded()
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                for parameter, value in values.items():
+                    low, high = PARAMETER_BOUNDS[parameter]
+                    row = connection.execute(
+                        'SELECT counts FROM population_sketches'
+                        ' WHERE parameter = ? AND gender = ? AND age_band = ?',
+                        (parameter, gender, age_band)
+                    ).fetchone()
+                    # Start from the stored counts so updates from other processes are kept
+                    sketch = QuantileSketch.from_bytes(low, high, row[0]) if row else QuantileSketch(low, high)
+                    sketch.add(value)
+                    connection.execute(
+                        'INSERT OR REPLACE INTO population_sketches (parameter, gender, age_band, counts)'
+                        ' VALUES (?, ?, ?, ?)',
+                        (parameter, gender, age_band, sketch.to_bytes())
+                    )
+                    self._sketches[(parameter, gender, age_band)] = sketch
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        return len(values)
+
+    def percentile(self, parameter: str, value: float, gender: Any, age: Any) -> Optional[Dict[str, Any]]:
+        """Where a value stands in its cohort, or None without enough data"""
+        cohort = self.cohort(gender, age)
+        if cohort is None or parameter not in PARAMETER_BOUNDS:
+            return None
+        self._ensure_loaded()
+        sketch = self._sketches.get((parameter, cohort[0], cohort[1]))
+        if sketch is None or sketch.total < self.min_samples:
+            return None
+        return {
+            'percentile': round(sketch.percentile(value)),
+            'cohort': self.cohort_label(*cohort),
+            'sample_size': sketch.total
+        }
+
+    def clear(self) -> None:
+        """Remove every sketch"""
+        with self._lock:
+            self._connect().execute('DELETE FROM population_sketches')
+            self._sketches = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of cohorts and observations held in memory"""
+        self._ensure_loaded()
+        return {
+            'sketches': len(self._sketches),
+            'observations': sum(sketch.total for sketch in self._sketches.values()),
+            'min_samples': self.min_samples
+        }
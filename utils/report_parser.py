@@ -1,45 +1,141 @@
+import io
 import os
 import re
-from typing import Dict, Any, Optional
+import json
+import hashlib
+from itertools import chain
+from typing import Dict, Any, Optional, Iterable, Iterator, Union, BinaryIO
 from pathlib import Path
+from utils.pattern_registry import PatternSet, pattern_registry
+from utils.ocr_service import OCRService, OCRServiceError
+from utils.parse_cache import ParseCache
+
+
+# Patterns for extracting patient information, compiled once per process
+_PATIENT_INFO_PATTERNS = {
+    'name': re.compile(r'name[:\s]*([a-zA-Z\s]+)', re.IGNORECASE),
+    'age': re.compile(r'age[:\s]*(\d+)', re.IGNORECASE),
+    'gender': re.compile(r'(male|female|M|F)', re.IGNORECASE),
+    'date': re.compile(r'date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE)
+}
 
 
 class ReportParser:
     """Parses medical reports from various formats (PDF, images) and extracts health parameters"""
     
-    def __init__(self):
-        self.parameter_patterns = self._initialize_parameter_patterns()
+    # Bump when extraction logic changes so cached results are not reused
+    PARSER_VERSION = '1'
+    
+    # Pattern pack to extract with; None picks a vendor pack from the report text
+    PATTERN_PACK: Optional[str] = None
     
-    def parse_report(self, file_path: str) -> Dict[str, float]:
-        """Parse medical report and extract health parameters"""
+    def __init__(self, stop_when_complete: bool = True, ocr_service: Optional[OCRService] = None,
+                 cache: Optional[ParseCache] = None):
+        # Shared, pre-compiled patterns built once per process
+        self.pattern_set = pattern_registry.get(self.PATTERN_PACK)
+        self.parameter_patterns = self.pattern_set.parameter_patterns
+        self.extractor = self.pattern_set.extractor
+        # Stop reading PDF pages once every parameter has a value. A later page can
+        # then no longer override a value with a higher-priority pattern match.
+        self.stop_when_complete = stop_when_complete
+        # When set, image OCR runs in the service's worker pool instead of inline
+        self.ocr_service = ocr_service
+        # Optional content-addressed cache of extracted parameters
+        self.cache = cache
+        self._cache_version = None
+    
+    @property
+    def cache_version(self) -> str:
+        """Tag identifying the parser, its settings and its patterns in cache keys"""
+        if self._cache_version is None:
+            fingerprint = json.dumps({
+                'parser': type(self).__name__,
+                'version': self.PARSER_VERSION,
+                'stop_when_complete': self.stop_when_complete,
+                'patterns': self.pattern_set.fingerprint,
+                'packs': pattern_registry.fingerprint()
+            }, sort_keys=True)
+            self._cache_version = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+        return self._cache_version
+    
+    def parse_report(self, source: Union[str, bytes, BinaryIO],
+                     filename: Optional[str] = None) -> Dict[str, float]:
+        """Parse medical report and extract health parameters
+        
+        ``source`` is a file path, the file content as bytes, or a readable binary
+        file object such as an upload stream. For bytes and file objects the format
+        comes from ``filename`` when given, otherwise from the file signature.
+        """
         
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        if isinstance(source, (str, os.PathLike)):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            
+            with open(source, 'rb') as file:
+                return self._parse_stream(file, Path(source).suffix.lower())
         
-        file_extension = Path(file_path).suffix.lower()
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        if filename:
+            file_extension = Path(filename).suffix.lower()
+        else:
+            file_extension = self._detect_format(stream)
+        return self._parse_stream(stream, file_extension)
+    
+    def _detect_format(self, stream: BinaryIO) -> str:
+        """Guess the file extension from the leading bytes of a stream"""
+        position = stream.tell()
+        header = stream.read(8)
+        stream.seek(position)
+        
+        if header.startswith(b'%PDF'):
+            return '.pdf'
+        elif header.startswith(b'\x89PNG'):
+            return '.png'
+        elif header.startswith(b'\xff\xd8'):
+            return '.jpg'
+        elif header.startswith(b'GIF8'):
+            return '.gif'
+        return ''
+    
+    def _parse_stream(self, stream: BinaryIO, file_extension: str) -> Dict[str, float]:
+        """Parse an open report, consulting the parse cache first"""
+        if file_extension not in self.get_supported_formats():
+            raise ValueError(f"Unsupported file format: {file_extension}")
         
+        if self.cache is None:
+            return self._parse_file(stream, file_extension)
+        
+        cache_key = self.cache.make_key(stream, self.cache_version)
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+        
+        health_data = self._parse_file(stream, file_extension)
+        
+        # Demo sample data stands in for failed parses and must not be cached
+        if not self.is_sample_data(health_data):
+            self.cache.set(cache_key, health_data)
+        
+        return health_data
+    
+    def _parse_file(self, stream: BinaryIO, file_extension: str) -> Dict[str, float]:
+        """Dispatch to the parser for the file format"""
         if file_extension == '.pdf':
-            return self._parse_pdf_report(file_path)
+            return self._parse_pdf_report(stream)
         elif file_extension in ['.png', '.jpg', '.jpeg', '.gif']:
-            return self._parse_image_report(file_path)
+            return self._parse_image_report(stream)
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
-    def _parse_pdf_report(self, file_path: str) -> Dict[str, float]:
+    def _parse_pdf_report(self, stream: BinaryIO) -> Dict[str, float]:
         """Parse PDF medical report"""
         try:
             # Try to import PyPDF2
             try:
                 import PyPDF2
                 
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-                
-                return self._extract_parameters_from_text(text)
+                pdf_reader = PyPDF2.PdfReader(stream)
+                return self._extract_parameters_from_pages(self._iter_pdf_pages(pdf_reader))
                 
             except ImportError:
                 # Fallback: return sample data if PyPDF2 is not available
@@ -50,16 +146,25 @@ class ReportParser:
             print(f"Error parsing PDF: {e}")
             return self._get_sample_health_data()
     
-    def _parse_image_report(self, file_path: str) -> Dict[str, float]:
+    def _iter_pdf_pages(self, pdf_reader) -> Iterator[str]:
+        """Yield the text of each PDF page; pages are only read as they are consumed"""
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ''
+    
+    def _parse_image_report(self, stream: BinaryIO) -> Dict[str, float]:
         """Parse image medical report using OCR"""
         try:
             # Try to use OCR
             try:
-                import pytesseract
-                from PIL import Image
-                
-                image = Image.open(file_path)
-                text = pytesseract.image_to_string(image)
+                if self.ocr_service is not None:
+                    # Worker processes receive the image bytes
+                    text = self.ocr_service.image_to_string(stream.read())
+                else:
+                    import pytesseract
+                    from PIL import Image
+                    
+                    image = Image.open(stream)
+                    text = pytesseract.image_to_string(image)
                 
                 return self._extract_parameters_from_text(text)
                 
@@ -67,117 +172,43 @@ class ReportParser:
                 # Fallback: return sample data if OCR libraries are not available
                 return self._get_sample_health_data()
                 
+        except OCRServiceError:
+            # Busy and timeout errors are reported to the caller
+            raise
         except Exception as e:
             # If parsing fails, return sample data for demo purposes
             print(f"Error parsing image: {e}")
             return self._get_sample_health_data()
     
-    def _initialize_parameter_patterns(self) -> Dict[str, list]:
-        """Initialize regex patterns for extracting health parameters"""
-        return {
-            # Basic health parameters
-            'glucose': [
-                r'glucose[:\s]*(\d+\.?\d*)',
-                r'blood\s+sugar[:\s]*(\d+\.?\d*)',
-                r'fasting\s+glucose[:\s]*(\d+\.?\d*)',
-                r'random\s+glucose[:\s]*(\d+\.?\d*)'
-            ],
-            'cholesterol_total': [
-                r'total\s+cholesterol[:\s]*(\d+\.?\d*)',
-                r'cholesterol\s+total[:\s]*(\d+\.?\d*)',
-                r'cholesterol[:\s]*(\d+\.?\d*)',
-                r'TC[:\s]*(\d+\.?\d*)'
-            ],
-            'cholesterol_hdl': [
-                r'HDL[:\s]*(\d+\.?\d*)',
-                r'HDL-C[:\s]*(\d+\.?\d*)',
-                r'high\s+density[:\s]*(\d+\.?\d*)'
-            ],
-            'cholesterol_ldl': [
-                r'LDL[:\s]*(\d+\.?\d*)',
-                r'LDL-C[:\s]*(\d+\.?\d*)',
-                r'low\s+density[:\s]*(\d+\.?\d*)'
-            ],
-            'blood_pressure_systolic': [
-                r'BP[:\s]*(\d+)/\d+',
-                r'blood\s+pressure[:\s]*(\d+)/\d+',
-                r'systolic[:\s]*(\d+\.?\d*)'
-            ],
-            'blood_pressure_diastolic': [
-                r'BP[:\s]*\d+/(\d+)',
-                r'blood\s+pressure[:\s]*\d+/\d+',
-                r'diastolic[:\s]*(\d+\.?\d*)'
-            ],
-            'bmi': [
-                r'BMI[:\s]*(\d+\.?\d*)',
-                r'body\s+mass\s+index[:\s]*(\d+\.?\d*)'
-            ],
-            # InBody specific parameters
-            'weight': [
-                r'weight[:\s]*(\d+\.?\d*)',
-                r'body\s+weight[:\s]*(\d+\.?\d*)'
-            ],
-            'body_fat_percentage': [
-                r'body\s+fat[:\s]*(\d+\.?\d*)%?',
-                r'fat\s+percentage[:\s]*(\d+\.?\d*)%?',
-                r'body\s+fat\s+%[:\s]*(\d+\.?\d*)',
-                r'BFM[:\s]*(\d+\.?\d*)'
-            ],
-            'muscle_mass': [
-                r'muscle\s+mass[:\s]*(\d+\.?\d*)',
-                r'skeletal\s+muscle[:\s]*(\d+\.?\d*)',
-                r'SMM[:\s]*(\d+\.?\d*)'
-            ],
-            'protein': [
-                r'protein[:\s]*(\d+\.?\d*)',
-                r'total\s+protein[:\s]*(\d+\.?\d*)'
-            ],
-            'minerals': [
-                r'minerals[:\s]*(\d+\.?\d*)',
-                r'bone\s+mineral[:\s]*(\d+\.?\d*)'
-            ],
-            'total_body_water': [
-                r'total\s+body\s+water[:\s]*(\d+\.?\d*)',
-                r'TBW[:\s]*(\d+\.?\d*)',
-                r'body\s+water[:\s]*(\d+\.?\d*)'
-            ],
-            'visceral_fat_level': [
-                r'visceral\s+fat[:\s]*(\d+\.?\d*)',
-                r'visceral\s+fat\s+level[:\s]*(\d+\.?\d*)',
-                r'VFL[:\s]*(\d+\.?\d*)'
-            ],
-            'basal_metabolic_rate': [
-                r'basal\s+metabolic\s+rate[:\s]*(\d+\.?\d*)',
-                r'BMR[:\s]*(\d+\.?\d*)',
-                r'metabolic\s+rate[:\s]*(\d+\.?\d*)'
-            ],
-            'waist_hip_ratio': [
-                r'waist[:\-\s]*hip\s+ratio[:\s]*(\d+\.?\d*)',
-                r'WHR[:\s]*(\d+\.?\d*)'
-            ],
-            'inbody_score': [
-                r'inbody\s+score[:\s]*(\d+\.?\d*)',
-                r'score[:\s]*(\d+\.?\d*)'
-            ]
-        }
-    
     def _extract_parameters_from_text(self, text: str) -> Dict[str, float]:
         """Extract health parameters from text using regex patterns"""
-        extracted_data = {}
-        
         # Convert text to lowercase for easier matching
         text_lower = text.lower()
         
-        for parameter, patterns in self.parameter_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, text_lower, re.IGNORECASE)
-                if match:
-                    try:
-                        value = float(match.group(1))
-                        extracted_data[parameter] = value
-                        break  # Use first match found
-                    except (ValueError, IndexError):
-                        continue
+        # Single pass over the text; the first matching pattern of each parameter wins
+        extracted_data = self._select_pattern_set(text_lower).extractor.extract(text_lower)
+        
+        # If no data extracted, return sample data for demo
+        if not extracted_data:
+            return self._get_sample_health_data()
+        
+        return extracted_data
+    
+    def _extract_parameters_from_pages(self, pages: Iterable[str]) -> Dict[str, float]:
+        """Extract health parameters page by page, stopping early once nothing is left to find"""
+        pages = (page_text.lower() for page_text in pages)
+        first_page = next(pages, '')
+        
+        # The first page identifies the vendor of the report
+        state = self._select_pattern_set(first_page).extractor.start()
+        
+        for page_text in chain([first_page], pages):
+            state.feed(page_text)
+            if state.settled or (self.stop_when_complete and state.complete):
+                break
+        
+        state.close()
+        extracted_data = state.result()
         
         # If no data extracted, return sample data for demo
         if not extracted_data:
@@ -185,6 +216,16 @@ class ReportParser:
         
         return extracted_data
     
+    def _select_pattern_set(self, text: str) -> PatternSet:
+        """Pick the pattern pack for a report, loading a vendor pack on its first report"""
+        if self.PATTERN_PACK is not None:
+            return self.pattern_set
+        return pattern_registry.for_text(text)
+    
+    def is_sample_data(self, health_data: Dict[str, float]) -> bool:
+        """Check whether parsed values are the demo sample data returned for a failed parse"""
+        return health_data == self._get_sample_health_data()
+    
     def _get_sample_health_data(self) -> Dict[str, float]:
         """Return sample health data based on the InBody report for demonstration purposes"""
         return {
@@ -241,18 +282,10 @@ class ReportParser:
         """Extract patient information from report text"""
         patient_info = {}
         
-        # Patterns for extracting patient information
-        patterns = {
-            'name': r'name[:\s]*([a-zA-Z\s]+)',
-            'age': r'age[:\s]*(\d+)',
-            'gender': r'(male|female|M|F)',
-            'date': r'date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'
-        }
-        
         text_lower = text.lower()
         
-        for field, pattern in patterns.items():
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for field, pattern in _PATIENT_INFO_PATTERNS.items():
+            match = pattern.search(text_lower)
             if match:
                 patient_info[field] = match.group(1).strip()
         
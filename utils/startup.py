@@ -0,0 +1,94 @@
+import gc
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Optional dependencies that are slow to import and only needed by some
+# requests: batch analysis (numpy), PDF reports (PyPDF2) and OCR (PIL, pytesseract)
+HEAVY_MODULES = ('numpy', 'PyPDF2', 'PIL.Image', 'pytesseract')
+
+# Additional warm-up steps run by preload(), e.g. compiling pattern packs
+_warmups: List[Callable[[], Any]] = []
+
+
+def module_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    __slots__ = ('_name', '_module', '_lock')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str) -> Any:
+        module = self._module
+        if module is None:
+            module = self._load()
+        return getattr(module, attribute)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a module that is only imported when it is first used"""
+    return LazyModule(name)
+
+
+def register_warmup(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Register a function that preload() runs after importing the heavy modules"""
+    _warmups.append(func)
+    return func
+
+
+def preload(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, Optional[float]]:
+    """Import heavy optional modules and run the warm-ups ahead of the first request.
+
+    Meant to run once in a pre-fork server's master process (e.g. gunicorn
+    with ``--preload``) so every worker starts with the modules already in
+    memory. Everything loaded so far (modules, the recommendation knowledge
+    base, compiled patterns) is then moved out of the garbage collector's
+    reach, so collections in the workers do not write to those shared pages.
+    Returns the seconds spent per module; modules that are not installed map
+    to None.
+    """
+    timings: Dict[str, Optional[float]] = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - start
+
+    for warmup in _warmups:
+        start = time.perf_counter()
+        warmup()
+        timings[f"warmup:{getattr(warmup, '__name__', 'warmup')}"] = time.perf_counter() - start
+
+    gc.collect()
+    gc.freeze()
+    return timings
@@ -0,0 +1,86 @@
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from flask import Response, current_app, get_flashed_messages, stream_template
+
+
+class Deferred:
+    """Template value computed the first time the template reads it.
+
+    Item and attribute access, iteration and truth tests are forwarded to
+    the computed value, so a template cannot tell it from the value itself.
+    When the factory raises, ``fallback`` (if given) is called with the
+    exception, which it is responsible for logging, and its result is used
+    instead; once the response has started streaming there is no way to
+    redirect or flash.
+    """
+
+    __slots__ = ('_factory', '_fallback', '_value', 'resolved')
+
+    def __init__(self, factory: Callable[[], Any], fallback: Optional[Callable[[Exception], Any]] = None):
+        self._factory = factory
+        self._fallback = fallback
+        self._value = None
+        self.resolved = False
+
+    def resolve(self) -> Any:
+        if not self.resolved:
+            try:
+                self._value = self._factory()
+            except Exception as error:
+                if self._fallback is None:
+                    raise
+                self._value = self._fallback(error)
+            self.resolved = True
+        return self._value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.resolve()[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.resolve()
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.resolve())
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def __bool__(self) -> bool:
+        return bool(self.resolve())
+
+
+def _coalesce(chunks: Iterable[str], deferred: Sequence[Deferred], chunk_size: int) -> Iterator[str]:
+    """Pass chunks through one by one until every deferred value is computed, then batch them.
+
+    Jinja computes a deferred value inside the call that produces the next
+    chunk, so everything rendered before its first use must already have
+    been handed to the server by then.
+    """
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size or not all(value.resolved for value in deferred):
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_page(template_name: str, chunk_size: int = 8192, **context: Any) -> Response:
+    """Stream a template; the page up to the first ``Deferred`` value is sent before it is computed"""
+    deferred = [value for value in context.values() if isinstance(value, Deferred)]
+    # Take the flashed messages out of the session now; it is saved before the body is streamed
+    get_flashed_messages()
+    response = current_app.response_class(
+        _coalesce(stream_template(template_name, **context), deferred, chunk_size),
+        mimetype='text/html'
+    )
+    # Proxies such as nginx would otherwise hold the early part of the page back
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from sqlalchemy import text
+
+
+# HealthReport columns tracked over time
+TREND_PARAMETERS = ('glucose', 'cholesterol_total', 'cholesterol_hdl', 'cholesterol_ldl',
+                    'blood_pressure_systolic', 'blood_pressure_diastolic', 'bmi',
+                    'body_fat_percentage', 'overall_score')
+
+
+def _trend_query(window: int) -> str:
+    """Windowed aggregation over one user's reports, one row per (parameter, report).
+
+    Every parameter becomes its own series (reports without a value, stored
+    as NULL or as 0 for a blank manual entry field, are left out), so "previous" is the previous report that had the parameter. The
+    slope is the least-squares slope over the rolling window, in units per
+    day, computed from windowed sums of x = days since the first report.
+    """
+    series = '\nUNION ALL\n'.join(
+        f"SELECT id, created_at, '{column}' AS parameter, {column} AS value "
+        f"FROM health_report WHERE user_id = :user_id AND {column} > 0"
+        for column in TREND_PARAMETERS
+    )
+    frame = f"ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW"
+    return f"""
+WITH series AS (
+{series}
+),
+points AS (
+    SELECT id, created_at, parameter, value,
+           julianday(created_at) - (SELECT julianday(MIN(created_at)) FROM health_report
+                                    WHERE user_id = :user_id) AS x
+    FROM series
+),
+windowed AS (
+    SELECT parameter, id, created_at, value,
+           value - LAG(value) OVER ordered AS change,
+           LAG(value) OVER ordered AS previous,
+           AVG(value) OVER ordered_window AS rolling_mean,
+           COUNT(value) OVER ordered_window AS n,
+           SUM(x) OVER ordered_window AS sx,
+           SUM(value) OVER ordered_window AS sy,
+           SUM(x * x) OVER ordered_window AS sxx,
+           SUM(x * value) OVER ordered_window AS sxy,
+           ROW_NUMBER() OVER ordered AS position,
+           COUNT(value) OVER (PARTITION BY parameter) AS total
+    FROM points
+    WINDOW ordered AS (PARTITION BY parameter ORDER BY created_at, id),
+           ordered_window AS (PARTITION BY parameter ORDER BY created_at, id {frame})
+)
+SELECT parameter, id, created_at, value, previous, change, rolling_mean,
+       (n * sxy - sx * sy) / NULLIF(n * sxx - sx * sx, 0) AS slope,
+       position, total
+FROM windowed
+ORDER BY parameter, position
+"""
+
+
+class TrendEngine:
+    """Per-parameter trends over a member's report history.
+
+    Rolling means, rolling slopes and the change since the previous report
+    are computed by the database with window functions in a single query.
+    Results are cached per (user, window) and dropped when a report is saved
+    for the user; each hit is also checked against the user's report count
+    and latest report id, so reports saved by other worker processes are
+    picked up.
+    """
+
+    def __init__(self, db, max_users: int = 512, default_window: int = 5):
+        self.db = db
+        self.max_users = max_users
+        self.default_window = default_window
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[int, int], Tuple[Tuple[int, Optional[int]], Dict[str, Any]]]' = OrderedDict()
+        self._queries: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, user_id: int) -> Tuple[int, Optional[int]]:
+        """Report count and latest report id of a user (an index lookup)"""
+        row = self.db.session.execute(
+            text('SELECT COUNT(*), MAX(id) FROM health_report WHERE user_id = :user_id'),
+            {'user_id': user_id}
+        ).one()
+        return row[0], row[1]
+
+    def _query(self, window: int):
+        query = self._queries.get(window)
+        if query is None:
+            query = self._queries[window] = text(_trend_query(window))
+        return query
+
+    def get_trends(self, user_id: int, window: Optional[int] = None) -> Dict[str, Any]:
+        """Return the trends of a user's reports, from the cache when still current"""
+        window = max(2, int(window or self.default_window))
+        key = (user_id, window)
+        fingerprint = self._fingerprint(user_id)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        trends = self._compute(user_id, window, fingerprint[0])
+        with self._lock:
+            self._entries[key] = (fingerprint, trends)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return trends
+
+    def _compute(self, user_id: int, window: int, report_count: int) -> Dict[str, Any]:
+        """Run the windowed query and group its rows by parameter"""
+        rows = self.db.session.execute(self._query(window), {'user_id': user_id}).all()
+
+        parameters: Dict[str, Dict[str, Any]] = {}
+        for parameter, report_id, created_at, value, previous, change, rolling_mean, slope, position, total in rows:
+            trend = parameters.get(parameter)
+            if trend is None:
+                trend = parameters[parameter] = {'count': total, 'series': []}
+            trend['series'].append({
+                'report_id': report_id,
+                'date': str(created_at),
+                'value': value,
+                'rolling_mean': rolling_mean,
+                'slope_per_day': slope
+            })
+            if position == total:
+                # Latest report with this parameter
+                trend.update({
+                    'latest': value,
+                    'previous': previous,
+                    'change': change,
+                    'change_percent': change / previous * 100 if change is not None and previous else None,
+                    'rolling_mean': rolling_mean,
+                    'slope_per_day': slope
+                })
+
+        return {
+            'user_id': user_id,
+            'reports': report_count,
+            'window': window,
+            'parameters': parameters
+        }
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the cached trends of a user"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached trend and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached entries"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_users': self.max_users
+            }